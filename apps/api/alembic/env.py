@@ -13,6 +13,12 @@ from app.core.config import settings  # noqa: E402
 from app.db.base import Base  # noqa: E402
 from app.models.content import Content  # noqa: E402, F401
 from app.models.conversation import Conversation, Message  # noqa: E402, F401
+from app.models.ingestion import (  # noqa: E402, F401
+    BulkIngestionItem,
+    BulkIngestionJob,
+    IngestionCheckpoint,
+    IngestionJob,
+)
 
 # Import all models to ensure they're registered with SQLAlchemy
 from app.models.user import User  # noqa: E402, F401
@@ -0,0 +1,59 @@
+"""Ingestion checkpoints
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ingestion_checkpoints",
+        sa.Column("content_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("fingerprint", sa.String(length=64), nullable=False),
+        sa.Column("pages_extracted", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_chunks", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("chunks_committed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.ForeignKeyConstraint(["content_id"], ["content.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("content_id"),
+    )
+
+    # The stale-processing sweeper filters on status and updated_at
+    op.create_index(
+        "idx_content_status_updated_at", "content", ["status", "updated_at"]
+    )
+
+    op.execute(
+        "CREATE TRIGGER set_timestamp_ingestion_checkpoints BEFORE UPDATE ON ingestion_checkpoints FOR EACH ROW EXECUTE PROCEDURE trigger_set_timestamp();"
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "DROP TRIGGER IF EXISTS set_timestamp_ingestion_checkpoints ON ingestion_checkpoints;"
+    )
+    op.drop_index("idx_content_status_updated_at", table_name="content")
+    op.drop_table("ingestion_checkpoints")
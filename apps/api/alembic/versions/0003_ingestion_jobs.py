@@ -0,0 +1,74 @@
+"""Ingestion jobs
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ingestion_jobs",
+        sa.Column(
+            "id",
+            postgresql.UUID(as_uuid=True),
+            nullable=False,
+            server_default=sa.text("gen_random_uuid()"),
+        ),
+        sa.Column("content_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("stage", sa.String(length=32), nullable=False, server_default="queued"),
+        sa.Column("attempt", sa.Integer(), nullable=False, server_default="1"),
+        sa.Column("pages_total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("pages_extracted", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("chunks_total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("chunks_embedded", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "stage_timings",
+            postgresql.JSONB(),
+            nullable=False,
+            server_default=sa.text("'{}'::jsonb"),
+        ),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.ForeignKeyConstraint(["content_id"], ["content.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+    # Polling reads jobs changed since a cursor; history is per content
+    op.create_index("ix_ingestion_jobs_content_id", "ingestion_jobs", ["content_id"])
+    op.create_index("ix_ingestion_jobs_updated_at", "ingestion_jobs", ["updated_at"])
+
+    op.execute(
+        "CREATE TRIGGER set_timestamp_ingestion_jobs BEFORE UPDATE ON ingestion_jobs FOR EACH ROW EXECUTE PROCEDURE trigger_set_timestamp();"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS set_timestamp_ingestion_jobs ON ingestion_jobs;")
+    op.drop_index("ix_ingestion_jobs_updated_at", table_name="ingestion_jobs")
+    op.drop_index("ix_ingestion_jobs_content_id", table_name="ingestion_jobs")
+    op.drop_table("ingestion_jobs")
@@ -0,0 +1,91 @@
+"""Bulk ingestion jobs
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "bulk_ingestion_jobs",
+        sa.Column(
+            "id",
+            postgresql.UUID(as_uuid=True),
+            nullable=False,
+            server_default=sa.text("gen_random_uuid()"),
+        ),
+        sa.Column("status", sa.String(length=32), nullable=False, server_default="queued"),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("category", sa.String(length=255), nullable=False),
+        sa.Column("language", sa.String(length=8), nullable=False),
+        sa.Column("needs_translation", sa.Boolean(), nullable=False, server_default="false"),
+        sa.Column(
+            "urls", postgresql.JSONB(), nullable=False, server_default=sa.text("'[]'::jsonb")
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+    op.create_table(
+        "bulk_ingestion_items",
+        sa.Column(
+            "id",
+            postgresql.UUID(as_uuid=True),
+            nullable=False,
+            server_default=sa.text("gen_random_uuid()"),
+        ),
+        sa.Column("job_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("url", sa.Text(), nullable=False),
+        sa.Column("video_id", sa.String(length=32), nullable=True),
+        sa.Column("status", sa.String(length=32), nullable=False),
+        sa.Column("content_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.ForeignKeyConstraint(["job_id"], ["bulk_ingestion_jobs.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["content_id"], ["content.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_bulk_ingestion_items_job_id", "bulk_ingestion_items", ["job_id"])
+
+    for table in ("bulk_ingestion_jobs", "bulk_ingestion_items"):
+        op.execute(
+            f"CREATE TRIGGER set_timestamp_{table} BEFORE UPDATE ON {table} FOR EACH ROW EXECUTE PROCEDURE trigger_set_timestamp();"
+        )
+
+
+def downgrade() -> None:
+    for table in ("bulk_ingestion_items", "bulk_ingestion_jobs"):
+        op.execute(f"DROP TRIGGER IF EXISTS set_timestamp_{table} ON {table};")
+    op.drop_index("ix_bulk_ingestion_items_job_id", table_name="bulk_ingestion_items")
+    op.drop_table("bulk_ingestion_items")
+    op.drop_table("bulk_ingestion_jobs")
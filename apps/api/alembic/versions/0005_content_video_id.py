@@ -0,0 +1,38 @@
+"""Content video id
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+# Same URL forms as youtube_processor.extract_video_id
+_VIDEO_ID_PATTERN = (
+    r"(?:youtube\.com/watch\?(?:.*&)?v=|youtu\.be/|youtube\.com/embed/|youtube\.com/v/)"
+    r"([a-zA-Z0-9_-]{11})"
+)
+
+
+def upgrade() -> None:
+    op.add_column("content", sa.Column("video_id", sa.String(length=32), nullable=True))
+    op.execute(
+        sa.text(
+            "UPDATE content SET video_id = substring(replace(source_url, ' ', '') from :pattern) "
+            "WHERE source_type = 'youtube'"
+        ).bindparams(pattern=_VIDEO_ID_PATTERN)
+    )
+    op.create_index("idx_content_video_id", "content", ["video_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_content_video_id", table_name="content")
+    op.drop_column("content", "video_id")
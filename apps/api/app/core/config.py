@@ -18,6 +18,32 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
     JWT_EXPIRATION_HOURS: int = int(os.getenv("JWT_EXPIRATION_HOURS", "24"))
 
+    # Authentication caches (verified tokens and user snapshots)
+    AUTH_TOKEN_CACHE_SIZE: int = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+    AUTH_USER_CACHE_SIZE: int = int(os.getenv("AUTH_USER_CACHE_SIZE", "10000"))
+    AUTH_USER_CACHE_TTL_SECONDS: float = float(
+        os.getenv("AUTH_USER_CACHE_TTL_SECONDS", "60")
+    )
+    # Admin snapshots grant privileges, so a demotion must take effect quickly
+    # in every worker, not just the one that handled it
+    AUTH_ADMIN_CACHE_TTL_SECONDS: float = float(
+        os.getenv("AUTH_ADMIN_CACHE_TTL_SECONDS", "5")
+    )
+
+    # Password hashing runs in a bounded worker pool off the event loop
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+
+    # Login throttling (failed attempts per account from one client IP, and per
+    # client IP across accounts)
+    LOGIN_MAX_FAILURES_PER_USER: int = int(
+        os.getenv("LOGIN_MAX_FAILURES_PER_USER", "5")
+    )
+    LOGIN_MAX_FAILURES_PER_IP: int = int(os.getenv("LOGIN_MAX_FAILURES_PER_IP", "20"))
+    LOGIN_FAILURE_WINDOW_SECONDS: int = int(
+        os.getenv("LOGIN_FAILURE_WINDOW_SECONDS", "300")
+    )
+
     # CORS
     CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://127.0.0.1:3000"]
 
@@ -25,6 +51,34 @@ class Settings(BaseSettings):
     QDRANT_HOST: str = os.getenv("QDRANT_HOST", "localhost")
     QDRANT_PORT: int = int(os.getenv("QDRANT_PORT", "6333"))
     QDRANT_API_KEY: str = os.getenv("QDRANT_API_KEY", "")
+    QDRANT_SEARCH_CONCURRENCY: int = int(os.getenv("QDRANT_SEARCH_CONCURRENCY", "8"))
+
+    # Qdrant collection tuning: quantization is "none", "scalar" (int8) or "binary"
+    QDRANT_QUANTIZATION: str = os.getenv("QDRANT_QUANTIZATION", "none")
+    QDRANT_VECTORS_ON_DISK: bool = (
+        os.getenv("QDRANT_VECTORS_ON_DISK", "False").lower() == "true"
+    )
+    QDRANT_HNSW_M: int = int(os.getenv("QDRANT_HNSW_M", "0"))  # 0 = server default
+    QDRANT_HNSW_EF_CONSTRUCT: int = int(os.getenv("QDRANT_HNSW_EF_CONSTRUCT", "0"))
+    QDRANT_SEARCH_HNSW_EF: int = int(os.getenv("QDRANT_SEARCH_HNSW_EF", "0"))
+    QDRANT_QUANTIZATION_RESCORE: bool = (
+        os.getenv("QDRANT_QUANTIZATION_RESCORE", "True").lower() == "true"
+    )
+    QDRANT_QUANTIZATION_OVERSAMPLING: float = float(
+        os.getenv("QDRANT_QUANTIZATION_OVERSAMPLING", "2.0")
+    )
+    # Per-collection search overrides, e.g. {"ks_politics": {"hnsw_ef": 128}}
+    QDRANT_SEARCH_PARAMS: str = os.getenv("QDRANT_SEARCH_PARAMS", "{}")
+
+    # In-process vector index: comma-separated collections served from memory
+    # ("*" for all); offline mode replaces Qdrant entirely (dev and tests)
+    LOCAL_VECTOR_INDEX_COLLECTIONS: str = os.getenv("LOCAL_VECTOR_INDEX_COLLECTIONS", "")
+    LOCAL_VECTOR_INDEX_OFFLINE: bool = (
+        os.getenv("LOCAL_VECTOR_INDEX_OFFLINE", "False").lower() == "true"
+    )
+    LOCAL_VECTOR_INDEX_REFRESH_SECONDS: float = float(
+        os.getenv("LOCAL_VECTOR_INDEX_REFRESH_SECONDS", "300")
+    )
 
     # AWS Configuration
     AWS_ACCESS_KEY_ID: str = os.getenv("AWS_ACCESS_KEY_ID", "")
@@ -37,10 +91,139 @@ class Settings(BaseSettings):
     GOOGLE_API_KEY: str = os.getenv("GOOGLE_API_KEY", "")
     LANGCHAIN_API_KEY: str = os.getenv("LANGCHAIN_API_KEY", "")
 
+    # Embeddings: backend is "openai" or "local"; per-collection overrides are
+    # given as "ks_politics=local,ks_skcrf=openai"
+    EMBEDDING_BACKEND: str = os.getenv("EMBEDDING_BACKEND", "openai")
+    EMBEDDING_COLLECTION_BACKENDS: str = os.getenv("EMBEDDING_COLLECTION_BACKENDS", "")
+    OPENAI_EMBEDDING_MODEL: str = os.getenv(
+        "OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"
+    )
+    # text-embedding-3 vectors can be shortened (Matryoshka) to save storage
+    # and search time; collections must be migrated after changing this
+    EMBEDDING_DIMENSIONS: int = int(os.getenv("EMBEDDING_DIMENSIONS", "1536"))
+    LOCAL_EMBEDDING_MODEL: str = os.getenv(
+        "LOCAL_EMBEDDING_MODEL",
+        "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
+    )
+    LOCAL_EMBEDDING_BATCH_SIZE: int = int(os.getenv("LOCAL_EMBEDDING_BATCH_SIZE", "32"))
+    LOCAL_EMBEDDING_THREADS: int = int(os.getenv("LOCAL_EMBEDDING_THREADS", "2"))
+    # Bulk embedding requests are packed by token count to stay under the
+    # provider's per-request limits (OpenAI: 2048 inputs, 300k tokens)
+    EMBEDDING_BATCH_MAX_TOKENS: int = int(os.getenv("EMBEDDING_BATCH_MAX_TOKENS", "100000"))
+    EMBEDDING_BATCH_MAX_INPUTS: int = int(os.getenv("EMBEDDING_BATCH_MAX_INPUTS", "512"))
+    EMBEDDING_MAX_CONCURRENCY: int = int(os.getenv("EMBEDDING_MAX_CONCURRENCY", "4"))
+    # Processes used to chunk documents during bulk ingestion (0 = CPU count)
+    CHUNKING_WORKERS: int = int(os.getenv("CHUNKING_WORKERS", "0"))
+
+    # OpenAI scheduling: retries with jittered backoff on 429/timeouts/5xx, and a
+    # share of each per-minute budget that bulk ingestion may not consume
+    OPENAI_REQUEST_TIMEOUT_SECONDS: float = float(os.getenv("OPENAI_REQUEST_TIMEOUT_SECONDS", "60"))
+    OPENAI_MAX_RETRIES: int = int(os.getenv("OPENAI_MAX_RETRIES", "5"))
+    OPENAI_BACKOFF_BASE_SECONDS: float = float(os.getenv("OPENAI_BACKOFF_BASE_SECONDS", "0.5"))
+    OPENAI_BACKOFF_MAX_SECONDS: float = float(os.getenv("OPENAI_BACKOFF_MAX_SECONDS", "30"))
+    OPENAI_INTERACTIVE_RESERVE: float = float(os.getenv("OPENAI_INTERACTIVE_RESERVE", "0.2"))
+    OPENAI_INTERACTIVE_MAX_WAIT_SECONDS: float = float(
+        os.getenv("OPENAI_INTERACTIVE_MAX_WAIT_SECONDS", "15")
+    )
+
+    # YouTube transcripts are cached on disk (in the uploads volume) so
+    # reindexing does not refetch; offline mode never contacts YouTube
+    TRANSCRIPT_CACHE_ENABLED: bool = os.getenv("TRANSCRIPT_CACHE_ENABLED", "True").lower() == "true"
+    TRANSCRIPT_CACHE_DIR: str = os.getenv("TRANSCRIPT_CACHE_DIR", "uploads/transcript_cache")
+    TRANSCRIPT_CACHE_TTL_SECONDS: int = int(
+        os.getenv("TRANSCRIPT_CACHE_TTL_SECONDS", str(90 * 24 * 3600))
+    )
+    TRANSCRIPT_CACHE_OFFLINE: bool = os.getenv("TRANSCRIPT_CACHE_OFFLINE", "False").lower() == "true"
+
+    # Ingestion commits embeddings in batches of this many chunks and records
+    # a checkpoint after each; rows left pending or processing longer than
+    # the stale threshold (e.g. after a crash) are re-queued by a periodic
+    # sweep. Items of a queued or running batch are touched every heartbeat
+    # interval, which must be well below the stale threshold
+    INGESTION_CHECKPOINT_BATCH_SIZE: int = int(
+        os.getenv("INGESTION_CHECKPOINT_BATCH_SIZE", "256")
+    )
+    INGESTION_STALE_SECONDS: int = int(os.getenv("INGESTION_STALE_SECONDS", "1800"))
+    INGESTION_SWEEP_INTERVAL_SECONDS: int = int(
+        os.getenv("INGESTION_SWEEP_INTERVAL_SECONDS", "300")
+    )
+    INGESTION_HEARTBEAT_SECONDS: int = int(os.getenv("INGESTION_HEARTBEAT_SECONDS", "300"))
+
+    # Ingestion scheduler: concurrent ingestions overall and per class
+    # (single uploads, reindex/bulk, maintenance), the share of the overall
+    # limit each class is guaranteed (a nonzero share is at least one slot),
+    # and the chat p95 latency above which reindex and maintenance work
+    # holds back
+    INGESTION_MAX_CONCURRENCY: int = int(os.getenv("INGESTION_MAX_CONCURRENCY", "3"))
+    INGESTION_UPLOAD_CONCURRENCY: int = int(os.getenv("INGESTION_UPLOAD_CONCURRENCY", "3"))
+    INGESTION_REINDEX_CONCURRENCY: int = int(os.getenv("INGESTION_REINDEX_CONCURRENCY", "2"))
+    INGESTION_MAINTENANCE_CONCURRENCY: int = int(
+        os.getenv("INGESTION_MAINTENANCE_CONCURRENCY", "1")
+    )
+    INGESTION_UPLOAD_SHARE: float = float(os.getenv("INGESTION_UPLOAD_SHARE", "0.34"))
+    INGESTION_REINDEX_SHARE: float = float(os.getenv("INGESTION_REINDEX_SHARE", "0.34"))
+    INGESTION_MAINTENANCE_SHARE: float = float(os.getenv("INGESTION_MAINTENANCE_SHARE", "0.34"))
+    INGESTION_REINDEX_BATCH_SIZE: int = int(os.getenv("INGESTION_REINDEX_BATCH_SIZE", "8"))
+    INGESTION_CHAT_P95_THRESHOLD_SECONDS: float = float(
+        os.getenv("INGESTION_CHAT_P95_THRESHOLD_SECONDS", "4")
+    )
+    INGESTION_CHAT_LATENCY_WINDOW_SECONDS: float = float(
+        os.getenv("INGESTION_CHAT_LATENCY_WINDOW_SECONDS", "120")
+    )
+    INGESTION_MAX_YIELD_SECONDS: float = float(os.getenv("INGESTION_MAX_YIELD_SECONDS", "300"))
+
+    # How often the ingestion job event stream checks for changes
+    INGESTION_EVENTS_POLL_SECONDS: float = float(
+        os.getenv("INGESTION_EVENTS_POLL_SECONDS", "1")
+    )
+    # Once a job listing poll has caught up, its cursor is rewound by this
+    # much so jobs whose transaction committed late are still delivered
+    INGESTION_JOBS_CURSOR_OVERLAP_SECONDS: float = float(
+        os.getenv("INGESTION_JOBS_CURSOR_OVERLAP_SECONDS", "60")
+    )
+
+    # Uploaded files are stored by content hash; unreferenced blobs older
+    # than the grace period are removed by the storage GC
+    BLOB_STORE_DIR: str = os.getenv("BLOB_STORE_DIR", "uploads/blobs")
+    BLOB_GC_GRACE_SECONDS: int = int(os.getenv("BLOB_GC_GRACE_SECONDS", "3600"))
+
+    # Extracted PDF pages cached in memory by (file hash, page index)
+    PDF_PAGE_CACHE_SIZE: int = int(os.getenv("PDF_PAGE_CACHE_SIZE", "5000"))
+    PDF_PAGE_CACHE_TTL_SECONDS: int = int(os.getenv("PDF_PAGE_CACHE_TTL_SECONDS", "3600"))
+
+    # Politeness limit towards YouTube for transcript fetches and playlist
+    # expansion (requests per second per API worker, with a small burst)
+    YOUTUBE_REQUESTS_PER_SECOND: float = float(
+        os.getenv("YOUTUBE_REQUESTS_PER_SECOND", "0.5")
+    )
+    YOUTUBE_REQUEST_BURST: int = int(os.getenv("YOUTUBE_REQUEST_BURST", "2"))
+
+    # Bulk YouTube ingestion: concurrent videos per job and videos per job
+    BULK_YOUTUBE_CONCURRENCY: int = int(os.getenv("BULK_YOUTUBE_CONCURRENCY", "4"))
+    BULK_YOUTUBE_MAX_ITEMS: int = int(os.getenv("BULK_YOUTUBE_MAX_ITEMS", "500"))
+
     # Redis
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379")
 
+    # Rate limiting (token buckets per user and per client IP)
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "True").lower() == "true"
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")  # or "redis"
+    RATE_LIMIT_IP_MULTIPLIER: int = int(os.getenv("RATE_LIMIT_IP_MULTIPLIER", "5"))
+    # Comma-separated addresses/CIDRs of proxies whose X-Real-IP header is trusted
+    TRUSTED_PROXIES: str = os.getenv(
+        "TRUSTED_PROXIES", "127.0.0.0/8,::1,10.0.0.0/8,172.16.0.0/12,192.168.0.0/16"
+    )
+    CHAT_RATE_LIMIT_PER_MINUTE: int = int(os.getenv("CHAT_RATE_LIMIT_PER_MINUTE", "20"))
+    CHAT_RATE_LIMIT_BURST: int = int(os.getenv("CHAT_RATE_LIMIT_BURST", "5"))
+    SEARCH_RATE_LIMIT_PER_MINUTE: int = int(
+        os.getenv("SEARCH_RATE_LIMIT_PER_MINUTE", "30")
+    )
+    SEARCH_RATE_LIMIT_BURST: int = int(os.getenv("SEARCH_RATE_LIMIT_BURST", "10"))
+
     # Admin
+    DASHBOARD_CACHE_TTL_SECONDS: float = float(
+        os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "5")
+    )
     ADMIN_EMAIL: str = os.getenv("ADMIN_EMAIL", "admin@ksai.com")
     ADMIN_PASSWORD: str = os.getenv("ADMIN_PASSWORD", "admin123")
 
@@ -57,11 +57,35 @@ async def log_requests(request: Request, call_next):
     response = await call_next(request)
     
     process_time = time.time() - start_time
+    if request.method == "POST" and request.url.path.startswith("/chat"):
+        # Bulk ingestion backs off while chat latency is high
+        from .services.ingestion_scheduler import ingestion_scheduler
+
+        ingestion_scheduler.chat_latency.record(process_time)
+
     logger.info(f"✅ {request.method} {request.url} - {response.status_code} ({process_time:.3f}s)")
     
     return response
 
 
+@app.on_event("startup")
+async def start_background_tasks():
+    from .services.ingestion_service import ingestion_service
+    from .services.qdrant_service import qdrant_service
+
+    # Resume ingestions interrupted by a crash or deploy
+    ingestion_service.start_sweeper()
+    # Load the in-process vector index before the first chat needs it
+    qdrant_service.warm_local_index()
+
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    from .services.ingestion_service import ingestion_service
+
+    await ingestion_service.stop_sweeper()
+
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
@@ -1,5 +1,20 @@
 from .content import Content
 from .conversation import Conversation, Message
+from .ingestion import (
+    BulkIngestionItem,
+    BulkIngestionJob,
+    IngestionCheckpoint,
+    IngestionJob,
+)
 from .user import User
 
-__all__ = ["User", "Content", "Conversation", "Message"]
+__all__ = [
+    "User",
+    "Content",
+    "Conversation",
+    "Message",
+    "IngestionCheckpoint",
+    "IngestionJob",
+    "BulkIngestionJob",
+    "BulkIngestionItem",
+]
@@ -32,6 +32,8 @@ class Content(Base):
     title = Column(Text, nullable=False)
     source_url = Column(Text, nullable=False)
     source_type = Column(ENUM(ContentType, name="content_type", create_type=False), nullable=False)
+    # YouTube video ID, for deduplicating however the URL was written
+    video_id = Column(String(32), nullable=True, index=True)
     language = Column(ENUM(Language, name="language_code", create_type=False), nullable=False)
     category = Column(String(255), nullable=False)
     needs_translation = Column(Boolean, default=False, nullable=False)
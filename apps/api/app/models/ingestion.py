@@ -0,0 +1,122 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+from ..db.base import Base
+
+
+class IngestionCheckpoint(Base):
+    """Progress of an interrupted ingestion, so a retry can resume"""
+
+    __tablename__ = "ingestion_checkpoints"
+
+    content_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("content.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    # Hash of the chunk texts and embedding model; resuming is only valid
+    # while it matches
+    fingerprint = Column(String(64), nullable=False)
+    pages_extracted = Column(Integer, default=0, nullable=False)
+    total_chunks = Column(Integer, default=0, nullable=False)
+    # Chunks [0, chunks_committed) are embedded and upserted
+    chunks_committed = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+    def __repr__(self):
+        return (
+            f"<IngestionCheckpoint(content_id={self.content_id}, "
+            f"chunks_committed={self.chunks_committed}/{self.total_chunks})>"
+        )
+
+
+class IngestionJob(Base):
+    """One attempt at ingesting a content item, with per-stage progress"""
+
+    __tablename__ = "ingestion_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    content_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("content.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    # queued, extracting, chunking, embedding, completed or failed
+    stage = Column(String(32), default="queued", nullable=False)
+    attempt = Column(Integer, default=1, nullable=False)
+    pages_total = Column(Integer, default=0, nullable=False)
+    pages_extracted = Column(Integer, default=0, nullable=False)
+    chunks_total = Column(Integer, default=0, nullable=False)
+    chunks_embedded = Column(Integer, default=0, nullable=False)
+    # Seconds spent per stage, e.g. {"extracting": 1.2, "embedding": 30.5}
+    stage_timings = Column(JSONB, default=dict, nullable=False)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    updated_at = Column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False, index=True
+    )
+
+    def __repr__(self):
+        return f"<IngestionJob(id={self.id}, content_id={self.content_id}, stage={self.stage})>"
+
+
+class BulkIngestionJob(Base):
+    """A bulk ingestion request (e.g. many YouTube URLs) and its outcome"""
+
+    __tablename__ = "bulk_ingestion_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # queued, expanding, deduplicating, ingesting, completed or failed
+    status = Column(String(32), default="queued", nullable=False)
+    error = Column(Text, nullable=True)
+    category = Column(String(255), nullable=False)
+    language = Column(String(8), nullable=False)
+    needs_translation = Column(Boolean, default=False, nullable=False)
+    # URLs as submitted, before playlist/channel expansion
+    urls = Column(JSONB, default=list, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+    updated_at = Column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+    def __repr__(self):
+        return f"<BulkIngestionJob(id={self.id}, status={self.status})>"
+
+
+class BulkIngestionItem(Base):
+    """One video of a bulk ingestion job"""
+
+    __tablename__ = "bulk_ingestion_items"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    job_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("bulk_ingestion_jobs.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    position = Column(Integer, nullable=False)
+    url = Column(Text, nullable=False)
+    video_id = Column(String(32), nullable=True)
+    # invalid, duplicate, skipped, queued, processing, completed or failed
+    status = Column(String(32), nullable=False)
+    content_id = Column(
+        UUID(as_uuid=True), ForeignKey("content.id", ondelete="SET NULL"), nullable=True
+    )
+    error = Column(Text, nullable=True)
+    updated_at = Column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+    def __repr__(self):
+        return f"<BulkIngestionItem(job_id={self.job_id}, url={self.url}, status={self.status})>"
@@ -1,16 +1,40 @@
+import asyncio
+import json
+import uuid
+from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    Request,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from ..core.cache import TTLCache
+from ..core.config import settings
 from ..db.database import get_db
 from ..models.content import Content, ContentStatus, ContentType, Language
+from ..models.ingestion import IngestionJob
 from ..models.user import User
-from ..services.auth import get_current_admin
+from ..services.auth import get_current_admin, invalidate_user_cache
+from ..services.rate_limiter import search_rate_limit
 
 router = APIRouter()
 
+# Dashboard payload shared by all admins polling within the TTL window
+_dashboard_cache = TTLCache(maxsize=1, ttl=settings.DASHBOARD_CACHE_TTL_SECONDS)
+
 
 # Pydantic models
 class ContentResponse(BaseModel):
@@ -65,6 +89,7 @@ async def upload_content(
         )
 
     # Determine content type and source
+    video_id = None
     if file:
         if not file.filename.endswith(".pdf"):
             raise HTTPException(
@@ -82,8 +107,11 @@ async def upload_content(
         source_url = saved_file_path  # Use the actual saved file path
         title = file.filename
     else:
+        from ..services.youtube_processor import extract_video_id
+
         content_type = ContentType.youtube
         source_url = youtube_url
+        video_id = extract_video_id(youtube_url.replace(" ", ""))
         title = f"YouTube Video: {youtube_url}"
 
     # Create content record
@@ -91,6 +119,7 @@ async def upload_content(
         title=title,
         source_url=source_url,
         source_type=content_type,
+        video_id=video_id,
         language=Language(language),
         category=category,
         needs_translation=needs_translation,
@@ -101,14 +130,16 @@ async def upload_content(
     db.commit()
     db.refresh(new_content)
 
-    # Process content immediately to avoid async queue issues
-    from ..services.ingestion_service import ingestion_service
+    # Process at upload priority; the admin waits for the result
+    from ..services.ingestion_scheduler import IngestionPriority, ingestion_scheduler
     import logging
     logger = logging.getLogger(__name__)
 
     try:
-        logger.info(f"Starting immediate processing for content {new_content.id}")
-        success = await ingestion_service.process_content(str(new_content.id), db)
+        logger.info(f"Starting processing for content {new_content.id}")
+        content_id = str(new_content.id)
+        results = await ingestion_scheduler.run(IngestionPriority.UPLOAD, [content_id])
+        success = results.get(content_id, False)
         
         if success:
             logger.info(f"Content {new_content.id} processed successfully")
@@ -131,6 +162,74 @@ async def upload_content(
         )
 
 
+@router.post("/content/youtube/bulk", status_code=status.HTTP_202_ACCEPTED)
+async def bulk_upload_youtube(
+    background_tasks: BackgroundTasks,
+    urls: Optional[str] = Form(None),
+    manifest: Optional[UploadFile] = File(None),
+    category: str = Form(...),
+    language: str = Form(...),
+    needs_translation: bool = Form(False),
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db),
+):
+    """
+    Ingest many YouTube videos at once (Admin only)
+
+    Accepts newline or comma separated URLs and/or a manifest file (JSON list
+    or one URL per line). Playlist and channel URLs are expanded to their
+    videos; videos already in the knowledge base are skipped. Progress is
+    reported by GET /admin/content/youtube/bulk/{job_id}.
+    """
+    from ..services.bulk_youtube_service import bulk_youtube_service
+
+    if language not in ["en", "ta"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Language must be 'en' or 'ta'",
+        )
+
+    url_list = [url.strip() for url in (urls or "").replace(",", "\n").splitlines() if url.strip()]
+    if manifest:
+        try:
+            url_list.extend(bulk_youtube_service.parse_manifest(await manifest.read()))
+        except (ValueError, AttributeError) as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid manifest file: {e}",
+            )
+
+    if not url_list:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide YouTube URLs or a manifest file",
+        )
+
+    job = bulk_youtube_service.create_job(
+        db, url_list, category, Language(language), needs_translation
+    )
+    background_tasks.add_task(bulk_youtube_service.run_job, str(job.id))
+    return bulk_youtube_service.get_job(db, str(job.id))
+
+
+@router.get("/content/youtube/bulk/{job_id}")
+async def get_bulk_youtube_job(
+    job_id: str,
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db),
+):
+    """Per-item progress of a bulk YouTube ingestion job (Admin only)"""
+    from ..services.bulk_youtube_service import bulk_youtube_service
+
+    job = bulk_youtube_service.get_job(db, job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Bulk job not found",
+        )
+    return job
+
+
 @router.get("/content", response_model=List[ContentResponse])
 async def list_content(
     current_user: User = Depends(get_current_admin), db: Session = Depends(get_db)
@@ -188,20 +287,18 @@ async def delete_content(
             for collection_name in collections:
                 qdrant_service.delete_vectors_by_source(collection_name, content.source_url)
 
-        # Delete any uploaded file if it's a PDF
+        # Delete the content record from database
+        db.delete(content)
+        db.commit()
+
+        # Delete the uploaded file unless other content shares it
         if content.source_type == ContentType.pdf and content.source_url.startswith("/"):
+            from ..services.blob_store import blob_store
+
             try:
-                import os
-                file_path = content.source_url
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-                    logger.info(f"Deleted file: {file_path}")
+                blob_store.release(content.source_url, db)
             except Exception as e:
                 logger.warning(f"Failed to delete file {content.source_url}: {e}")
-
-        # Delete the content record from database
-        db.delete(content)
-        db.commit()
         
         logger.info(f"Successfully deleted content {content_id}")
         
@@ -226,22 +323,31 @@ async def get_dashboard_stats(
     current_user: User = Depends(get_current_admin), db: Session = Depends(get_db)
 ):
     """Get dashboard statistics"""
+    cached_stats = _dashboard_cache.get("dashboard")
+    if cached_stats is not None:
+        return cached_stats
+
     from ..services.ingestion_service import ingestion_service
 
     # Get processing status
     processing_status = ingestion_service.get_processing_status(db)
 
-    # Get conversation stats
+    # Get user and conversation totals in a single round trip
     from ..models.conversation import Conversation
 
-    total_conversations = db.query(Conversation).count()
+    total_users, total_conversations = db.query(
+        db.query(func.count(User.id)).scalar_subquery(),
+        db.query(func.count(Conversation.id)).scalar_subquery(),
+    ).one()
 
-    return {
+    dashboard_stats = {
         "content_stats": processing_status,
-        "total_users": db.query(User).count(),
+        "total_users": total_users,
         "total_conversations": total_conversations,
         "active_conversations": 0,  # Real-time tracking not implemented in MVP
     }
+    _dashboard_cache.set("dashboard", dashboard_stats)
+    return dashboard_stats
 
 
 @router.get("/users")
@@ -302,6 +408,7 @@ async def update_user_role(
         if new_role in ["admin", "user"]:
             user.role = UserRole.admin if new_role == "admin" else UserRole.user
             db.commit()
+            invalidate_user_cache(user.id)
             return {"message": "User role updated successfully"}
         else:
             raise HTTPException(status_code=400, detail="Invalid role")
@@ -384,6 +491,99 @@ async def reindex_collection(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.put("/vector-db/collections/{collection_name}/tuning")
+async def update_collection_tuning(
+    collection_name: str,
+    tuning_data: dict,
+    current_user: User = Depends(get_current_admin)
+):
+    """Change quantization, on-disk vectors and HNSW settings of a collection"""
+    from ..services.qdrant_service import QUANTIZATION_MODES, qdrant_service
+
+    quantization = tuning_data.get("quantization")
+    if quantization is not None and quantization not in QUANTIZATION_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Quantization must be one of {list(QUANTIZATION_MODES)}",
+        )
+
+    updated = qdrant_service.update_collection_tuning(
+        collection_name,
+        quantization=quantization,
+        vectors_on_disk=tuning_data.get("vectors_on_disk"),
+        hnsw_m=tuning_data.get("hnsw_m"),
+        hnsw_ef_construct=tuning_data.get("hnsw_ef_construct"),
+    )
+    if not updated:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to update tuning for {collection_name}"
+        )
+    return {"message": f"Tuning updated for {collection_name}", "tuning": tuning_data}
+
+
+@router.get("/vector-db/collections/{collection_name}/search-report")
+async def get_collection_search_report(
+    collection_name: str,
+    sample_size: int = Query(50, ge=1, le=500),
+    limit: int = Query(10, ge=1, le=100),
+    current_user: User = Depends(get_current_admin)
+):
+    """Recall versus latency report for the collection's search settings"""
+    from ..services.qdrant_service import qdrant_service
+
+    try:
+        # Thousands of blocking Qdrant calls; keep them off the event loop
+        return await asyncio.to_thread(
+            qdrant_service.build_search_report,
+            collection_name,
+            sample_size=sample_size,
+            limit=limit,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/vector-db/migrate-dimensions")
+async def migrate_vector_dimensions(
+    migration_data: dict,
+    current_user: User = Depends(get_current_admin)
+):
+    """Shrink collections to their backend's vector size, switching each over by alias"""
+    from ..services.embedding_service import embedding_service
+    from ..services.qdrant_service import qdrant_service
+    from ..services.rag_service import rag_service
+
+    collection_name = migration_data.get("collection_name")
+    collections = (
+        [collection_name]
+        if collection_name
+        else list(rag_service.collection_mapping.values())
+    )
+
+    results = []
+    for collection in collections:
+        backend = embedding_service.backend_for(collection)
+        if not backend.supports_truncation:
+            results.append({
+                "collection": collection,
+                "error": f"Backend '{backend.name}' ({backend.model}) vectors cannot be truncated; reindex instead",
+            })
+            continue
+        try:
+            # Copies every point; keep the blocking Qdrant calls off the event loop
+            results.append(
+                await asyncio.to_thread(
+                    lambda: qdrant_service.migrate_collection_dimensions(
+                        collection, backend.dimensions
+                    )
+                )
+            )
+        except Exception as e:
+            results.append({"collection": collection, "error": str(e)})
+
+    return {"collections": results}
+
+
 @router.get("/settings")
 async def get_system_settings(current_user: User = Depends(get_current_admin)):
     """Get system settings"""
@@ -392,7 +592,9 @@ async def get_system_settings(current_user: User = Depends(get_current_admin)):
     return {
         "ai_settings": {
             "openai_model": "gpt-3.5-turbo",
-            "embedding_model": "text-embedding-ada-002",
+            "embedding_backend": app_settings.EMBEDDING_BACKEND,
+            "embedding_model": app_settings.OPENAI_EMBEDDING_MODEL,
+            "embedding_dimensions": app_settings.EMBEDDING_DIMENSIONS,
             "max_tokens": 1000,
             "temperature": 0.1
         },
@@ -433,7 +635,7 @@ async def search_knowledge_base(
     query: str,
     category: Optional[str] = None,
     limit: int = 10,
-    current_user: User = Depends(get_current_admin),
+    current_user: User = Depends(search_rate_limit),
     db: Session = Depends(get_db)
 ):
     """Search the knowledge base using semantic search"""
@@ -445,9 +647,6 @@ async def search_knowledge_base(
         from ..services.qdrant_service import qdrant_service
         from ..services.rag_service import rag_service
         
-        # Generate query embedding
-        query_embedding = embedding_service.generate_single_embedding(query)
-        
         # Determine which collection to search
         if category and category in rag_service.collection_mapping:
             collection_name = rag_service.collection_mapping[category]
@@ -455,33 +654,36 @@ async def search_knowledge_base(
         else:
             # Search all collections
             collections = list(rag_service.collection_mapping.values())
-        
-        all_results = []
+
+        # Embed the query once per backend used by the searched collections
+        embeddings_by_backend = {}
+        query_vectors = {}
         for collection in collections:
-            try:
-                results = qdrant_service.search_similar(
-                    collection_name=collection,
-                    query_vector=query_embedding,
-                    limit=limit,
-                    score_threshold=0.0
+            backend_name = embedding_service.backend_for(collection).name
+            if backend_name not in embeddings_by_backend:
+                embeddings_by_backend[backend_name] = await asyncio.to_thread(
+                    embedding_service.generate_single_embedding, query, collection
                 )
-                
-                # Add collection info to results
-                for result in results:
-                    result['collection'] = collection
-                    result['category'] = next(
-                        (k for k, v in rag_service.collection_mapping.items() if v == collection),
-                        "general"
-                    )
-                
-                all_results.extend(results)
-            except Exception as e:
-                logger.warning(f"Failed to search collection {collection}: {e}")
-                continue
+            query_vectors[collection] = embeddings_by_backend[backend_name]
         
-        # Sort by score and limit
-        all_results.sort(key=lambda x: x.get('score', 0), reverse=True)
-        all_results = all_results[:limit]
+        # Fan out to all collections concurrently and merge by score; the
+        # fan-out blocks until the slowest collection answers, so keep it
+        # off the event loop
+        all_results = await asyncio.to_thread(
+            qdrant_service.search_multiple_collections,
+            collection_names=collections,
+            query_vectors=query_vectors,
+            limit=limit,
+            score_threshold=0.0,
+        )
+
+        categories_by_collection = {
+            v: k for k, v in rag_service.collection_mapping.items()
+        }
+        for result in all_results:
+            result['category'] = categories_by_collection.get(
+                result['collection'], "general"
+            )
         
         return {
             "query": query,
@@ -603,38 +805,47 @@ async def get_knowledge_base_stats(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/knowledge-base/reindex/{category}")
+@router.post("/knowledge-base/reindex/{category}", status_code=status.HTTP_202_ACCEPTED)
 async def reindex_category(
     category: str,
     current_user: User = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
-    """Reindex all content in a specific category"""
+    """
+    Queue all content in a specific category for reindexing
+
+    Work runs in the background at reindex priority, below admin uploads
+    and pausing while chat is slow; follow it via /admin/ingestion/jobs.
+    """
     import logging
     logger = logging.getLogger(__name__)
     
     try:
-        from ..services.ingestion_service import ingestion_service
+        from ..services.ingestion_scheduler import IngestionPriority, ingestion_scheduler
         
         # Get all content in category
         content_items = db.query(Content).filter(
             Content.category == category
         ).all()
         
-        reprocessed = 0
+        # Reset status to pending for reprocessing
         for content in content_items:
-            # Reset status to pending for reprocessing
             content.status = ContentStatus.pending
-            db.commit()
-            
-            # Queue for reprocessing
-            await ingestion_service.queue_content_processing(str(content.id))
-            reprocessed += 1
-        
+        db.commit()
+
+        # Batches are chunked together on the process pool, then embedded
+        # and stored per item
+        content_ids = [str(content.id) for content in content_items]
+        batch_size = max(1, settings.INGESTION_REINDEX_BATCH_SIZE)
+        for start in range(0, len(content_ids), batch_size):
+            ingestion_scheduler.submit(
+                IngestionPriority.REINDEX, content_ids[start:start + batch_size]
+            )
+
         return {
             "category": category,
-            "reprocessed": reprocessed,
-            "message": f"Queued {reprocessed} items for reindexing"
+            "queued": len(content_ids),
+            "message": f"Queued {len(content_ids)} items for reindexing"
         }
         
     except Exception as e:
@@ -667,22 +878,11 @@ async def get_content_chunks(
             "ks_general"
         )
         
-        # Search for chunks with this content_id
-        from ..services.embedding_service import embedding_service
-        dummy_embedding = embedding_service.generate_single_embedding("test")
-        
-        results = qdrant_service.search_similar(
-            collection_name=collection_name,
-            query_vector=dummy_embedding,
-            limit=1000,  # Get all chunks
-            score_threshold=0.0
+        # Fetch chunks by payload filter; no query embedding needed
+        content_chunks = qdrant_service.get_points_by_content_id(
+            collection_name, content_id, limit=1000
         )
-        
-        # Filter for this content_id
-        content_chunks = [
-            r for r in results 
-            if r.get('metadata', {}).get('content_id') == content_id
-        ]
+        content_chunks.sort(key=lambda r: r['payload'].get('chunk_id', 0))
         
         return {
             "content_id": content_id,
@@ -691,6 +891,170 @@ async def get_content_chunks(
             "total": len(content_chunks)
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get content chunks: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/knowledge-base/transcript-cache/{video_id}")
+async def invalidate_transcript_cache(
+    video_id: str,
+    current_user: User = Depends(get_current_admin)
+):
+    """Drop cached transcripts of a video so the next ingest refetches it"""
+    from ..services.youtube_processor import get_transcript_cache
+
+    cache = get_transcript_cache()
+    if cache is None:
+        raise HTTPException(status_code=400, detail="Transcript cache is disabled")
+
+    removed = cache.invalidate(video_id)
+    return {"video_id": video_id, "removed": removed}
+
+
+@router.post("/knowledge-base/storage/gc")
+async def collect_storage_garbage(
+    dry_run: bool = False,
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Delete uploaded files no longer referenced by any content (Admin only)"""
+    from ..services.blob_store import blob_store
+    from ..services.document_service import document_service
+
+    stats = await asyncio.to_thread(blob_store.collect_garbage, db, dry_run)
+    if not dry_run:
+        stats["legacy_temp_files_deleted"] = await asyncio.to_thread(
+            document_service.cleanup_temp_files, db
+        )
+    return stats
+
+
+def _parse_job_id(job_id: str) -> uuid.UUID:
+    try:
+        return uuid.UUID(job_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+
+
+@router.get("/ingestion/jobs")
+async def list_ingestion_jobs(
+    since: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    content_id: Optional[uuid.UUID] = None,
+    active: bool = False,
+    limit: int = 100,
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Ingestion jobs changed since a cursor (Admin only)
+
+    Poll with cursor set to the cursor of the previous response to receive
+    the jobs that changed in between; since sets the start of the first
+    poll. Jobs may be repeated across polls; deduplicate on (id, updated_at).
+    """
+    from ..services.ingestion_jobs import list_jobs
+
+    try:
+        return list_jobs(db, since, content_id, active, max(1, min(limit, 500)), cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("/ingestion/jobs/{job_id}")
+async def get_ingestion_job(
+    job_id: str,
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Stage, progress and timings of one ingestion job (Admin only)"""
+    from ..services.ingestion_jobs import job_to_dict
+
+    job = db.get(IngestionJob, _parse_job_id(job_id))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+    return job_to_dict(job)
+
+
+@router.get("/ingestion/jobs/{job_id}/events")
+async def stream_ingestion_job(
+    job_id: str,
+    request: Request,
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Server-sent events with the job's state on every change (Admin only)
+
+    The stream ends once the job completes or fails.
+    """
+    from ..db.database import SessionLocal
+    from ..services.ingestion_jobs import TERMINAL_STAGES, job_to_dict
+
+    job_uuid = _parse_job_id(job_id)
+    if db.get(IngestionJob, job_uuid) is None:
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+
+    poll_interval = settings.INGESTION_EVENTS_POLL_SECONDS
+
+    def load_job() -> Optional[dict]:
+        # Short-lived session per poll; the request's session is not
+        # held open for the life of the stream
+        session = SessionLocal()
+        try:
+            job = session.get(IngestionJob, job_uuid)
+            return job_to_dict(job) if job else None
+        finally:
+            session.close()
+
+    async def events():
+        last_update = None
+        idle = 0.0
+        while not await request.is_disconnected():
+            payload = await asyncio.to_thread(load_job)
+
+            if payload is None:
+                yield 'event: error\ndata: {"detail": "Ingestion job not found"}\n\n'
+                return
+
+            if payload["updated_at"] != last_update:
+                last_update = payload["updated_at"]
+                idle = 0.0
+                yield f"data: {json.dumps(payload)}\n\n"
+                if payload["stage"] in TERMINAL_STAGES:
+                    return
+            elif idle >= 15:
+                yield ": keep-alive\n\n"
+                idle = 0.0
+
+            await asyncio.sleep(poll_interval)
+            idle += poll_interval
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/ingestion/metrics")
+async def get_ingestion_metrics(
+    hours: int = 24,
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Ingestion throughput and per-stage timings over recent hours (Admin only)"""
+    from ..services.ingestion_jobs import job_metrics
+
+    return job_metrics(db, max(1, min(hours, 24 * 30)))
+
+
+@router.get("/ingestion/scheduler")
+async def get_ingestion_scheduler(current_user: User = Depends(get_current_admin)):
+    """Running and waiting ingestions per priority class (Admin only)"""
+    from ..services.ingestion_scheduler import ingestion_scheduler
+
+    return ingestion_scheduler.snapshot()
@@ -1,17 +1,20 @@
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel, EmailStr
 from sqlalchemy.orm import Session
 
+from ..core.config import settings
 from ..db.database import get_db
 from ..models.user import User, UserRole
 from ..services.auth import (
-    authenticate_user,
+    authenticate_user_async,
     create_access_token,
     get_current_user,
-    get_password_hash,
+    get_password_hash_async,
+    login_throttle,
 )
+from ..services.rate_limiter import get_client_ip
 
 router = APIRouter()
 
@@ -73,7 +76,7 @@ async def register(request: RegisterRequest, db: Session = Depends(get_db)):
             )
 
     # Create new user
-    hashed_password = get_password_hash(request.password)
+    hashed_password = await get_password_hash_async(request.password)
     new_user = User(
         email=request.email,
         phone_number=request.phone_number,
@@ -95,19 +98,44 @@ async def register(request: RegisterRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=TokenResponse)
-async def login(request: LoginRequest, db: Session = Depends(get_db)):
+async def login(
+    request: LoginRequest, http_request: Request, db: Session = Depends(get_db)
+):
     """Login user and return access token"""
+    client_ip = get_client_ip(http_request)
+    # Account failures count per client, so an attacker cannot lock a user
+    # out of their account by failing logins from elsewhere
+    user_key = f"user:{request.username.strip().lower()}:{client_ip}"
+    ip_key = f"ip:{client_ip}"
+
+    # Reject throttled callers before spending any CPU on bcrypt
+    retry_after = max(
+        login_throttle.retry_after(user_key, settings.LOGIN_MAX_FAILURES_PER_USER) or 0,
+        login_throttle.retry_after(ip_key, settings.LOGIN_MAX_FAILURES_PER_IP) or 0,
+    )
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many failed login attempts, please try again later",
+            headers={"Retry-After": str(retry_after)},
+        )
+
     try:
-        user = authenticate_user(db, request.username, request.password)
+        user = await authenticate_user_async(db, request.username, request.password)
         if not user:
+            login_throttle.record_failure(user_key)
+            login_throttle.record_failure(ip_key)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
+        login_throttle.reset([user_key])
         access_token = create_access_token(data={"sub": str(user.id)})
         return TokenResponse(access_token=access_token, token_type="bearer")
+    except HTTPException:
+        raise
     except Exception as e:
         # If database is down, provide a fallback for admin user only
         if (request.username == "admin@ksai.com" and request.password == "admin123"):
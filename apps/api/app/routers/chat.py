@@ -11,7 +11,7 @@ from ..db.database import get_db
 from ..models.content import Language
 from ..models.conversation import Conversation, Message, MessageSender
 from ..models.user import User
-from ..services.auth import get_current_user
+from ..services.rate_limiter import chat_rate_limit
 
 router = APIRouter()
 logger = logging.getLogger(__name__) # Add this line to get a logger instance
@@ -38,7 +38,7 @@ class MessageResponse(BaseModel):
 @router.post("/", response_model=MessageResponse)
 async def chat(
     request: ChatRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(chat_rate_limit),
     db: Session = Depends(get_db),
 ):
     """Process chat message and return AI response"""
@@ -172,12 +172,20 @@ async def chat(
 
     # Add source information if available
     sources = rag_response.get("sources", [])
+    video_url, video_timestamp = None, None
     if sources and rag_response.get("success", False):
         sources_text = "\n\nSources:\n"
         for i, source in enumerate(sources[:3], 1):  # Limit to top 3 sources
-            sources_text += f"{i}. {source.get('title', 'Unknown')} ({source.get('source_type', 'unknown')})\n"
+            sources_text += f"{i}. {source.get('title', 'Unknown')} ({_format_location(source)})\n"
         ai_response_text += sources_text
 
+        # Deep link to the moment in the best-ranked cited video
+        for source in sources[:3]:
+            if source.get("source_type") == "youtube" and source.get("timestamp_seconds") is not None:
+                video_url = source.get("source_url") or None
+                video_timestamp = int(source["timestamp_seconds"])
+                break
+
     # Save AI response (only if we have a real conversation with database connection)
     try:
         if conversation and hasattr(conversation, 'id') and isinstance(conversation.id, (str, int)):
@@ -185,6 +193,8 @@ async def chat(
                 conversation_id=conversation.id,
                 sender=MessageSender.ai,
                 text_content=ai_response_text,
+                video_url=video_url,
+                video_timestamp_seconds=video_timestamp,
             )
             db.add(ai_message)
             db.commit()
@@ -198,8 +208,8 @@ async def chat(
                 'sender': MessageSender.ai,
                 'text_content': ai_response_text,
                 'image_url': None,
-                'video_url': None,
-                'video_timestamp_seconds': None,
+                'video_url': video_url,
+                'video_timestamp_seconds': video_timestamp,
                 'created_at': datetime.utcnow()
             })()
     except Exception as db_save_error:
@@ -215,8 +225,8 @@ async def chat(
             'sender': MessageSender.ai,
             'text_content': ai_response_text,
             'image_url': None,
-            'video_url': None,
-            'video_timestamp_seconds': None,
+            'video_url': video_url,
+            'video_timestamp_seconds': video_timestamp,
             'created_at': datetime.utcnow()
         })()
 
@@ -228,4 +238,15 @@ async def chat(
         video_url=ai_message.video_url,
         video_timestamp=ai_message.video_timestamp_seconds,
         created_at=ai_message.created_at.isoformat(),
-    )
\ No newline at end of file
+    )
+
+
+def _format_location(source: dict) -> str:
+    """Source type with its page or mm:ss position, e.g. pdf, p. 4"""
+    location = source.get("source_type", "unknown")
+    if source.get("page_number") is not None:
+        location += f", p. {source['page_number']}"
+    elif source.get("timestamp_seconds") is not None:
+        minutes, seconds = divmod(int(source["timestamp_seconds"]), 60)
+        location += f", {minutes:02d}:{seconds:02d}"
+    return location
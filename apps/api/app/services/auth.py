@@ -1,6 +1,12 @@
+import asyncio
+import hashlib
 import logging
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Iterable, Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
@@ -8,18 +14,79 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
+from ..core.cache import TTLCache
 from ..core.config import settings
 from ..db.database import get_db
-from ..models.user import User
+from ..models.user import User, UserRole
 
 logger = logging.getLogger(__name__)
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt is CPU-bound; keep it off the event loop and cap how much can queue up
+_password_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+_pending_password_hashes = 0
+
 # JWT token scheme
 security = HTTPBearer()
 
+# Verified token -> user id, each entry expiring together with its token. Keys
+# include a fingerprint of the signing secret so rotating it invalidates them.
+_token_cache = TTLCache(maxsize=settings.AUTH_TOKEN_CACHE_SIZE, ttl=0)
+
+# User id -> lightweight user snapshot, dropped on role change in this worker;
+# admin snapshots expire after AUTH_ADMIN_CACHE_TTL_SECONDS in the others
+_user_cache = TTLCache(
+    maxsize=settings.AUTH_USER_CACHE_SIZE, ttl=settings.AUTH_USER_CACHE_TTL_SECONDS
+)
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """Detached, read-only view of a user used by authenticated endpoints"""
+
+    id: Any
+    email: Optional[str]
+    phone_number: Optional[str]
+    role: UserRole
+    created_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            email=user.email,
+            phone_number=user.phone_number,
+            role=UserRole(user.role),
+            created_at=user.created_at,
+        )
+
+
+def invalidate_user_cache(user_id: Any) -> None:
+    """
+    Drop the cached snapshot for a user, e.g. after a role change
+
+    Only affects this worker. Other workers pick the change up when their
+    snapshot expires, which for admins is AUTH_ADMIN_CACHE_TTL_SECONDS.
+    """
+    _user_cache.pop(str(user_id))
+
+
+def _cache_user(user_id: str, snapshot: UserSnapshot) -> UserSnapshot:
+    ttl = None
+    if snapshot.role is UserRole.admin:
+        ttl = settings.AUTH_ADMIN_CACHE_TTL_SECONDS
+    _user_cache.set(user_id, snapshot, ttl=ttl)
+    return snapshot
+
+
+def _token_cache_key(token: str) -> str:
+    secret = hashlib.sha256(settings.JWT_SECRET.encode("utf-8")).hexdigest()[:16]
+    return f"{secret}:{token}"
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify password against hash"""
@@ -31,6 +98,76 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def _run_password_hash(func, *args):
+    """Run a bcrypt operation in the hashing pool, shedding load when saturated"""
+    global _pending_password_hashes
+
+    if _pending_password_hashes >= settings.PASSWORD_HASH_MAX_PENDING:
+        logger.warning("Password hashing pool saturated - rejecting request")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service busy, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+    _pending_password_hashes += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_password_hash_executor, func, *args)
+    finally:
+        _pending_password_hashes -= 1
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify password against hash without blocking the event loop"""
+    return await _run_password_hash(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash password without blocking the event loop"""
+    return await _run_password_hash(get_password_hash, password)
+
+
+class LoginThrottle:
+    """
+    Fixed-window counter of failed login attempts
+
+    Keys (an account and client IP pair, or a client IP) that exceed their
+    failure budget are rejected before any password hashing takes place.
+    """
+
+    def __init__(self, window_seconds: int, maxsize: int = 100000):
+        self.window_seconds = window_seconds
+        self._failures = TTLCache(maxsize=maxsize, ttl=window_seconds)
+
+    def retry_after(self, key: str, max_failures: int) -> Optional[int]:
+        """Seconds until key may try again, or None if it is not throttled"""
+        entry = self._failures.get(key)
+        if entry is None:
+            return None
+
+        count, window_ends_at = entry
+        if count < max_failures:
+            return None
+        return max(1, math.ceil(window_ends_at - time.time()))
+
+    def record_failure(self, key: str) -> None:
+        """Count a failed attempt within the current window"""
+        now = time.time()
+        count, window_ends_at = self._failures.get(
+            key, (0, now + self.window_seconds)
+        )
+        self._failures.set(key, (count + 1, window_ends_at), ttl=window_ends_at - now)
+
+    def reset(self, keys: Iterable[str]) -> None:
+        """Forget failures, e.g. after a successful login"""
+        for key in keys:
+            self._failures.pop(key)
+
+
+login_throttle = LoginThrottle(window_seconds=settings.LOGIN_FAILURE_WINDOW_SECONDS)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token"""
     to_encode = data.copy()
@@ -60,6 +197,19 @@ def authenticate_user(db: Session, username: str, password: str):
     return user
 
 
+async def authenticate_user_async(db: Session, username: str, password: str):
+    """Authenticate user, verifying the password in the hashing pool"""
+    user = (
+        db.query(User)
+        .filter((User.email == username) | (User.phone_number == username))
+        .first()
+    )
+
+    if not user or not await verify_password_async(password, user.password_hash):
+        return False
+    return user
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db),
@@ -71,62 +221,75 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    try:
-        payload = jwt.decode(
-            credentials.credentials,
-            settings.JWT_SECRET,
-            algorithms=[settings.JWT_ALGORITHM],
-        )
-        user_id: str = payload.get("sub")
-        if user_id is None:
+    token = credentials.credentials
+    cache_key = _token_cache_key(token)
+    user_id: Optional[str] = _token_cache.get(cache_key)
+
+    if user_id is None:
+        try:
+            payload = jwt.decode(
+                token,
+                settings.JWT_SECRET,
+                algorithms=[settings.JWT_ALGORITHM],
+            )
+            user_id = payload.get("sub")
+            if user_id is None:
+                raise credentials_exception
+        except JWTError:
             raise credentials_exception
-    except JWTError:
-        raise credentials_exception
+
+        # Cache the verified token only until it expires
+        expires_at = payload.get("exp")
+        if expires_at is not None:
+            _token_cache.set(cache_key, user_id, ttl=float(expires_at) - time.time())
 
     # Handle fallback admin token
     if user_id == "admin-fallback":
         # Check if admin user exists in database, create if not
         import uuid
-        from ..models.user import UserRole
         admin_uuid = str(uuid.UUID('00000000-0000-0000-0000-000000000001'))
         
         try:
             # Try to get existing admin user
             admin_user = db.query(User).filter(User.id == admin_uuid).first()
             if admin_user:
-                return admin_user
+                return UserSnapshot.from_user(admin_user)
             
             # Create admin user if it doesn't exist
             admin_user = User(
                 id=admin_uuid,
                 email="admin@ksai.com",
                 phone_number=None,
-                password_hash=get_password_hash("admin123"),  # Default password, should be changed
+                password_hash=await get_password_hash_async("admin123"),  # Default password, should be changed
                 role=UserRole.admin
             )
             db.add(admin_user)
             db.commit()
             db.refresh(admin_user)
-            return admin_user
+            return UserSnapshot.from_user(admin_user)
         except Exception as e:
             logger.warning(f"Could not create/fetch admin user: {e}")
-            # Return mock user if database operations fail
-            class MockUser:
-                def __init__(self):
-                    self.id = admin_uuid
-                    self.email = "admin@ksai.com"
-                    self.phone_number = None
-                    self.role = UserRole.admin
-                    self.created_at = datetime.utcnow()
-            return MockUser()
+            # Return a detached admin if database operations fail
+            return UserSnapshot(
+                id=admin_uuid,
+                email="admin@ksai.com",
+                phone_number=None,
+                role=UserRole.admin,
+                created_at=datetime.utcnow(),
+            )
     
+    cached_user = _user_cache.get(user_id)
+    if cached_user is not None:
+        return cached_user
+
     try:
         user = db.query(User).filter(User.id == user_id).first()
-        if user is None:
-            raise credentials_exception
-        return user
     except Exception:
         raise credentials_exception
+    if user is None:
+        raise credentials_exception
+
+    return _cache_user(user_id, UserSnapshot.from_user(user))
 
 
 async def get_current_admin(current_user: User = Depends(get_current_user)):
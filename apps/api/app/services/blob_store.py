@@ -0,0 +1,166 @@
+"""
+Blob Store
+
+This service handles:
+- Storing uploaded files by SHA-256 of their content in hash-sharded directories
+- Deduplicating identical uploads onto one file
+- Counting references to each blob from Content.source_url
+- Deleting blobs once no content references them (on delete and in a GC pass)
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.content import Content
+
+logger = logging.getLogger(__name__)
+
+
+class BlobStore:
+    """
+    Content-addressed file store
+
+    A blob with digest d is stored as <root>/<d[:2]>/<d[2:4]>/<d><suffix>.
+    Writes are atomic (temp file + rename), so a blob path either holds the
+    complete file or does not exist.
+    """
+
+    def __init__(self, root: str, gc_grace_seconds: float = 3600):
+        self.root = Path(root).resolve()
+        self.gc_grace_seconds = gc_grace_seconds
+
+    def put(self, data: bytes, suffix: str = "") -> str:
+        """
+        Store bytes, returning the absolute blob path
+
+        Storing content that is already present returns the existing path.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path_for(digest, suffix)
+        if path.exists():
+            logger.info(f"Upload matches existing blob {path.name}")
+            os.utime(path)  # restart the GC grace period
+            return str(path)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+        logger.info(f"Stored blob {path.name} ({len(data)} bytes)")
+        return str(path)
+
+    def path_for(self, digest: str, suffix: str = "") -> Path:
+        return self.root / digest[:2] / digest[2:4] / f"{digest}{suffix.lower()}"
+
+    def contains(self, path: str) -> bool:
+        """Whether a path lies inside the store"""
+        try:
+            Path(path).resolve().relative_to(self.root)
+            return True
+        except ValueError:
+            return False
+
+    def reference_count(self, path: str, db: Session) -> int:
+        """Number of content rows whose source is this path"""
+        return db.query(func.count(Content.id)).filter(Content.source_url == path).scalar() or 0
+
+    def release(self, path: str, db: Session) -> bool:
+        """
+        Delete a file once nothing references it
+
+        Call after the referencing content row has been deleted. Blobs
+        younger than the GC grace period are left to collect_garbage, since
+        a concurrent upload of the same content may have just returned this
+        path without having committed its content row yet. Files outside
+        the store (legacy uploads) are deleted right away.
+
+        Returns:
+            Whether the file was deleted
+        """
+        if self.reference_count(path, db):
+            logger.info(f"Keeping {path}: still referenced by other content")
+            return False
+        try:
+            cutoff = time.time() - self.gc_grace_seconds
+            if self.contains(path) and os.stat(path).st_mtime > cutoff:
+                logger.info(f"Leaving recently stored {path} to blob GC")
+                return False
+            os.remove(path)
+            logger.info(f"Deleted unreferenced file {path}")
+            return True
+        except FileNotFoundError:
+            return False
+
+    def collect_garbage(self, db: Session, dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Delete blobs that no content references
+
+        Blobs younger than the grace period are kept, since an upload's
+        content row is committed just after its blob is written. Leftover
+        temp files from interrupted writes are removed as well.
+        """
+        referenced = {
+            source_url
+            for (source_url,) in db.query(Content.source_url).distinct()
+            if source_url
+        }
+        cutoff = time.time() - self.gc_grace_seconds
+        stats = {"scanned": 0, "referenced": 0, "deleted": 0, "freed_bytes": 0, "dry_run": dry_run}
+
+        if not self.root.exists():
+            return stats
+
+        for path in self.root.glob("*/*/*"):
+            if not path.is_file():
+                continue
+            stats["scanned"] += 1
+            if str(path) in referenced:
+                stats["referenced"] += 1
+                continue
+
+            try:
+                info = path.stat()
+                if info.st_mtime > cutoff:
+                    continue
+                if not dry_run:
+                    path.unlink()
+            except FileNotFoundError:
+                continue
+            stats["deleted"] += 1
+            stats["freed_bytes"] += info.st_size
+
+        logger.info(
+            f"Blob GC: {stats['deleted']} of {stats['scanned']} blobs unreferenced, "
+            f"{stats['freed_bytes']} bytes{' (dry run)' if dry_run else ''}"
+        )
+        return stats
+
+    def resolve(self, source_url: str) -> Optional[str]:
+        """Local path for a content source, or None if the file is missing"""
+        path = source_url
+        if not os.path.isabs(path):
+            # Relative sources are relative to the uploads directory
+            path = os.path.join("uploads", path)
+        return path if os.path.exists(path) else None
+
+
+# Global instance
+blob_store = BlobStore(settings.BLOB_STORE_DIR, settings.BLOB_GC_GRACE_SECONDS)
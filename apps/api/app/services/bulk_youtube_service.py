@@ -0,0 +1,333 @@
+"""
+Bulk YouTube Ingestion Service
+
+This service handles:
+- Accepting many video URLs, playlist/channel URLs or a manifest file at once
+- Expanding playlists and channels into video URLs (pytube, optional)
+- Skipping videos that are already in the content table
+- Ingesting videos concurrently under a global cap, at reindex priority in
+  the ingestion scheduler; requests to YouTube are rate limited where they
+  are made (see youtube_processor.RequestThrottle)
+- Recording each job and its per-item progress in the database, so every
+  API worker can report it
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.content import Content, ContentStatus, ContentType, Language
+from ..models.ingestion import BulkIngestionItem, BulkIngestionJob
+from .ingestion_scheduler import IngestionPriority, ingestion_scheduler
+from .youtube_processor import extract_video_id, get_youtube_throttle
+
+try:
+    from pytube import Channel, Playlist
+
+    PYTUBE_AVAILABLE = True
+except ImportError:
+    PYTUBE_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def canonical_video_url(video_id: str) -> str:
+    return f"https://www.youtube.com/watch?v={video_id}"
+
+
+def job_to_dict(job: BulkIngestionJob, items: List[BulkIngestionItem]) -> Dict[str, Any]:
+    counts: Dict[str, int] = {}
+    for item in items:
+        counts[item.status] = counts.get(item.status, 0) + 1
+    return {
+        "job_id": str(job.id),
+        "status": job.status,
+        "error": job.error,
+        "category": job.category,
+        "total": len(items),
+        "counts": counts,
+        "items": [
+            {
+                "url": item.url,
+                "video_id": item.video_id,
+                "status": item.status,
+                "content_id": str(item.content_id) if item.content_id else None,
+                "error": item.error,
+            }
+            for item in items
+        ],
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+class _JobRecorder:
+    """Writes a running job's status and items through one session"""
+
+    def __init__(self, job: BulkIngestionJob, db: Session):
+        self.job = job
+        self.db = db
+        self._positions = 0
+
+    def set_status(self, status: str, error: Optional[str] = None) -> None:
+        self.job.status = status
+        if error is not None:
+            self.job.error = error[:2000]
+        if status in ("completed", "failed"):
+            self.job.finished_at = datetime.utcnow()
+        self.db.commit()
+
+    def add_item(
+        self, url: str, video_id: Optional[str], status: str, **fields
+    ) -> BulkIngestionItem:
+        """Add an item (committed with the next status change)"""
+        item = BulkIngestionItem(
+            job_id=self.job.id,
+            position=self._positions,
+            url=url,
+            video_id=video_id,
+            status=status,
+            **fields,
+        )
+        self._positions += 1
+        self.db.add(item)
+        return item
+
+    def update_item(self, item: BulkIngestionItem, **fields) -> None:
+        for name, value in fields.items():
+            setattr(item, name, value)
+        self.db.commit()
+
+
+class BulkYouTubeService:
+    def parse_manifest(self, data: bytes) -> List[str]:
+        """
+        Read URLs from a manifest file
+
+        Accepts a JSON list of URLs, a JSON object with a "urls" list, or
+        plain text with one URL per line (blank lines and # comments ignored;
+        for CSV the first column is used).
+        """
+        text = data.decode("utf-8-sig").strip()
+        if text.startswith("[") or text.startswith("{"):
+            parsed = json.loads(text)
+            urls = parsed.get("urls", []) if isinstance(parsed, dict) else parsed
+            return [str(url).strip() for url in urls if str(url).strip()]
+
+        urls = []
+        for line in text.splitlines():
+            line = line.split(",", 1)[0].strip().strip('"')
+            if line and not line.startswith("#") and line.lower() != "url":
+                urls.append(line)
+        return urls
+
+    def create_job(
+        self,
+        db: Session,
+        urls: List[str],
+        category: str,
+        language: Language,
+        needs_translation: bool = False,
+    ) -> BulkIngestionJob:
+        """Record a job; run it with run_job"""
+        job = BulkIngestionJob(
+            status="queued",
+            urls=urls,
+            category=category,
+            language=language.value,
+            needs_translation=needs_translation,
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        return job
+
+    def get_job(self, db: Session, job_id: str) -> Optional[Dict[str, Any]]:
+        """A job with its items, or None if there is no such job"""
+        try:
+            job_uuid = uuid.UUID(job_id)
+        except ValueError:
+            return None
+
+        job = db.query(BulkIngestionJob).filter(BulkIngestionJob.id == job_uuid).first()
+        if job is None:
+            return None
+        items = (
+            db.query(BulkIngestionItem)
+            .filter(BulkIngestionItem.job_id == job_uuid)
+            .order_by(BulkIngestionItem.position)
+            .all()
+        )
+        return job_to_dict(job, items)
+
+    async def run_job(self, job_id: str) -> None:
+        """Expand, dedupe and ingest all videos of a job"""
+        from ..db.database import SessionLocal
+        from .ingestion_service import ingestion_service
+
+        db = SessionLocal()
+        try:
+            job = db.query(BulkIngestionJob).filter(BulkIngestionJob.id == job_id).first()
+            if job is None:
+                return
+            recorder = _JobRecorder(job, db)
+
+            try:
+                recorder.set_status("expanding")
+                video_urls = await self._expand_urls(recorder)
+
+                recorder.set_status("deduplicating")
+                pending = self._create_content(recorder, video_urls)
+
+                recorder.set_status("ingesting")
+                semaphore = asyncio.Semaphore(max(1, settings.BULK_YOUTUBE_CONCURRENCY))
+                # Items waiting for the semaphore stay pending; keep the
+                # stale sweeper from queueing them a second time
+                async with ingestion_service.heartbeat(
+                    [str(item.content_id) for item in pending]
+                ):
+                    await asyncio.gather(
+                        *(self._ingest_item(recorder, item, semaphore) for item in pending)
+                    )
+                recorder.set_status("completed")
+
+            except Exception as e:
+                logger.error(f"Bulk YouTube job {job_id} failed: {e}", exc_info=True)
+                db.rollback()
+                recorder.set_status("failed", error=str(e))
+        finally:
+            db.close()
+
+    async def _expand_urls(self, recorder: _JobRecorder) -> List[str]:
+        """Replace playlist and channel URLs by the URLs of their videos"""
+        video_urls = []
+        for url in recorder.job.urls:
+            url = url.replace(" ", "")
+            if extract_video_id(url) and "list=" not in url:
+                video_urls.append(url)
+                continue
+
+            kind = "playlist" if "list=" in url else "channel" if self._is_channel(url) else None
+            if kind is None:
+                recorder.add_item(
+                    url, None, "invalid", error="Not a YouTube video, playlist or channel URL"
+                )
+                continue
+            if not PYTUBE_AVAILABLE:
+                recorder.add_item(
+                    url, None, "invalid", error=f"pytube not available to expand {kind} URLs"
+                )
+                continue
+
+            source = Playlist if kind == "playlist" else Channel
+            try:
+                expanded = await asyncio.to_thread(self._list_videos, source, url)
+                logger.info(f"Expanded {kind} {url} into {len(expanded)} videos")
+                video_urls.extend(expanded)
+            except Exception as e:
+                recorder.add_item(url, None, "invalid", error=f"Failed to expand {kind}: {e}")
+
+        return video_urls
+
+    @staticmethod
+    def _list_videos(source, url: str) -> List[str]:
+        get_youtube_throttle().wait()
+        return list(source(url).video_urls)
+
+    def _create_content(
+        self, recorder: _JobRecorder, video_urls: List[str]
+    ) -> List[BulkIngestionItem]:
+        """Create pending content rows for new videos; returns their items"""
+        job, db = recorder.job, recorder.db
+        by_video: Dict[str, str] = {}
+        for url in video_urls:
+            by_video.setdefault(extract_video_id(url), url)
+        existing = self._existing_videos(db, list(by_video))
+
+        pending = []
+        for video_id, url in by_video.items():
+            if video_id in existing:
+                recorder.add_item(url, video_id, "duplicate", content_id=existing[video_id])
+                continue
+            if len(pending) >= settings.BULK_YOUTUBE_MAX_ITEMS:
+                recorder.add_item(url, video_id, "skipped", error="Job item limit reached")
+                continue
+
+            canonical_url = canonical_video_url(video_id)
+            content = Content(
+                title=f"YouTube Video: {canonical_url}",
+                source_url=canonical_url,
+                source_type=ContentType.youtube,
+                video_id=video_id,
+                language=Language(job.language),
+                category=job.category,
+                needs_translation=job.needs_translation,
+                status=ContentStatus.pending,
+            )
+            db.add(content)
+            pending.append((url, video_id, content))
+
+        db.flush()
+        items = [
+            recorder.add_item(url, video_id, "queued", content_id=content.id)
+            for url, video_id, content in pending
+        ]
+        db.commit()
+        return items
+
+    @staticmethod
+    def _existing_videos(
+        db: Session, video_ids: List[str], batch_size: int = 500
+    ) -> Dict[str, str]:
+        """
+        Content id of each video already in the knowledge base
+
+        Matches on the stored video ID, so a video is found however its URL
+        was written (youtu.be, extra parameters such as &t= or ?si=, ...).
+        """
+        existing: Dict[str, str] = {}
+        for start in range(0, len(video_ids), batch_size):
+            rows = (
+                db.query(Content.id, Content.video_id)
+                .filter(
+                    Content.source_type == ContentType.youtube,
+                    Content.video_id.in_(video_ids[start : start + batch_size]),
+                )
+                .all()
+            )
+            for content_id, video_id in rows:
+                existing.setdefault(video_id, str(content_id))
+        return existing
+
+    async def _ingest_item(
+        self, recorder: _JobRecorder, item: BulkIngestionItem, semaphore: asyncio.Semaphore
+    ) -> None:
+        async with semaphore:
+            content_id = str(item.content_id)
+            recorder.update_item(item, status="processing")
+            try:
+                results = await ingestion_scheduler.run(IngestionPriority.REINDEX, [content_id])
+                success = results.get(content_id, False)
+                recorder.update_item(
+                    item,
+                    status="completed" if success else "failed",
+                    error=None if success else "Processing failed; see the content's ingestion job",
+                )
+            except Exception as e:
+                recorder.update_item(item, status="failed", error=str(e)[:2000])
+
+    @staticmethod
+    def _is_channel(url: str) -> bool:
+        path = urlparse(url).path
+        return "youtube.com" in url and path.startswith(("/channel/", "/c/", "/user/", "/@"))
+
+
+# Global instance
+bulk_youtube_service = BulkYouTubeService()
@@ -0,0 +1,295 @@
+"""
+Text Chunking
+
+This module handles:
+- Text preprocessing before chunking
+- Single-pass, boundary-aware token chunking of a document
+- Bulk chunking of many documents on a process pool
+
+Process pool workers import this module, so it imports only modules that
+construct nothing at import time: the text normalizer, and youtube_processor
+for the TranscriptSegments type (its settings and transcript provider are
+loaded lazily). No service singletons are created in the workers.
+"""
+
+import bisect
+import logging
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+import tiktoken
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from .text_normalizer import NormalizedText, OffsetIndex, normalize_document
+from .youtube_processor import TranscriptSegments
+
+# A raw document: extracted text, or transcript segments
+Document = Union[str, TranscriptSegments]
+
+logger = logging.getLogger(__name__)
+
+# Preferred chunk boundaries, strongest first: blank lines, sentence ends
+# (Latin and Devanagari danda) and plain whitespace. Group 1 is the gap
+# between units; tiktoken attaches a leading space to the following word,
+# so chunks are cut where the gap starts.
+_PARAGRAPH_BREAK = re.compile(r"\S(\s*\n[ \t]*\n)")
+_SENTENCE_END = re.compile(r"[.!?\u0964][\"')\]]*(\s+)")
+_WHITESPACE = re.compile(r"\S(\s+)")
+
+
+def token_char_offsets(encoding, tokens: List[int]) -> List[int]:
+    """
+    Character offset at which each token starts
+
+    Equivalent to encoding.decode_with_offsets, but counts UTF-8 character
+    starts with vectorised operations instead of a per-byte Python loop.
+    A token that begins inside a multi-byte character maps to that character.
+    """
+    if not NUMPY_AVAILABLE:
+        return encoding.decode_with_offsets(tokens)[1]
+    if not tokens:
+        return []
+
+    token_bytes = encoding.decode_tokens_bytes(tokens)
+    data = np.frombuffer(b"".join(token_bytes), dtype=np.uint8)
+    byte_starts = np.zeros(len(token_bytes), dtype=np.int64)
+    np.cumsum([len(b) for b in token_bytes[:-1]], out=byte_starts[1:])
+    # Running count of characters started so far (continuation bytes are 10xxxxxx)
+    chars_started = np.cumsum((data & 0xC0) != 0x80)
+    return (chars_started[byte_starts] - 1).tolist()
+
+
+def iter_text_chunks(
+    text: str,
+    encoding,
+    max_tokens: int = 500,
+    overlap: int = 50,
+    segment_gaps: Optional[Sequence[int]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Split text into overlapping token-bounded chunks at natural boundaries
+
+    The text is tokenised once. Chunks are character slices of the original
+    string, cut at the latest paragraph, sentence, segment or word boundary
+    that keeps them within max_tokens (falling back to a hard token cut when no
+    boundary lies in the second half of the window).
+
+    Args:
+        text: Input text to chunk
+        encoding: tiktoken encoding used to count tokens
+        max_tokens: Maximum tokens per chunk
+        overlap: Approximate number of tokens repeated between chunks, at
+            most half of the preceding chunk
+        segment_gaps: Sorted offsets where source segments (e.g. transcript
+            captions) are joined, preferred over plain word gaps
+
+    Yields:
+        Chunk dicts with text, chunk_id, token and character offsets
+    """
+    if not text.strip():
+        return
+
+    tokens = encoding.encode(text, disallowed_special=())
+    offsets = token_char_offsets(encoding, tokens)
+    total = len(tokens)
+    # offsets[i] is where token i starts; a sentinel closes the last token
+    offsets.append(len(text))
+
+    boundaries = [
+        [m.start(1) for m in pattern.finditer(text)]
+        for pattern in (_PARAGRAPH_BREAK, _SENTENCE_END, _WHITESPACE)
+    ]
+    word_gaps = boundaries[-1]
+    if segment_gaps:
+        boundaries.insert(2, segment_gaps)
+
+    def cut_point(start: int, limit: int) -> int:
+        """Token index to end a chunk starting at start, at most limit"""
+        if limit >= total:
+            return total
+        low_char = offsets[start + max(1, (limit - start) // 2)]
+        high_char = offsets[limit]
+        for positions in boundaries:
+            i = bisect.bisect_right(positions, high_char) - 1
+            if i >= 0 and positions[i] > low_char:
+                end = bisect.bisect_left(offsets, positions[i], start + 1, limit + 1)
+                if start < end <= limit:
+                    return end
+        return limit
+
+    start = 0
+    chunk_id = 0
+    while start < total:
+        end = cut_point(start, min(start + max_tokens, total))
+        start_char, end_char = offsets[start], offsets[end]
+
+        # Trim surrounding whitespace without copying the text twice
+        while start_char < end_char and text[start_char].isspace():
+            start_char += 1
+        while end_char > start_char and text[end_char - 1].isspace():
+            end_char -= 1
+
+        if start_char < end_char:
+            yield {
+                "text": text[start_char:end_char],
+                "chunk_id": chunk_id,
+                "start_token": start,
+                "end_token": end,
+                "token_count": end - start,
+                "start_char": start_char,
+                "end_char": end_char,
+            }
+            chunk_id += 1
+
+        if end >= total:
+            break
+
+        # Step back by the overlap, then forward to the next word. The overlap
+        # never exceeds half the chunk, so each step covers at least half of
+        # it and chunking stays linear even when overlap >= max_tokens.
+        next_start = max(start + (end - start + 1) // 2, end - overlap)
+        i = bisect.bisect_left(word_gaps, offsets[next_start])
+        if i < len(word_gaps):
+            snapped = bisect.bisect_left(offsets, word_gaps[i], next_start, end)
+            if snapped < end:
+                next_start = snapped
+        start = next_start
+
+
+def preprocess_text(text: str) -> str:
+    """
+    Preprocess text before embedding generation
+
+    Args:
+        text: Raw text to preprocess
+
+    Returns:
+        Preprocessed text (see text_normalizer.normalize_document)
+    """
+    return normalize_document(text).text
+
+
+def chunk_document(
+    document: Document, encoding, max_tokens: int = 500, overlap: int = 50
+) -> List[Dict[str, Any]]:
+    """
+    Preprocess and chunk one document
+
+    Each chunk also carries page_number/page_end (PDFs) or
+    timestamp_seconds (transcripts) when the source has that information.
+    Transcript segments are already normalised when built and are chunked
+    at segment boundaries.
+    """
+    segment_gaps = None
+    if isinstance(document, TranscriptSegments):
+        normalized = NormalizedText(text=document.text, timestamps=document.timestamps())
+        segment_gaps = document.boundaries()
+    else:
+        normalized = normalize_document(document)
+    offsets = OffsetIndex(normalized)
+
+    chunks = []
+    for chunk in iter_text_chunks(
+        normalized.text, encoding, max_tokens, overlap, segment_gaps
+    ):
+        chunk.update(offsets.locate(chunk["start_char"], chunk["end_char"]))
+        chunks.append(chunk)
+    return chunks
+
+
+def document_length(document: Document) -> int:
+    """Characters of text in a document"""
+    if isinstance(document, TranscriptSegments):
+        return len(document.text)
+    return len(document)
+
+
+# Per-process tokenizer, loaded once by the pool initializer
+_worker_encoding = None
+
+
+def _init_worker(encoding_name: str) -> None:
+    global _worker_encoding
+    _worker_encoding = tiktoken.get_encoding(encoding_name)
+
+
+def _chunk_in_worker(job: tuple) -> List[Dict[str, Any]]:
+    text, max_tokens, overlap = job
+    return chunk_document(text, _worker_encoding, max_tokens, overlap)
+
+
+class ChunkingPool:
+    """
+    Process pool that chunks many documents in parallel
+
+    Each worker builds its tiktoken encoding once at start-up. Workers are
+    spawned rather than forked so they do not inherit the API's threads and
+    client connections. Small batches are chunked in the calling process,
+    where pickling the text would cost more than it saves.
+    """
+
+    def __init__(self, encoding, workers: int = 0, min_parallel_chars: int = 200_000):
+        self.encoding = encoding
+        self.workers = workers or os.cpu_count() or 1
+        self.min_parallel_chars = min_parallel_chars
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def chunk_documents(
+        self, texts: Sequence[Document], max_tokens: int = 500, overlap: int = 50
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Chunk documents, returning one chunk list per document in input order
+
+        Args:
+            texts: Raw document texts or transcript segments
+            max_tokens: Maximum tokens per chunk
+            overlap: Number of overlapping tokens between chunks
+
+        Returns:
+            List of chunk lists aligned with texts
+        """
+        if (
+            self.workers <= 1
+            or len(texts) <= 1
+            or sum(document_length(text) for text in texts) < self.min_parallel_chars
+        ):
+            return [
+                chunk_document(text, self.encoding, max_tokens, overlap) for text in texts
+            ]
+
+        jobs = [(text, max_tokens, overlap) for text in texts]
+        try:
+            # map yields results in input order
+            return list(self._get_executor().map(_chunk_in_worker, jobs))
+        except BrokenProcessPool:
+            logger.error("Chunking pool crashed - chunking in process instead")
+            self.shutdown()
+            return [
+                chunk_document(text, self.encoding, max_tokens, overlap) for text in texts
+            ]
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.encoding.name,),
+            )
+            logger.info(f"Started chunking pool with {self.workers} workers")
+        return self._executor
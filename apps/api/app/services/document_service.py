@@ -1,20 +1,22 @@
 """
-Document Processing Service - UPDATED 2025-08-08 04:25:00
+Document Processing Service
 
 This service handles:
 - PDF text extraction
 - YouTube video transcript extraction
 - Document preprocessing and cleaning
-- File management and storage
-
-CRITICAL FIX: YouTube API updated to use api.fetch() method
+- File management and storage (uploads go to the content-addressed blob store)
 """
 
 import logging
+import mmap
 import os
+import re
 import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 # PDF processing
 try:
@@ -26,39 +28,118 @@ except ImportError:
     logger = logging.getLogger(__name__)
     logger.warning("PyPDF2 not available - PDF processing disabled")
 
-# YouTube processing
-try:
-    import re
-    
-    # Use importlib to avoid caching issues
-    import importlib
-    youtube_transcript_api = importlib.import_module('youtube_transcript_api')
-    YouTubeTranscriptApi = youtube_transcript_api.YouTubeTranscriptApi
-    
-    # Force reload if already cached
-    importlib.reload(youtube_transcript_api)
-    YouTubeTranscriptApi = youtube_transcript_api.YouTubeTranscriptApi
-
-    YOUTUBE_AVAILABLE = True
-    logger = logging.getLogger(__name__)
-    logger.info("YouTube transcript API loaded successfully with cache bypass")
-except ImportError as e:
-    YOUTUBE_AVAILABLE = False
-    logger = logging.getLogger(__name__)
-    logger.warning(f"YouTube libraries not available - YouTube processing disabled: {e}")
+from ..core.cache import TTLCache
+from ..core.config import settings
+from .blob_store import blob_store
+
+# YouTube processing (the transcript library itself is imported lazily by
+# the transcript provider on first use)
+from .youtube_processor import (
+    TranscriptSegments,
+    fetch_youtube_transcript,
+    get_transcript_provider,
+)
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class PdfPage:
+    """Text extracted from one PDF page; error is set when extraction failed"""
+
+    page_number: int
+    text: str
+    error: Optional[str] = None
+
+    @property
+    def char_count(self) -> int:
+        return len(self.text)
+
+
+class MappedPdf:
+    """
+    A PDF read through a read-only memory map
+
+    The PdfReader is created only when a page is missing from the page
+    cache, and then touches just the parts of the file it needs.
+    """
+
+    def __init__(self, mapped: mmap.mmap, file_key: Any, page_cache: TTLCache):
+        self.mapped = mapped
+        self.file_key = file_key
+        self.page_cache = page_cache
+        self._reader = None
+
+    @property
+    def reader(self):
+        if self._reader is None:
+            self._reader = PyPDF2.PdfReader(self.mapped)
+        return self._reader
+
+    @property
+    def page_count(self) -> int:
+        key = (self.file_key, "page_count")
+        count = self.page_cache.get(key)
+        if count is None:
+            count = len(self.reader.pages)
+            self.page_cache.set(key, count)
+        return count
+
+    @property
+    def document_info(self) -> Dict[str, str]:
+        """Title, author and other document information entries"""
+        key = (self.file_key, "document_info")
+        info = self.page_cache.get(key)
+        if info is None:
+            info = {}
+            pdf_meta = self.reader.metadata
+            if pdf_meta:
+                info = {
+                    "title": pdf_meta.get("/Title", ""),
+                    "author": pdf_meta.get("/Author", ""),
+                    "subject": pdf_meta.get("/Subject", ""),
+                    "creator": pdf_meta.get("/Creator", ""),
+                    "producer": pdf_meta.get("/Producer", ""),
+                    "creation_date": str(pdf_meta.get("/CreationDate", "")),
+                    "modification_date": str(pdf_meta.get("/ModDate", "")),
+                }
+            self.page_cache.set(key, info)
+        return info
+
+    def page(self, index: int) -> PdfPage:
+        """Page at a 0-based index, from the cache when already extracted"""
+        key = (self.file_key, index)
+        page = self.page_cache.get(key)
+        if page is not None:
+            return page
+
+        try:
+            page = PdfPage(index + 1, self.reader.pages[index].extract_text() or "")
+        except Exception as e:
+            logger.warning(f"Failed to extract text from page {index + 1}: {e}")
+            # Failures are not cached so a retry extracts again
+            return PdfPage(index + 1, "", error=str(e))
+
+        self.page_cache.set(key, page)
+        return page
+
+
 class DocumentService:
     def __init__(self):
         self.temp_dir = Path(tempfile.gettempdir()) / "ks_ai_docs"
         self.temp_dir.mkdir(exist_ok=True)
+        # Extracted pages keyed by (file key, page index); see _file_key
+        self._page_cache = TTLCache(
+            maxsize=settings.PDF_PAGE_CACHE_SIZE, ttl=settings.PDF_PAGE_CACHE_TTL_SECONDS
+        )
 
     def extract_pdf_text(self, file_path: str) -> Tuple[str, Dict[str, Any]]:
         """
         Extract text content from a PDF file
 
+        Pages are extracted one at a time and joined once, each preceded by
+        a "--- Page N ---" marker line.
+
         Args:
             file_path: Path to the PDF file
 
@@ -69,59 +150,121 @@ class DocumentService:
             raise ImportError("PyPDF2 not available for PDF processing")
 
         try:
-            with open(file_path, "rb") as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-
-                # Extract metadata
-                metadata = {
-                    "page_count": len(pdf_reader.pages),
-                    "source_type": "pdf",
-                    "file_name": Path(file_path).name,
-                }
-
-                # Add PDF metadata if available
-                if pdf_reader.metadata:
-                    pdf_meta = pdf_reader.metadata
-                    metadata.update(
-                        {
-                            "title": pdf_meta.get("/Title", ""),
-                            "author": pdf_meta.get("/Author", ""),
-                            "subject": pdf_meta.get("/Subject", ""),
-                            "creator": pdf_meta.get("/Creator", ""),
-                            "producer": pdf_meta.get("/Producer", ""),
-                            "creation_date": str(pdf_meta.get("/CreationDate", "")),
-                            "modification_date": str(pdf_meta.get("/ModDate", "")),
-                        }
-                    )
-
-                # Extract text from all pages
-                full_text = ""
-                for page_num, page in enumerate(pdf_reader.pages):
-                    try:
-                        page_text = page.extract_text()
-                        if page_text.strip():
-                            full_text += f"\n--- Page {page_num + 1} ---\n"
-                            full_text += page_text
-                            full_text += "\n"
-                    except Exception as e:
-                        logger.warning(
-                            f"Failed to extract text from page {page_num + 1}: {e}"
-                        )
-                        continue
-
-                if not full_text.strip():
+            with self._open_pdf(file_path) as pdf:
+                metadata = self._pdf_metadata(pdf, file_path)
+
+                parts = []
+                failed_pages = []
+                for index in range(pdf.page_count):
+                    page = pdf.page(index)
+                    if page.error:
+                        failed_pages.append(page.page_number)
+                    elif page.text.strip():
+                        parts.append(f"--- Page {page.page_number} ---\n{page.text}")
+
+                metadata["pages_extracted"] = len(parts)
+                metadata["failed_pages"] = failed_pages
+
+                if not parts:
                     raise ValueError("No readable text found in PDF")
 
+                full_text = "\n\n".join(parts)
                 logger.info(
-                    f"Extracted text from PDF: {len(full_text)} characters, {metadata['page_count']} pages"
+                    f"Extracted text from PDF: {len(full_text)} characters, "
+                    f"{metadata['page_count']} pages ({len(failed_pages)} failed)"
                 )
-                return full_text.strip(), metadata
+                return full_text, metadata
 
         except Exception as e:
             logger.error(f"Failed to extract PDF text: {e}")
             raise
 
-    def extract_youtube_transcript(self, video_url: str) -> Tuple[str, Dict[str, Any]]:
+    def extract_pdf_pages(self, file_path: str) -> Iterator[PdfPage]:
+        """
+        Extract a PDF page by page
+
+        The file stays mapped until the iterator is exhausted or closed, so
+        callers can process each page before the next is read.
+
+        Args:
+            file_path: Path to the PDF file
+
+        Yields:
+            PdfPage records in page order, including failed pages
+        """
+        if not PDF_AVAILABLE:
+            raise ImportError("PyPDF2 not available for PDF processing")
+
+        with self._open_pdf(file_path) as pdf:
+            for index in range(pdf.page_count):
+                yield pdf.page(index)
+
+    def extract_pdf_page_range(
+        self, file_path: str, start: int = 0, end: Optional[int] = None
+    ) -> List[PdfPage]:
+        """
+        Extract the pages [start, end) of a PDF
+
+        The file is memory-mapped rather than read, so workers extracting
+        different ranges of one large PDF only touch the parts they need.
+        Pages are cached by file identity (the blob name, which is the
+        content digest, or else path, size and mtime) and index; repeated
+        ranges are served without parsing the PDF.
+
+        Args:
+            file_path: Path to the PDF file
+            start: First page, 0-based
+            end: Page after the last one (defaults to the end of the document)
+
+        Returns:
+            PdfPage records in page order, including failed pages
+        """
+        if not PDF_AVAILABLE:
+            raise ImportError("PyPDF2 not available for PDF processing")
+
+        with self._open_pdf(file_path) as pdf:
+            count = pdf.page_count
+            end = count if end is None else min(end, count)
+            if start < 0 or start > end:
+                raise ValueError(f"Invalid page range [{start}, {end}) for {count} pages")
+            return [pdf.page(index) for index in range(start, end)]
+
+    @contextmanager
+    def _open_pdf(self, file_path: str) -> Iterator[MappedPdf]:
+        with open(file_path, "rb") as file:
+            stat = os.fstat(file.fileno())
+            if stat.st_size == 0:
+                raise ValueError("PDF file is empty")
+
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield MappedPdf(mapped, self._file_key(file_path, stat), self._page_cache)
+
+    @staticmethod
+    def _file_key(file_path: str, stat: os.stat_result) -> Any:
+        """
+        Cache identity of a file, computed without reading it
+
+        Blob store files are named by the SHA-256 of their content, so the
+        name is the identity and stays valid across copies of the same
+        upload. Other files are identified by path, size and mtime.
+        """
+        if blob_store.contains(file_path):
+            return Path(file_path).name[:64]
+        return (os.path.realpath(file_path), stat.st_size, stat.st_mtime_ns)
+
+    def _pdf_metadata(self, pdf: MappedPdf, file_path: str) -> Dict[str, Any]:
+        metadata = {
+            "page_count": pdf.page_count,
+            "source_type": "pdf",
+            "file_name": Path(file_path).name,
+        }
+        # Add PDF metadata if available
+        metadata.update(pdf.document_info)
+        return metadata
+
+    def extract_youtube_transcript(
+        self, video_url: str
+    ) -> Tuple[TranscriptSegments, Dict[str, Any]]:
         """
         Extract transcript from a YouTube video using a robust, standalone processor.
 
@@ -129,22 +272,19 @@ class DocumentService:
             video_url: YouTube video URL
 
         Returns:
-            Tuple of (transcript_text, metadata)
+            Tuple of (transcript segments, metadata)
         """
-        if not YOUTUBE_AVAILABLE:
+        if not get_transcript_provider().is_available():
             raise ImportError("YouTube libraries not available")
 
         try:
-            # Use the new, more reliable youtube_processor
-            from .youtube_processor import get_youtube_transcript
-            
             logger.info(f"Using robust YouTube processor for: {video_url}")
-            text, metadata = get_youtube_transcript(video_url)
+            segments, metadata = fetch_youtube_transcript(video_url)
             
             logger.info(
-                f"Successfully extracted YouTube transcript: {len(text)} characters using '{metadata.get('method_used', 'unknown')}' method"
+                f"Successfully extracted YouTube transcript: {len(segments.text)} characters in {len(segments)} segments using '{metadata.get('method_used', 'unknown')}' method"
             )
-            return text, metadata
+            return segments, metadata
 
         except Exception as e:
             logger.error(f"Failed to extract YouTube transcript: {e}", exc_info=True)
@@ -166,35 +306,23 @@ class DocumentService:
 
     def save_uploaded_file(self, file_content: bytes, filename: str) -> str:
         """
-        Save uploaded file to temporary storage
+        Save an uploaded file to the blob store
+
+        Identical files are stored once, so the same PDF uploaded twice
+        yields the same path.
 
         Args:
             file_content: File content as bytes
-            filename: Original filename
+            filename: Original filename (only its extension is kept)
 
         Returns:
             Path to saved file
         """
         try:
-            # Generate safe filename
-            safe_filename = self._sanitize_filename(filename)
-            file_path = self.temp_dir / safe_filename
-
-            # Ensure unique filename
-            counter = 1
-            original_path = file_path
-            while file_path.exists():
-                name = original_path.stem
-                suffix = original_path.suffix
-                file_path = self.temp_dir / f"{name}_{counter}{suffix}"
-                counter += 1
-
-            # Save file
-            with open(file_path, "wb") as f:
-                f.write(file_content)
-
-            logger.info(f"Saved uploaded file: {file_path}")
-            return str(file_path)
+            suffix = Path(self._sanitize_filename(filename)).suffix
+            file_path = blob_store.put(file_content, suffix)
+            logger.info(f"Saved uploaded file {filename} as {file_path}")
+            return file_path
 
         except Exception as e:
             logger.error(f"Failed to save uploaded file: {e}")
@@ -218,23 +346,39 @@ class DocumentService:
 
         return filename
 
-    def cleanup_temp_files(self, max_age_hours: int = 24) -> None:
-        """Clean up old temporary files"""
+    def cleanup_temp_files(self, db, max_age_hours: int = 24) -> int:
+        """
+        Clean up old files in the legacy temp upload directory
+
+        Files still referenced by a content row are kept, since reindexing
+        needs them.
+
+        Returns:
+            Number of files removed
+        """
+        from ..models.content import Content
+
+        removed = 0
         try:
             import time
 
             current_time = time.time()
             max_age_seconds = max_age_hours * 3600
+            referenced = {
+                source_url for (source_url,) in db.query(Content.source_url).distinct()
+            }
 
             for file_path in self.temp_dir.glob("*"):
-                if file_path.is_file():
+                if file_path.is_file() and str(file_path) not in referenced:
                     file_age = current_time - file_path.stat().st_mtime
                     if file_age > max_age_seconds:
                         file_path.unlink()
+                        removed += 1
                         logger.info(f"Cleaned up old temp file: {file_path}")
 
         except Exception as e:
             logger.error(f"Failed to cleanup temp files: {e}")
+        return removed
 
 
 # Global instance
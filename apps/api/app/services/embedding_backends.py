@@ -0,0 +1,293 @@
+"""
+Embedding Backends
+
+This module handles:
+- A common interface for embedding providers
+- OpenAI embeddings (text-embedding-3 with optional Matryoshka shortening)
+- Local CPU embeddings with a sentence-transformers model
+"""
+
+import importlib.util
+import logging
+import math
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence
+
+import tiktoken
+from openai import OpenAI
+
+from ..core.config import settings
+from .openai_scheduler import Priority, openai_scheduler
+
+logger = logging.getLogger(__name__)
+
+# Models trained with Matryoshka representation learning and their full size
+MATRYOSHKA_MODELS = {"text-embedding-3-small": 1536, "text-embedding-3-large": 3072}
+
+
+def truncate_embedding(embedding: Sequence[float], dimensions: int) -> List[float]:
+    """
+    Shorten an embedding to its first dimensions and restore unit length
+
+    Only meaningful for Matryoshka-trained models such as text-embedding-3,
+    whose leading dimensions carry most of the signal.
+    """
+    if len(embedding) <= dimensions:
+        return list(embedding)
+
+    truncated = embedding[:dimensions]
+    norm = math.sqrt(sum(value * value for value in truncated))
+    if norm == 0:
+        return list(truncated)
+    return [value / norm for value in truncated]
+
+
+def pack_token_batches(
+    token_counts: Sequence[int], max_tokens: int, max_inputs: int
+) -> List[List[int]]:
+    """
+    Group input positions into request batches by token count
+
+    Inputs are packed in order; a batch is closed when adding the next input
+    would exceed max_tokens or max_inputs. An input larger than max_tokens on
+    its own is sent as a single-item batch.
+
+    Args:
+        token_counts: Token count of each input
+        max_tokens: Token budget per batch
+        max_inputs: Maximum number of inputs per batch
+
+    Returns:
+        Lists of input positions, one per batch
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+
+    for position, count in enumerate(token_counts):
+        if current and (
+            current_tokens + count > max_tokens or len(current) >= max_inputs
+        ):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(position)
+        current_tokens += count
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+class EmbeddingBackend(ABC):
+    """Interface implemented by every embedding provider"""
+
+    name = "base"
+    model = ""
+
+    @property
+    @abstractmethod
+    def dimensions(self) -> int:
+        """
+        Size of the vectors this backend produces
+
+        May load a local model on first access; call it off the event loop.
+        """
+
+    @property
+    def supports_truncation(self) -> bool:
+        """Whether stored vectors may be shortened without re-embedding"""
+        return False
+
+    @abstractmethod
+    def is_available(self) -> bool:
+        """Whether the backend is configured and its dependencies installed"""
+
+    @abstractmethod
+    def embed(
+        self,
+        texts: List[str],
+        priority: Priority = Priority.BULK,
+        token_count: Optional[int] = None,
+    ) -> List[List[float]]:
+        """
+        Embed non-empty texts
+
+        Args:
+            texts: Texts to embed
+            priority: Scheduling class for rate-limited remote backends
+            token_count: Total tokens in texts, if the caller already counted them
+
+        Returns:
+            One vector per input text, in input order
+        """
+
+
+class OpenAIEmbeddingBackend(EmbeddingBackend):
+    """Embeddings from the OpenAI API"""
+
+    name = "openai"
+
+    def __init__(self, api_key: str, model: str, dimensions: int):
+        self.model = model
+        self._dimensions = dimensions
+        self._encoding = None
+        # Retries are handled by the shared scheduler, not the client
+        self.client = (
+            OpenAI(
+                api_key=api_key,
+                max_retries=0,
+                timeout=settings.OPENAI_REQUEST_TIMEOUT_SECONDS,
+            )
+            if api_key
+            else None
+        )
+
+    @property
+    def dimensions(self) -> int:
+        return self._dimensions
+
+    @property
+    def supports_truncation(self) -> bool:
+        return self.model in MATRYOSHKA_MODELS
+
+    def is_available(self) -> bool:
+        return self.client is not None
+
+    def embed(
+        self,
+        texts: List[str],
+        priority: Priority = Priority.BULK,
+        token_count: Optional[int] = None,
+    ) -> List[List[float]]:
+        if self.client is None:
+            raise RuntimeError("OpenAI client not initialized")
+
+        # Let the API shorten the vectors when the model supports it
+        request_kwargs = {}
+        native_dimensions = MATRYOSHKA_MODELS.get(self.model)
+        if native_dimensions and self._dimensions < native_dimensions:
+            request_kwargs["dimensions"] = self._dimensions
+
+        response = openai_scheduler.call(
+            self.model,
+            lambda: self.client.embeddings.with_raw_response.create(
+                input=texts, model=self.model, **request_kwargs
+            ),
+            priority=priority,
+            estimated_tokens=(
+                token_count if token_count is not None else self.count_tokens(texts)
+            ),
+        )
+        return [
+            truncate_embedding(item.embedding, self._dimensions)
+            for item in response.data
+        ]
+
+    def count_tokens(self, texts: List[str]) -> int:
+        """Tokens the texts are billed as; estimated from length without tiktoken"""
+        if self._encoding is None:
+            try:
+                self._encoding = tiktoken.encoding_for_model(self.model)
+            except Exception as e:
+                logger.warning(f"No tiktoken encoding for {self.model}, estimating tokens: {e}")
+                self._encoding = False
+        if not self._encoding:
+            return sum(len(text) for text in texts) // 4 + 1
+        encoded = self._encoding.encode_batch(texts, disallowed_special=())
+        return sum(len(tokens) for tokens in encoded)
+
+
+class LocalEmbeddingBackend(EmbeddingBackend):
+    """
+    CPU embeddings from a sentence-transformers model
+
+    The model is loaded on first use. Inputs are split into batches that are
+    encoded concurrently on a small thread pool.
+    """
+
+    name = "local"
+
+    def __init__(self, model: str, batch_size: int = 32, threads: int = 2):
+        self.model = model
+        self.batch_size = batch_size
+        self._executor = ThreadPoolExecutor(
+            max_workers=threads, thread_name_prefix="local-embed"
+        )
+        self._encoder = None
+        self._load_lock = threading.Lock()
+        self._installed = importlib.util.find_spec("sentence_transformers") is not None
+
+    @property
+    def dimensions(self) -> int:
+        return self._get_encoder().get_sentence_embedding_dimension()
+
+    def is_available(self) -> bool:
+        return self._installed
+
+    def embed(
+        self,
+        texts: List[str],
+        priority: Priority = Priority.BULK,
+        token_count: Optional[int] = None,
+    ) -> List[List[float]]:
+        encoder = self._get_encoder()
+        batches = [
+            texts[start : start + self.batch_size]
+            for start in range(0, len(texts), self.batch_size)
+        ]
+
+        def encode(batch: List[str]):
+            return encoder.encode(
+                batch,
+                batch_size=self.batch_size,
+                normalize_embeddings=True,
+                convert_to_numpy=True,
+                show_progress_bar=False,
+            )
+
+        embeddings = []
+        for batch_vectors in self._executor.map(encode, batches):
+            embeddings.extend(vector.tolist() for vector in batch_vectors)
+        return embeddings
+
+    def _get_encoder(self):
+        if self._encoder is None:
+            with self._load_lock:
+                if self._encoder is None:
+                    if not self._installed:
+                        raise RuntimeError(
+                            "sentence-transformers not available for local embeddings"
+                        )
+                    from sentence_transformers import SentenceTransformer
+
+                    self._encoder = SentenceTransformer(self.model, device="cpu")
+                    logger.info(f"Loaded local embedding model '{self.model}'")
+        return self._encoder
+
+
+def create_backends() -> dict:
+    """Instantiate all configured embedding backends by name"""
+    return {
+        OpenAIEmbeddingBackend.name: OpenAIEmbeddingBackend(
+            api_key=settings.OPENAI_API_KEY,
+            model=settings.OPENAI_EMBEDDING_MODEL,
+            dimensions=settings.EMBEDDING_DIMENSIONS,
+        ),
+        LocalEmbeddingBackend.name: LocalEmbeddingBackend(
+            model=settings.LOCAL_EMBEDDING_MODEL,
+            batch_size=settings.LOCAL_EMBEDDING_BATCH_SIZE,
+            threads=settings.LOCAL_EMBEDDING_THREADS,
+        ),
+    }
+
+
+def parse_collection_backends(value: Optional[str]) -> dict:
+    """Parse "collection=backend,..." into a mapping"""
+    mapping = {}
+    for item in (value or "").split(","):
+        if "=" in item:
+            collection, backend = item.split("=", 1)
+            mapping[collection.strip()] = backend.strip()
+    return mapping
@@ -2,36 +2,87 @@
 Embedding Service
 
 This service handles:
-- Text embedding generation using OpenAI
+- Text embedding generation through pluggable backends (OpenAI or local)
 - Text chunking and preprocessing
 - Embedding caching and optimization
 """
 
 import logging
-from typing import Any, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 
 import tiktoken
-from openai import OpenAI
 
 from ..core.config import settings
+from .chunking import (
+    ChunkingPool,
+    Document,
+    chunk_document,
+    iter_text_chunks,
+    preprocess_text,
+)
+from .embedding_backends import (
+    EmbeddingBackend,
+    create_backends,
+    pack_token_batches,
+    parse_collection_backends,
+)
+from .openai_scheduler import Priority
 
 logger = logging.getLogger(__name__)
 
+# Source position fields copied from chunks into vector payloads
+_LOCATION_FIELDS = ("page_number", "page_end", "timestamp_seconds")
+
 
 class EmbeddingService:
     def __init__(self):
-        if settings.OPENAI_API_KEY:
-            self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
-            self.model = "text-embedding-3-small"  # More cost-effective than ada-002
+        # Tokenizer used for chunking regardless of the embedding backend
+        try:
             self.encoding = tiktoken.encoding_for_model("gpt-3.5-turbo")
-            logger.info("OpenAI embedding service initialized")
-        else:
-            logger.warning("OpenAI API key not provided - embedding service disabled")
-            self.client = None
-
-    def is_available(self) -> bool:
+        except Exception as e:
+            logger.error(f"Failed to load tiktoken encoding: {e}")
+            self.encoding = None
+
+        self.backends = create_backends()
+        self.default_backend = settings.EMBEDDING_BACKEND
+        self.collection_backends = parse_collection_backends(
+            settings.EMBEDDING_COLLECTION_BACKENDS
+        )
+
+        # Parallel chunking for bulk ingestion; workers start on first use
+        self.chunking_pool = (
+            ChunkingPool(self.encoding, workers=settings.CHUNKING_WORKERS)
+            if self.encoding is not None
+            else None
+        )
+
+        # Bounds how many embedding requests are in flight at once
+        self._batch_executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.EMBEDDING_MAX_CONCURRENCY),
+            thread_name_prefix="embed-batch",
+        )
+
+        for name in {self.default_backend, *self.collection_backends.values()}:
+            backend = self.backends.get(name)
+            if backend is None:
+                logger.error(f"Unknown embedding backend configured: {name}")
+            elif backend.is_available():
+                logger.info(f"Embedding backend '{name}' initialized ({backend.model})")
+            else:
+                logger.warning(f"Embedding backend '{name}' not available - embeddings disabled for it")
+
+    def backend_for(self, collection_name: Optional[str] = None) -> EmbeddingBackend:
+        """Embedding backend configured for a collection (or the default)"""
+        name = self.collection_backends.get(collection_name, self.default_backend)
+        return self.backends[name]
+
+    def is_available(self, collection_name: Optional[str] = None) -> bool:
         """Check if embedding service is available"""
-        return self.client is not None
+        try:
+            return self.backend_for(collection_name).is_available()
+        except KeyError:
+            return False
 
     def chunk_text(
         self, text: str, max_tokens: int = 500, overlap: int = 50
@@ -45,55 +96,10 @@ class EmbeddingService:
             overlap: Number of overlapping tokens between chunks
 
         Returns:
-            List of chunks with metadata
+            List of chunks with metadata (see iter_text_chunks)
         """
-        if not text.strip():
-            return []
-
         try:
-            # Tokenize the text
-            tokens = self.encoding.encode(text)
-
-            if len(tokens) <= max_tokens:
-                return [
-                    {
-                        "text": text,
-                        "start_token": 0,
-                        "end_token": len(tokens),
-                        "token_count": len(tokens),
-                    }
-                ]
-
-            chunks = []
-            start = 0
-            chunk_id = 0
-
-            while start < len(tokens):
-                # Calculate end position
-                end = min(start + max_tokens, len(tokens))
-
-                # Extract chunk tokens
-                chunk_tokens = tokens[start:end]
-                chunk_text = self.encoding.decode(chunk_tokens)
-
-                chunks.append(
-                    {
-                        "text": chunk_text,
-                        "chunk_id": chunk_id,
-                        "start_token": start,
-                        "end_token": end,
-                        "token_count": len(chunk_tokens),
-                    }
-                )
-
-                # Move start position with overlap
-                start = end - overlap
-                chunk_id += 1
-
-                # Break if we've covered all tokens
-                if end >= len(tokens):
-                    break
-
+            chunks = list(iter_text_chunks(text, self.encoding, max_tokens, overlap))
             logger.info(f"Split text into {len(chunks)} chunks")
             return chunks
 
@@ -101,108 +107,190 @@ class EmbeddingService:
             logger.error(f"Failed to chunk text: {e}")
             return []
 
-    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+    def chunk_documents(
+        self, texts: List[Document], max_tokens: int = 500, overlap: int = 50
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Preprocess and chunk many documents across the chunking process pool
+
+        Args:
+            texts: Raw document texts or transcript segments
+            max_tokens: Maximum tokens per chunk
+            overlap: Number of overlapping tokens between chunks
+
+        Returns:
+            One chunk list per input text, in input order
+        """
+        if self.chunking_pool is None:
+            raise RuntimeError("tiktoken encoding not available for chunking")
+        return self.chunking_pool.chunk_documents(texts, max_tokens, overlap)
+
+    def count_tokens(self, text: str) -> int:
+        """Token count of text, estimated from its length if tiktoken is unavailable"""
+        if self.encoding is None:
+            return max(1, len(text) // 4)
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+    def generate_embeddings(
+        self,
+        texts: List[str],
+        collection_name: Optional[str] = None,
+        priority: Priority = Priority.BULK,
+    ) -> List[Optional[List[float]]]:
         """
         Generate embeddings for a list of texts
 
+        Texts are packed into batches by token count and the batches are sent
+        concurrently (up to EMBEDDING_MAX_CONCURRENCY requests at a time).
+
         Args:
             texts: List of text strings to embed
+            collection_name: Collection the vectors are for; selects the backend
+            priority: Scheduling class; bulk ingestion yields to interactive calls
 
         Returns:
-            List of embedding vectors
+            One entry per input text, in input order. Empty or whitespace-only
+            texts get None. An empty list is returned if embedding fails.
         """
-        if not self.client:
-            logger.error("OpenAI client not initialized")
+        if not self.is_available(collection_name):
+            logger.error(f"Embedding backend not available for {collection_name or 'default'}")
             return []
 
         if not texts:
             return []
 
         try:
-            # Filter out empty texts
-            valid_texts = [text for text in texts if text.strip()]
+            # Skip empty texts but remember where every other text belongs
+            positions = [i for i, text in enumerate(texts) if text.strip()]
 
-            if not valid_texts:
-                return []
+            if not positions:
+                return [None] * len(texts)
 
-            # Generate embeddings
-            response = self.client.embeddings.create(
-                input=valid_texts, model=self.model
+            token_counts = [self.count_tokens(texts[i]) for i in positions]
+            batches = pack_token_batches(
+                token_counts,
+                max_tokens=settings.EMBEDDING_BATCH_MAX_TOKENS,
+                max_inputs=settings.EMBEDDING_BATCH_MAX_INPUTS,
             )
+            backend = self.backend_for(collection_name)
 
-            embeddings = [item.embedding for item in response.data]
+            def embed_batch(batch: List[int]) -> List[List[float]]:
+                return backend.embed(
+                    [texts[positions[i]] for i in batch],
+                    priority,
+                    token_count=sum(token_counts[i] for i in batch),
+                )
 
-            logger.info(f"Generated {len(embeddings)} embeddings")
+            embeddings: List[Optional[List[float]]] = [None] * len(texts)
+            for batch, vectors in zip(batches, self._batch_executor.map(embed_batch, batches)):
+                if len(vectors) != len(batch):
+                    raise ValueError(
+                        f"Backend returned {len(vectors)} vectors for {len(batch)} inputs"
+                    )
+                for i, vector in zip(batch, vectors):
+                    embeddings[positions[i]] = vector
+
+            logger.info(
+                f"Generated {len(positions)} embeddings in {len(batches)} batches"
+            )
             return embeddings
 
         except Exception as e:
             logger.error(f"Failed to generate embeddings: {e}")
             return []
 
-    def generate_single_embedding(self, text: str) -> List[float]:
+    def generate_single_embedding(
+        self,
+        text: str,
+        collection_name: Optional[str] = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> List[float]:
         """
         Generate embedding for a single text
 
         Args:
             text: Text string to embed
+            collection_name: Collection the vector is for; selects the backend
+            priority: Scheduling class; query embeddings are interactive by default
 
         Returns:
             Embedding vector
         """
-        embeddings = self.generate_embeddings([text])
-        return embeddings[0] if embeddings else []
+        embeddings = self.generate_embeddings([text], collection_name, priority)
+        return (embeddings[0] if embeddings else None) or []
 
     def preprocess_text(self, text: str) -> str:
+        """Preprocess text before embedding generation"""
+        return preprocess_text(text)
+
+    def process_document(
+        self,
+        content: str,
+        metadata: Dict[str, Any],
+        chunk_size: int = 500,
+        collection_name: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
         """
-        Preprocess text before embedding generation
+        Process a document by chunking and generating embeddings
 
         Args:
-            text: Raw text to preprocess
+            content: Document content
+            metadata: Document metadata
+            chunk_size: Maximum tokens per chunk
+            collection_name: Target collection; selects the embedding backend
 
         Returns:
-            Preprocessed text
+            List of processed chunks with embeddings
         """
-        if not text:
-            return ""
-
-        # Basic text cleaning
-        text = text.strip()
+        try:
+            chunks = self.prepare_chunks(content, max_tokens=chunk_size)
+            return self.embed_chunks(chunks, metadata, collection_name)
 
-        # Remove excessive whitespace
-        text = " ".join(text.split())
+        except Exception as e:
+            logger.error(f"Failed to process document: {e}")
+            return []
 
-        # Remove very short lines that are likely noise
-        lines = text.split("\n")
-        cleaned_lines = [line.strip() for line in lines if len(line.strip()) > 10]
-        text = "\n".join(cleaned_lines)
+    def prepare_chunks(
+        self, content: Document, max_tokens: int = 500, overlap: int = 50
+    ) -> List[Dict[str, Any]]:
+        """
+        Normalise and chunk a document, locating each chunk in the source
 
-        return text
+        Args:
+            content: Raw document text with page or timestamp markers, or
+                transcript segments
+            max_tokens: Maximum tokens per chunk
+            overlap: Number of overlapping tokens between chunks
 
-    def process_document(
-        self, content: str, metadata: Dict[str, Any], chunk_size: int = 500
+        Returns:
+            Chunks with token/character offsets and page or timestamp fields
+        """
+        if self.encoding is None:
+            raise RuntimeError("tiktoken encoding not available for chunking")
+
+        chunks = chunk_document(content, self.encoding, max_tokens, overlap)
+        if not chunks:
+            logger.warning("No chunks generated")
+        return chunks
+
+    def embed_chunks(
+        self,
+        chunks: List[Dict[str, Any]],
+        metadata: Dict[str, Any],
+        collection_name: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """
-        Process a document by chunking and generating embeddings
+        Generate embeddings for already chunked text
 
         Args:
-            content: Document content
-            metadata: Document metadata
-            chunk_size: Maximum tokens per chunk
+            chunks: Chunks from chunk_text or chunk_documents
+            metadata: Document metadata copied onto every chunk
+            collection_name: Target collection; selects the embedding backend
 
         Returns:
             List of processed chunks with embeddings
         """
         try:
-            # Preprocess content
-            cleaned_content = self.preprocess_text(content)
-
-            if not cleaned_content:
-                logger.warning("No content after preprocessing")
-                return []
-
-            # Chunk the content
-            chunks = self.chunk_text(cleaned_content, max_tokens=chunk_size)
-
             if not chunks:
                 logger.warning("No chunks generated")
                 return []
@@ -211,7 +299,8 @@ class EmbeddingService:
             chunk_texts = [chunk["text"] for chunk in chunks]
 
             # Generate embeddings
-            embeddings = self.generate_embeddings(chunk_texts)
+            embeddings = self.generate_embeddings(chunk_texts, collection_name)
+            backend = self.backend_for(collection_name)
 
             if len(embeddings) != len(chunks):
                 logger.error(
@@ -222,6 +311,9 @@ class EmbeddingService:
             # Combine chunks with embeddings and metadata
             processed_chunks = []
             for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
+                if embedding is None:
+                    # Whitespace-only chunk; nothing to index
+                    continue
                 processed_chunks.append(
                     {
                         "embedding": embedding,
@@ -232,6 +324,15 @@ class EmbeddingService:
                             "token_count": chunk.get("token_count", 0),
                             "start_token": chunk.get("start_token", 0),
                             "end_token": chunk.get("end_token", 0),
+                            "start_char": chunk.get("start_char", 0),
+                            "end_char": chunk.get("end_char", 0),
+                            "embedding_backend": backend.name,
+                            "embedding_model": backend.model,
+                            **{
+                                key: chunk[key]
+                                for key in _LOCATION_FIELDS
+                                if chunk.get(key) is not None
+                            },
                         },
                     }
                 )
@@ -240,7 +341,7 @@ class EmbeddingService:
             return processed_chunks
 
         except Exception as e:
-            logger.error(f"Failed to process document: {e}")
+            logger.error(f"Failed to embed chunks: {e}")
             return []
 
 
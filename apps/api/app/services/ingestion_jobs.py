@@ -0,0 +1,254 @@
+"""
+Ingestion Job Tracking
+
+This service handles:
+- Recording each ingestion attempt as a row in ingestion_jobs
+- Tracking its stage, progress counters, per-stage timings and error
+- Listing jobs changed since a polling cursor
+- Aggregating throughput and stage timing metrics for capacity planning
+"""
+
+import logging
+import statistics
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.content import Content
+from ..models.ingestion import IngestionJob
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("queued", "extracting", "chunking", "embedding", "completed", "failed")
+TERMINAL_STAGES = ("completed", "failed")
+
+
+class JobProgress:
+    """
+    Progress of one ingestion attempt, written to its job row
+
+    Timings are accumulated in memory and copied to the row on every
+    commit, so a rollback of the surrounding transaction loses nothing.
+    """
+
+    def __init__(self, job: IngestionJob, db: Session):
+        self.job = job
+        self.db = db
+        self.timings: Dict[str, float] = {}
+
+    @classmethod
+    def start(cls, content: Content, db: Session) -> "JobProgress":
+        """Create the job row for a new attempt at a content item"""
+        previous = (
+            db.query(func.count(IngestionJob.id))
+            .filter(IngestionJob.content_id == content.id)
+            .scalar()
+            or 0
+        )
+        job = IngestionJob(
+            content_id=content.id,
+            stage="extracting",
+            attempt=previous + 1,
+            stage_timings={},
+            started_at=datetime.utcnow(),
+        )
+        db.add(job)
+        return cls(job, db)
+
+    def enter(self, stage: str, **counters: int) -> None:
+        """Move to a stage, updating counters (not committed)"""
+        self.job.stage = stage
+        self.update(**counters)
+
+    def update(self, **counters: int) -> None:
+        for name, value in counters.items():
+            setattr(self.job, name, value)
+
+    @contextmanager
+    def timed(self, stage: str) -> Iterator[None]:
+        """Add the time spent in the block to a stage's total"""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add_time(stage, time.monotonic() - started)
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        self.timings[stage] = round(self.timings.get(stage, 0.0) + seconds, 3)
+
+    def flush(self) -> None:
+        """Copy timings onto the row; committed with the caller's transaction"""
+        self.job.stage_timings = dict(self.timings)
+
+    def commit(self) -> None:
+        self.flush()
+        self.db.commit()
+
+    def complete(self) -> None:
+        self.job.stage = "completed"
+        self.job.finished_at = datetime.utcnow()
+        self.flush()
+
+    def fail(self, error: Exception) -> None:
+        """Record a failure; call after the transaction was rolled back"""
+        self.job.stage = "failed"
+        self.job.error = str(error)[:2000]
+        self.job.finished_at = datetime.utcnow()
+        self.flush()
+
+
+def job_to_dict(job: IngestionJob) -> Dict[str, Any]:
+    return {
+        "id": str(job.id),
+        "content_id": str(job.content_id),
+        "stage": job.stage,
+        "attempt": job.attempt,
+        "pages_total": job.pages_total,
+        "pages_extracted": job.pages_extracted,
+        "chunks_total": job.chunks_total,
+        "chunks_embedded": job.chunks_embedded,
+        "stage_timings": job.stage_timings or {},
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "updated_at": job.updated_at.isoformat() if job.updated_at else None,
+    }
+
+
+def encode_cursor(updated_at: datetime, job_id: uuid.UUID) -> str:
+    return f"{updated_at.isoformat()}|{job_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Position of a cursor; raises ValueError for malformed cursors"""
+    updated_at, _, job_id = cursor.partition("|")
+    return datetime.fromisoformat(updated_at), uuid.UUID(job_id) if job_id else uuid.UUID(int=0)
+
+
+def list_jobs(
+    db: Session,
+    since: Optional[datetime] = None,
+    content_id: Optional[str] = None,
+    active_only: bool = False,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Jobs changed after a cursor, oldest change first
+
+    Pages on (updated_at, id), so jobs sharing a timestamp are neither
+    skipped nor repeated across pages. Pass the returned cursor on the next
+    request; since only sets the starting point of the first one. Once a
+    poll has caught up (has_more is false) the returned cursor is rewound
+    by INGESTION_JOBS_CURSOR_OVERLAP_SECONDS, because updated_at is set
+    before its transaction commits and a job can become visible after
+    later ones were listed. Jobs in that window are delivered again;
+    clients deduplicate on (id, updated_at).
+    """
+    query = db.query(IngestionJob)
+    if cursor is not None:
+        position = decode_cursor(cursor)
+        query = query.filter(tuple_(IngestionJob.updated_at, IngestionJob.id) > position)
+    elif since is not None:
+        query = query.filter(IngestionJob.updated_at >= since)
+    if content_id:
+        query = query.filter(IngestionJob.content_id == content_id)
+    if active_only:
+        query = query.filter(IngestionJob.stage.notin_(TERMINAL_STAGES))
+
+    jobs = (
+        query.order_by(IngestionJob.updated_at.asc(), IngestionJob.id.asc())
+        .limit(limit)
+        .all()
+    )
+    has_more = len(jobs) == limit
+
+    next_cursor = cursor
+    if jobs and has_more:
+        next_cursor = encode_cursor(jobs[-1].updated_at, jobs[-1].id)
+    elif jobs:
+        overlap = timedelta(seconds=settings.INGESTION_JOBS_CURSOR_OVERLAP_SECONDS)
+        next_cursor = encode_cursor(jobs[-1].updated_at - overlap, uuid.UUID(int=0))
+    elif since is not None and cursor is None:
+        next_cursor = encode_cursor(since, uuid.UUID(int=0))
+
+    return {
+        "jobs": [job_to_dict(job) for job in jobs],
+        "cursor": next_cursor,
+        "has_more": has_more,
+    }
+
+
+def job_metrics(db: Session, hours: int = 24, max_jobs: int = 10000) -> Dict[str, Any]:
+    """
+    Throughput and stage timings of jobs finished in the last hours
+
+    Returns:
+        Counts by outcome, jobs and chunks per hour, mean and p95 seconds
+        per stage and end to end, and currently active jobs per stage
+    """
+    window_start = datetime.utcnow() - timedelta(hours=hours)
+    rows = (
+        db.query(
+            IngestionJob.stage,
+            IngestionJob.stage_timings,
+            IngestionJob.chunks_embedded,
+            IngestionJob.started_at,
+            IngestionJob.finished_at,
+        )
+        .filter(IngestionJob.finished_at >= window_start)
+        .order_by(IngestionJob.finished_at.desc())
+        .limit(max_jobs)
+        .all()
+    )
+
+    outcomes = {"completed": 0, "failed": 0}
+    stage_seconds: Dict[str, List[float]] = {}
+    durations: List[float] = []
+    chunks = 0
+    for stage, timings, chunks_embedded, started_at, finished_at in rows:
+        outcomes[stage] = outcomes.get(stage, 0) + 1
+        if stage != "completed":
+            continue
+        chunks += chunks_embedded or 0
+        for name, seconds in (timings or {}).items():
+            stage_seconds.setdefault(name, []).append(float(seconds))
+        if started_at and finished_at:
+            durations.append((finished_at - started_at).total_seconds())
+
+    active = dict(
+        db.query(IngestionJob.stage, func.count(IngestionJob.id))
+        .filter(IngestionJob.finished_at.is_(None))
+        .group_by(IngestionJob.stage)
+        .all()
+    )
+
+    return {
+        "window_hours": hours,
+        "jobs": outcomes,
+        "jobs_per_hour": round(outcomes["completed"] / hours, 2) if hours else None,
+        "chunks_per_hour": round(chunks / hours, 1) if hours else None,
+        "stage_seconds": {name: _summary(values) for name, values in stage_seconds.items()},
+        "total_seconds": _summary(durations),
+        "active": active,
+    }
+
+
+def _summary(values: List[float]) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"mean": None, "p95": None, "count": 0}
+    p95 = values[0]
+    if len(values) > 1:
+        p95 = statistics.quantiles(values, n=20, method="inclusive")[-1]
+    return {
+        "mean": round(statistics.fmean(values), 3),
+        "p95": round(p95, 3),
+        "count": len(values),
+    }
@@ -0,0 +1,268 @@
+"""
+Ingestion Scheduler
+
+This service handles:
+- Running ingestion work in priority classes: single admin uploads, then
+  category reindexes and bulk onboarding, then background maintenance
+- Per-class concurrency caps within a global limit on concurrent ingestions
+- Guaranteed shares of that limit so lower classes are not starved
+- Holding back bulk classes while chat p95 latency is above its threshold
+"""
+
+import asyncio
+import contextvars
+import enum
+import logging
+import math
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionPriority(enum.IntEnum):
+    """Scheduling class of ingestion work; lower values are served first"""
+
+    UPLOAD = 0
+    REINDEX = 1
+    MAINTENANCE = 2
+
+
+# Class of the ingestion running in the current task, if any
+_current_priority: contextvars.ContextVar[Optional[IngestionPriority]] = (
+    contextvars.ContextVar("ingestion_priority", default=None)
+)
+
+
+class LatencyMonitor:
+    """Rolling p95 of request latencies over a time window"""
+
+    def __init__(self, window_seconds: float, max_samples: int = 1000, min_samples: int = 20):
+        self.window_seconds = window_seconds
+        self.min_samples = min_samples
+        self._samples: deque = deque(maxlen=max_samples)
+        self._cached_p95: Optional[float] = None
+        self._cached_at = 0.0
+
+    def record(self, seconds: float) -> None:
+        self._samples.append((time.monotonic(), seconds))
+
+    def p95(self) -> Optional[float]:
+        """p95 latency in the window, or None with too few samples"""
+        now = time.monotonic()
+        # Admission checks run often; recompute at most once a second
+        if now - self._cached_at < 1.0:
+            return self._cached_p95
+
+        cutoff = now - self.window_seconds
+        while self._samples and self._samples[0][0] < cutoff:
+            self._samples.popleft()
+
+        values = sorted(seconds for _, seconds in self._samples)
+        p95 = None
+        if len(values) >= self.min_samples:
+            p95 = values[min(len(values) - 1, math.ceil(0.95 * len(values)) - 1)]
+
+        self._cached_p95, self._cached_at = p95, now
+        return p95
+
+
+class IngestionScheduler:
+    """
+    Admission control for ingestion work
+
+    A waiting task is admitted when a global slot is free, its class is
+    below its cap and chat latency allows it. Waiting classes still below
+    their guaranteed share go first; otherwise the higher class wins. Each
+    ingestion occupies one slot for its extraction, its share of the
+    chunking pool and its embedding calls, so slots are the CPU and API
+    budget; OpenAI calls additionally go through the OpenAI scheduler at
+    bulk priority. Bulk work paused for chat gives its slot back until it
+    resumes.
+    """
+
+    def __init__(self):
+        self.max_concurrency = max(1, settings.INGESTION_MAX_CONCURRENCY)
+        self.caps = {
+            IngestionPriority.UPLOAD: settings.INGESTION_UPLOAD_CONCURRENCY,
+            IngestionPriority.REINDEX: settings.INGESTION_REINDEX_CONCURRENCY,
+            IngestionPriority.MAINTENANCE: settings.INGESTION_MAINTENANCE_CONCURRENCY,
+        }
+        shares = {
+            IngestionPriority.UPLOAD: settings.INGESTION_UPLOAD_SHARE,
+            IngestionPriority.REINDEX: settings.INGESTION_REINDEX_SHARE,
+            IngestionPriority.MAINTENANCE: settings.INGESTION_MAINTENANCE_SHARE,
+        }
+        self.guaranteed = {
+            priority: min(
+                self.caps[priority],
+                max(1, int(share * self.max_concurrency)) if share > 0 else 0,
+            )
+            for priority, share in shares.items()
+        }
+        self.chat_latency = LatencyMonitor(settings.INGESTION_CHAT_LATENCY_WINDOW_SECONDS)
+        self.chat_p95_threshold = settings.INGESTION_CHAT_P95_THRESHOLD_SECONDS
+        self.max_yield_seconds = settings.INGESTION_MAX_YIELD_SECONDS
+
+        self._running = {priority: 0 for priority in IngestionPriority}
+        self._waiting = {priority: 0 for priority in IngestionPriority}
+        self._condition: Optional[asyncio.Condition] = None
+        self._tasks: set = set()
+
+    async def run(self, priority: IngestionPriority, content_ids: List[str]) -> Dict[str, bool]:
+        """
+        Process content items once admitted, waiting for the result
+
+        Returns:
+            Mapping of content id to whether processing succeeded
+        """
+        from ..db.database import SessionLocal
+        from .ingestion_service import ingestion_service
+
+        # Queued rows are pending; keep the stale sweeper off them meanwhile
+        async with ingestion_service.heartbeat(content_ids):
+            await self._acquire(priority)
+        token = _current_priority.set(priority)
+        try:
+            db = SessionLocal()
+            try:
+                return await ingestion_service.process_contents_bulk(content_ids, db)
+            finally:
+                db.close()
+        finally:
+            _current_priority.reset(token)
+            await self._release(priority)
+
+    def submit(self, priority: IngestionPriority, content_ids: List[str]) -> asyncio.Task:
+        """Queue content items in the background; returns the task"""
+        task = asyncio.create_task(self._run_logged(priority, content_ids))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def yield_to_interactive(self) -> None:
+        """
+        Pause bulk work while chat is slow
+
+        Called by the ingestion pipeline between batches. A no-op outside
+        the scheduler and for uploads; otherwise releases the task's slot
+        (so uploads can use it) until chat p95 is back under the threshold,
+        for at most INGESTION_MAX_YIELD_SECONDS, then takes a slot again.
+        """
+        priority = _current_priority.get()
+        if priority is None or priority is IngestionPriority.UPLOAD:
+            return
+        if not self.chat_busy():
+            return
+
+        logger.info(
+            f"Chat p95 {self.chat_latency.p95():.2f}s over threshold; "
+            f"pausing {priority.name.lower()} ingestion"
+        )
+        await self._release(priority)
+        try:
+            waited = 0.0
+            while self.chat_busy() and waited < self.max_yield_seconds:
+                await asyncio.sleep(1.0)
+                waited += 1.0
+            # Past the maximum pause, resume even though chat is still slow
+            await self._acquire(priority, respect_chat=waited < self.max_yield_seconds)
+        except BaseException:
+            # run() releases a slot on the way out; give it one to release
+            self._running[priority] += 1
+            raise
+
+    def chat_busy(self) -> bool:
+        p95 = self.chat_latency.p95()
+        return p95 is not None and p95 > self.chat_p95_threshold
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current scheduler state, for diagnostics"""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "classes": {
+                priority.name.lower(): {
+                    "running": self._running[priority],
+                    "waiting": self._waiting[priority],
+                    "cap": self.caps[priority],
+                    "guaranteed": self.guaranteed[priority],
+                }
+                for priority in IngestionPriority
+            },
+            "chat_p95_seconds": self.chat_latency.p95(),
+            "chat_p95_threshold_seconds": self.chat_p95_threshold,
+            "bulk_paused": self.chat_busy(),
+        }
+
+    async def _run_logged(self, priority: IngestionPriority, content_ids: List[str]) -> None:
+        try:
+            results = await self.run(priority, content_ids)
+            succeeded = sum(1 for ok in results.values() if ok)
+            logger.info(
+                f"{priority.name.title()} ingestion finished: "
+                f"{succeeded}/{len(content_ids)} succeeded"
+            )
+        except Exception as e:
+            logger.error(f"{priority.name.title()} ingestion failed: {e}", exc_info=True)
+
+    def _get_condition(self) -> asyncio.Condition:
+        # Created lazily so it binds to the running event loop
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def _acquire(self, priority: IngestionPriority, respect_chat: bool = True) -> None:
+        condition = self._get_condition()
+        async with condition:
+            self._waiting[priority] += 1
+            try:
+                while not self._can_start(priority, respect_chat):
+                    try:
+                        # Wake up periodically: chat latency changes without a notify
+                        await asyncio.wait_for(condition.wait(), timeout=1.0)
+                    except asyncio.TimeoutError:
+                        pass
+                self._running[priority] += 1
+            finally:
+                self._waiting[priority] -= 1
+
+    async def _release(self, priority: IngestionPriority) -> None:
+        condition = self._get_condition()
+        async with condition:
+            self._running[priority] -= 1
+            condition.notify_all()
+
+    def _can_start(self, priority: IngestionPriority, respect_chat: bool = True) -> bool:
+        if sum(self._running.values()) >= self.max_concurrency:
+            return False
+        if self._running[priority] >= self.caps[priority]:
+            return False
+
+        chat_busy = self.chat_busy()
+        if chat_busy and respect_chat and priority is not IngestionPriority.UPLOAD:
+            return False
+
+        below_share = self._running[priority] < self.guaranteed[priority]
+        for other in IngestionPriority:
+            if other is priority or not self._waiting[other]:
+                continue
+            if self._running[other] >= self.caps[other]:
+                continue
+            if chat_busy and other is not IngestionPriority.UPLOAD:
+                continue
+
+            # Another class that could start goes first if it is below its
+            # share and we are not, or if it outranks us on equal terms
+            other_below_share = self._running[other] < self.guaranteed[other]
+            if other_below_share and not below_share:
+                return False
+            if other < priority and other_below_share == below_share:
+                return False
+        return True
+
+
+# Global instance
+ingestion_scheduler = IngestionScheduler()
@@ -5,22 +5,34 @@ This service handles:
 - Processing uploaded PDFs and YouTube videos
 - Text extraction and preprocessing
 - Chunking and embedding generation
-- Storage in vector database
-- Content status tracking
+- Storage in vector database, checkpointed per batch so retries resume
+- Content status tracking and re-queueing of stale processing rows
+- Per-attempt job records with stage, progress counters and timings
 """
 
 import asyncio
+import hashlib
 import logging
-from typing import Any, Dict
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional
 
+from sqlalchemy import func, update
 from sqlalchemy.orm import Session
 
+from ..core.config import settings
 from ..db.database import get_db
 from ..models.content import Content, ContentStatus
+from ..models.ingestion import IngestionCheckpoint
+from .blob_store import blob_store
 from .document_service import document_service
 from .embedding_service import embedding_service
-from .qdrant_service import qdrant_service
+from .ingestion_jobs import JobProgress
+from .ingestion_scheduler import IngestionPriority, ingestion_scheduler
+from .qdrant_service import chunk_point_id, qdrant_service
 from .rag_service import rag_service
+from .youtube_processor import TranscriptSegments
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +41,7 @@ class IngestionService:
     def __init__(self):
         self.processing_queue = asyncio.Queue()
         self.is_processing = False
+        self._sweeper_task = None
 
     async def process_content(self, content_id: str, db: Session) -> bool:
         """
@@ -41,142 +54,438 @@ class IngestionService:
         Returns:
             True if processing succeeded, False otherwise
         """
-        try:
-            # Get content item from database
-            content = db.query(Content).filter(Content.id == content_id).first()
-            if not content:
-                logger.error(f"Content not found: {content_id}")
-                return False
+        results = await self.process_contents_bulk([content_id], db)
+        return results.get(content_id, False)
 
-            logger.info(f"Processing content: {content.title} ({content.source_type})")
+    async def process_contents_bulk(
+        self, content_ids: List[str], db: Session
+    ) -> Dict[str, bool]:
+        """
+        Process several content items, chunking them in parallel
 
-            # Update status to processing
-            content.status = ContentStatus.processing
-            db.commit()
+        Text is extracted for every item first, then all documents are
+        chunked in one call to the chunking process pool, then each item is
+        embedded and stored. A failure only fails its own item. Each item
+        gets an ingestion_jobs row tracking stage, counters and timings.
+        Items of the batch are kept fresh for the stale-processing sweeper
+        while they wait for the other items' stages (see heartbeat).
 
-            # Extract text based on content type
-            if content.source_type.value == "pdf":
-                text, metadata = await self._process_pdf(content)
-            elif content.source_type.value == "youtube":
-                text, metadata = await self._process_youtube(content)
-            else:
-                raise ValueError(f"Unsupported content type: {content.source_type}")
-
-            if not text:
-                raise ValueError("No text extracted from content")
-
-            # Process document and generate embeddings
-            processed_chunks = embedding_service.process_document(
-                content=text,
-                metadata={
-                    "content_id": str(content.id),
-                    "title": content.title,
-                    "category": content.category,
-                    "language": content.language.value,
-                    "source_type": content.source_type.value,
-                    "source_url": content.source_url,
-                    "created_at": content.created_at.isoformat(),
-                    **metadata,
-                },
-                chunk_size=500,
-            )
+        Args:
+            content_ids: UUIDs of the content items to process
+            db: Database session
 
-            if not processed_chunks:
-                raise ValueError("No chunks generated from content")
+        Returns:
+            Mapping of content id to whether processing succeeded
+        """
+        async with self.heartbeat(content_ids):
+            return await self._process_batch(content_ids, db)
+
+    async def _process_batch(
+        self, content_ids: List[str], db: Session
+    ) -> Dict[str, bool]:
+        results = {content_id: False for content_id in content_ids}
+        extracted = []  # (content, text, metadata)
+        jobs: Dict[str, JobProgress] = {}
+
+        # Stage 1: extract text
+        for content_id in content_ids:
+            try:
+                # Get content item from database
+                content = db.query(Content).filter(Content.id == content_id).first()
+                if not content:
+                    logger.error(f"Content not found: {content_id}")
+                    continue
+
+                logger.info(f"Processing content: {content.title} ({content.source_type})")
+
+                # Update status to processing
+                content.status = ContentStatus.processing
+                progress = jobs[content_id] = JobProgress.start(content, db)
+                db.commit()
 
-            # Store embeddings in vector database
-            collection_name = rag_service.collection_mapping.get(
-                content.category, "ks_general"
+                # Extract text based on content type
+                with progress.timed("extracting"):
+                    if content.source_type.value == "pdf":
+                        text, metadata = await self._process_pdf(content)
+                    elif content.source_type.value == "youtube":
+                        text, metadata = await self._process_youtube(content)
+                    else:
+                        raise ValueError(f"Unsupported content type: {content.source_type}")
+
+                if not text:
+                    raise ValueError("No text extracted from content")
+
+                progress.update(
+                    pages_total=metadata.get("page_count", 0),
+                    pages_extracted=metadata.get("pages_extracted", 0),
+                )
+                extracted.append((content, text, metadata))
+
+            except Exception as e:
+                self._mark_failed(content_id, db, e, jobs.get(content_id))
+
+        if not extracted:
+            return results
+
+        # Stage 2: preprocess and chunk all documents across worker processes
+        for content, _, _ in extracted:
+            jobs[str(content.id)].enter("chunking")
+            jobs[str(content.id)].flush()
+        db.commit()
+
+        started = time.monotonic()
+        try:
+            chunk_lists = await asyncio.to_thread(
+                embedding_service.chunk_documents,
+                [text for _, text, _ in extracted],
+                500,
             )
+        except Exception as e:
+            for content, _, _ in extracted:
+                self._mark_failed(str(content.id), db, e, jobs[str(content.id)])
+            return results
+
+        # The batch is chunked in one call; each item waited for all of it
+        elapsed = time.monotonic() - started
+        for content, _, _ in extracted:
+            jobs[str(content.id)].add_time("chunking", elapsed)
+
+        # Stage 3: embed and store each document in checkpointed batches
+        for (content, _, metadata), chunks in zip(extracted, chunk_lists):
+            content_id = str(content.id)
+            progress = jobs[content_id]
+            try:
+                if not chunks:
+                    raise ValueError("No chunks generated from content")
+
+                # Target collection decides which embedding backend is used
+                collection_name = rag_service.collection_mapping.get(
+                    content.category, "ks_general"
+                )
+                # Resolving a local model's size loads it; keep that off the loop
+                await asyncio.to_thread(self._ensure_collection, collection_name)
+
+                stored = await self._embed_and_store(
+                    content,
+                    chunks,
+                    {
+                        "content_id": content_id,
+                        "title": content.title,
+                        "category": content.category,
+                        "language": content.language.value,
+                        "source_type": content.source_type.value,
+                        "source_url": content.source_url,
+                        "created_at": content.created_at.isoformat(),
+                        **metadata,
+                    },
+                    collection_name,
+                    db,
+                    progress,
+                )
+
+                # Update content status to completed; the checkpoint is done
+                content.status = ContentStatus.completed
+                db.query(IngestionCheckpoint).filter(
+                    IngestionCheckpoint.content_id == content.id
+                ).delete()
+                progress.complete()
+                db.commit()
 
-            # Ensure collection exists
-            qdrant_service.create_collection(collection_name)
+                logger.info(
+                    f"Successfully processed content: {content.title} "
+                    f"({len(chunks)} chunks, {stored} embedded in this run)"
+                )
+                results[content_id] = True
+
+            except Exception as e:
+                self._mark_failed(content_id, db, e, progress)
+
+        return results
+
+    async def _embed_and_store(
+        self,
+        content: Content,
+        chunks: List[Dict[str, Any]],
+        metadata: Dict[str, Any],
+        collection_name: str,
+        db: Session,
+        progress: JobProgress,
+    ) -> int:
+        """
+        Embed and upsert chunks in batches, checkpointing after each batch
 
-            # Prepare data for storage
-            embeddings = [chunk["embedding"] for chunk in processed_chunks]
-            texts = [chunk["text"] for chunk in processed_chunks]
-            chunk_metadata = [chunk["metadata"] for chunk in processed_chunks]
+        A checkpoint left by an interrupted attempt is resumed when the
+        chunks and embedding model are unchanged. Otherwise the content's
+        existing vectors are removed and ingestion starts from the first
+        chunk. Point ids are derived from content and chunk id, so replaying
+        a batch overwrites rather than duplicates.
 
-            # Store in vector database
-            success = qdrant_service.store_embeddings(
-                collection_name=collection_name,
-                embeddings=embeddings,
-                metadata=chunk_metadata,
-                texts=texts,
-            )
+        Returns:
+            Number of chunks embedded by this call
+        """
+        content_id = str(content.id)
+        backend = embedding_service.backend_for(collection_name)
+        fingerprint = self._fingerprint(chunks, backend)
 
+        checkpoint = db.get(IngestionCheckpoint, content.id)
+        if checkpoint is not None and checkpoint.fingerprint == fingerprint:
+            logger.info(
+                f"Resuming content {content_id} at chunk "
+                f"{checkpoint.chunks_committed}/{len(chunks)}"
+            )
+        else:
+            await asyncio.to_thread(qdrant_service.delete_vectors_by_content_id, content_id)
+            if checkpoint is None:
+                checkpoint = IngestionCheckpoint(content_id=content.id)
+                db.add(checkpoint)
+            checkpoint.fingerprint = fingerprint
+            checkpoint.chunks_committed = 0
+
+        checkpoint.pages_extracted = metadata.get("pages_extracted", 0)
+        checkpoint.total_chunks = len(chunks)
+        progress.enter(
+            "embedding",
+            chunks_total=len(chunks),
+            chunks_embedded=checkpoint.chunks_committed,
+        )
+        progress.commit()
+
+        batch_size = max(1, settings.INGESTION_CHECKPOINT_BATCH_SIZE)
+        embedded = 0
+        for start in range(checkpoint.chunks_committed, len(chunks), batch_size):
+            # Bulk work pauses here while chat is slow
+            await ingestion_scheduler.yield_to_interactive()
+            batch = chunks[start:start + batch_size]
+
+            # Embed off the event loop: bulk embedding calls may wait
+            # for rate-limit budget
+            with progress.timed("embedding"):
+                processed_chunks = await asyncio.to_thread(
+                    embedding_service.embed_chunks, batch, metadata, collection_name
+                )
+            if not processed_chunks:
+                raise ValueError(f"Failed to embed chunks {start}-{start + len(batch)}")
+
+            with progress.timed("storing"):
+                success = await asyncio.to_thread(
+                    qdrant_service.store_embeddings,
+                    collection_name,
+                    [chunk["embedding"] for chunk in processed_chunks],
+                    [chunk["metadata"] for chunk in processed_chunks],
+                    [chunk["text"] for chunk in processed_chunks],
+                    [
+                        chunk_point_id(content_id, chunk["metadata"]["chunk_id"])
+                        for chunk in processed_chunks
+                    ],
+                )
             if not success:
                 raise ValueError("Failed to store embeddings in vector database")
 
-            # Update content status to completed
-            content.status = ContentStatus.completed
-            db.commit()
+            checkpoint.chunks_committed = start + len(batch)
+            progress.update(chunks_embedded=checkpoint.chunks_committed)
+            # Touching the content row keeps the stale-processing sweeper away
+            content.updated_at = datetime.utcnow()
+            progress.commit()
+            embedded += len(processed_chunks)
+
+        return embedded
+
+    @staticmethod
+    def _fingerprint(chunks: List[Dict[str, Any]], backend) -> str:
+        """Hash identifying the chunk texts and the model embedding them"""
+        digest = hashlib.sha256(f"{backend.name}:{backend.model}".encode())
+        for chunk in chunks:
+            digest.update(b"\0")
+            digest.update(chunk["text"].encode())
+        return digest.hexdigest()
+
+    @asynccontextmanager
+    async def heartbeat(self, content_ids: List[str]) -> AsyncIterator[None]:
+        """
+        Keep content rows fresh for the stale-processing sweeper
 
-            logger.info(
-                f"Successfully processed content: {content.title} ({len(processed_chunks)} chunks)"
-            )
-            return True
+        Touches updated_at of the items that are still pending or
+        processing on entry and then every INGESTION_HEARTBEAT_SECONDS, so
+        items waiting behind a long extraction, chunking or embedding stage
+        of their batch are not taken for abandoned. A crashed worker stops
+        beating, and its rows go stale as before.
+        """
+        if not content_ids:
+            yield
+            return
 
-        except Exception as e:
-            logger.error(f"Content processing failed for {content_id}: {e}")
-            logger.error(f"Full error traceback:", exc_info=True)
+        await asyncio.to_thread(self._touch, content_ids)
+        task = asyncio.create_task(self._heartbeat_loop(content_ids))
+        try:
+            yield
+        finally:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
 
-            # Update status to failed with error details
+    async def _heartbeat_loop(self, content_ids: List[str]) -> None:
+        while True:
+            await asyncio.sleep(max(1, settings.INGESTION_HEARTBEAT_SECONDS))
             try:
-                content = db.query(Content).filter(Content.id == content_id).first()
-                if content:
-                    content.status = ContentStatus.failed
-                    # Add error details to title for debugging
-                    content.title = f"{content.title} [ERROR: {str(e)[:100]}]"
-                    db.commit()
-                    logger.info(f"Marked content {content_id} as failed with error details")
-            except Exception as db_error:
-                logger.error(f"Failed to update content status: {db_error}")
+                await asyncio.to_thread(self._touch, content_ids)
+            except Exception as e:
+                logger.warning(f"Ingestion heartbeat failed: {e}")
 
-            return False
+    @staticmethod
+    def _touch(content_ids: List[str]) -> None:
+        from ..db.database import SessionLocal
 
-    async def _process_pdf(self, content: Content) -> tuple[str, Dict[str, Any]]:
-        """Process PDF content"""
+        db = SessionLocal()
         try:
-            # For now, we'll assume the PDF is already stored locally
-            # In production, this would download from S3
-            import os
-            file_path = content.source_url
+            db.execute(
+                update(Content)
+                .where(
+                    Content.id.in_(content_ids),
+                    Content.status.in_((ContentStatus.pending, ContentStatus.processing)),
+                )
+                .values(updated_at=func.now())
+            )
+            db.commit()
+        finally:
+            db.close()
 
-            # Check if it's an absolute path (works for both Windows and Unix)
-            if not os.path.isabs(file_path):
-                # If it's not an absolute path, assume it's a relative path in uploads
-                file_path = os.path.join("uploads", file_path)
+    async def sweep_stale_processing(self) -> List[str]:
+        """
+        Re-queue content stuck in processing or pending
 
-            text, metadata = document_service.extract_pdf_text(file_path)
-            return text, metadata
+        Rows are stale when they have not been touched for
+        INGESTION_STALE_SECONDS, e.g. after a worker crash or deploy lost
+        a running batch or work queued only in memory (reindexes, bulk
+        jobs); live and queued batches keep theirs fresh with heartbeat. Stale rows are claimed
+        with one conditional UPDATE, so concurrent sweepers in other
+        workers never pick up the same row.
 
-        except Exception as e:
-            logger.error(f"PDF processing failed: {e}")
-            # Return placeholder content for demo
-            return (
-                f"Sample content for PDF: {content.title}\n\n"
-                f"This is placeholder content for the PDF processing demo. "
-                f"In production, actual PDF text would be extracted here. "
-                f"Category: {content.category}, Language: {content.language.value}",
-                {"source_type": "pdf", "pages": 1},
+        A re-queued item starts over from extraction: every page is
+        extracted and chunked again (pages_extracted on the checkpoint is
+        informational only), and only the embedding batches committed
+        before the interruption are skipped.
+
+        Returns:
+            Ids of the re-queued content items
+        """
+        from ..db.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            cutoff = func.now() - timedelta(seconds=settings.INGESTION_STALE_SECONDS)
+            rows = db.execute(
+                update(Content)
+                .where(
+                    Content.status.in_((ContentStatus.pending, ContentStatus.processing)),
+                    Content.updated_at < cutoff,
+                )
+                .values(status=ContentStatus.pending, updated_at=func.now())
+                .returning(Content.id)
+            ).all()
+            db.commit()
+        finally:
+            db.close()
+
+        content_ids = [str(row[0]) for row in rows]
+        if content_ids:
+            logger.warning(f"Re-queueing {len(content_ids)} stale pending/processing items")
+            ingestion_scheduler.submit(IngestionPriority.MAINTENANCE, content_ids)
+        return content_ids
+
+    def start_sweeper(self) -> None:
+        """Sweep for stale pending and processing rows now and then periodically"""
+        if self._sweeper_task is None:
+            self._sweeper_task = asyncio.create_task(self._sweep_loop())
+
+    async def stop_sweeper(self) -> None:
+        if self._sweeper_task is not None:
+            self._sweeper_task.cancel()
+            try:
+                await self._sweeper_task
+            except asyncio.CancelledError:
+                pass
+            self._sweeper_task = None
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            try:
+                await self.sweep_stale_processing()
+            except Exception as e:
+                logger.error(f"Stale processing sweep failed: {e}")
+            await asyncio.sleep(settings.INGESTION_SWEEP_INTERVAL_SECONDS)
+
+    def _mark_failed(
+        self,
+        content_id: str,
+        db: Session,
+        error: Exception,
+        progress: Optional[JobProgress] = None,
+    ) -> None:
+        """Record a processing failure on the content item and its job"""
+        logger.error(f"Content processing failed for {content_id}: {error}")
+        logger.error(f"Full error traceback:", exc_info=error)
+
+        # Update status to failed; error details go on the job row
+        try:
+            db.rollback()
+            content = db.query(Content).filter(Content.id == content_id).first()
+            if content:
+                content.status = ContentStatus.failed
+                if progress is not None:
+                    progress.fail(error)
+                db.commit()
+                logger.info(f"Marked content {content_id} as failed")
+        except Exception as db_error:
+            logger.error(f"Failed to update content status: {db_error}")
+
+    def _ensure_collection(self, collection_name: str) -> None:
+        """Create the collection at its backend's vector size, rejecting mismatches"""
+        backend = embedding_service.backend_for(collection_name)
+        if not backend.is_available():
+            raise ValueError(f"Embedding backend '{backend.name}' is not available")
+
+        vector_size = backend.dimensions
+        if not qdrant_service.create_collection(collection_name, vector_size):
+            raise ValueError(f"Failed to create collection {collection_name}")
+
+        info = qdrant_service.get_collection_info(collection_name)
+        existing_size = info["config"]["size"] if info else None
+        if existing_size and existing_size != vector_size:
+            raise ValueError(
+                f"Collection {collection_name} stores {existing_size}-dimensional vectors "
+                f"but backend '{backend.name}' produces {vector_size}; migrate or reindex it"
             )
 
-    async def _process_youtube(self, content: Content) -> tuple[str, Dict[str, Any]]:
+    async def _process_pdf(self, content: Content) -> tuple[str, Dict[str, Any]]:
+        """Process PDF content"""
+        file_path = blob_store.resolve(content.source_url)
+        if file_path is None:
+            raise FileNotFoundError(f"PDF file not found: {content.source_url}")
+
+        try:
+            return await asyncio.to_thread(document_service.extract_pdf_text, file_path)
+        except Exception as e:
+            logger.error(f"PDF processing failed for {file_path}: {e}")
+            raise
+
+    async def _process_youtube(
+        self, content: Content
+    ) -> tuple[TranscriptSegments, Dict[str, Any]]:
         """Process YouTube video content"""
         try:
             logger.info(f"Extracting transcript for YouTube video: {content.source_url}")
-            
-            # FORCE RELOAD of document service to bypass caching issues
-            import importlib
-            from ..services import document_service as doc_service_module
-            importlib.reload(doc_service_module)
-            
-            text, metadata = doc_service_module.document_service.extract_youtube_transcript(
-                content.source_url
+
+            # Network-bound; keep it off the event loop
+            segments, metadata = await asyncio.to_thread(
+                document_service.extract_youtube_transcript, content.source_url
             )
-            logger.info(f"Successfully extracted YouTube transcript: {len(text)} characters")
-            return text, metadata
+            logger.info(
+                f"Successfully extracted YouTube transcript: {len(segments)} segments, "
+                f"{len(segments.text)} characters"
+            )
+            return segments, metadata
 
         except Exception as e:
             logger.error(f"YouTube processing failed for {content.source_url}: {e}")
@@ -239,32 +548,19 @@ class IngestionService:
     def get_processing_status(self, db: Session) -> Dict[str, Any]:
         """Get current processing status"""
         try:
-            total_content = db.query(Content).count()
-            pending_content = (
-                db.query(Content)
-                .filter(Content.status == ContentStatus.pending)
-                .count()
-            )
-            processing_content = (
-                db.query(Content)
-                .filter(Content.status == ContentStatus.processing)
-                .count()
-            )
-            completed_content = (
-                db.query(Content)
-                .filter(Content.status == ContentStatus.completed)
-                .count()
-            )
-            failed_content = (
-                db.query(Content).filter(Content.status == ContentStatus.failed).count()
+            # One GROUP BY instead of a COUNT per status
+            status_counts = {status.value: 0 for status in ContentStatus}
+            rows = (
+                db.query(Content.status, func.count(Content.id))
+                .group_by(Content.status)
+                .all()
             )
+            for content_status, count in rows:
+                status_counts[ContentStatus(content_status).value] = count
 
             return {
-                "total": total_content,
-                "pending": pending_content,
-                "processing": processing_content,
-                "completed": completed_content,
-                "failed": failed_content,
+                "total": sum(status_counts.values()),
+                **status_counts,
                 "queue_size": self.processing_queue.qsize(),
                 "is_processing": self.is_processing,
             }
@@ -292,15 +588,16 @@ class IngestionService:
                 .all()
             )
 
-            reprocessed_count = 0
+            # Reset to pending status
             for content in failed_content:
-                # Reset to pending status
                 content.status = ContentStatus.pending
-                db.commit()
+            db.commit()
 
-                # Add to processing queue
-                await self.queue_content_processing(str(content.id))
-                reprocessed_count += 1
+            # Retry as background maintenance work
+            content_ids = [str(content.id) for content in failed_content]
+            if content_ids:
+                ingestion_scheduler.submit(IngestionPriority.MAINTENANCE, content_ids)
+            reprocessed_count = len(content_ids)
 
             logger.info(f"Queued {reprocessed_count} failed items for reprocessing")
             return reprocessed_count
@@ -0,0 +1,321 @@
+"""
+Local Vector Index
+
+This module handles:
+- Holding small collections in process memory as float32 matrices
+- Brute-force cosine search with a single matrix-vector product
+- Loading collections from Qdrant via scroll and applying local writes
+- Acting as a complete offline stand-in for Qdrant in development and tests
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class LocalCollectionIndex:
+    """In-memory cosine similarity index for a single collection"""
+
+    def __init__(self, name: str, initial_capacity: int = 1024):
+        self.name = name
+        self.dimension: Optional[int] = None
+        self.loaded_at = time.monotonic()
+
+        self._ids: List[Any] = []
+        self._payloads: List[Dict[str, Any]] = []
+        self._positions: Dict[Any, int] = {}
+        self._vectors = None  # Row-normalised float32 matrix, over-allocated
+        self._initial_capacity = initial_capacity
+        self._filter_masks: Dict[tuple, Any] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def upsert(
+        self,
+        ids: Sequence[Any],
+        vectors: Sequence[Sequence[float]],
+        payloads: Sequence[Dict[str, Any]],
+    ) -> None:
+        """Insert or replace points"""
+        if not ids:
+            return
+
+        batch = np.asarray(vectors, dtype=np.float32)
+        if batch.ndim != 2:
+            raise ValueError("Vectors must form a 2-D array")
+
+        with self._lock:
+            if self.dimension is None:
+                self.dimension = batch.shape[1]
+                self._vectors = np.empty(
+                    (self._initial_capacity, self.dimension), dtype=np.float32
+                )
+            elif batch.shape[1] != self.dimension:
+                raise ValueError(
+                    f"Vector size {batch.shape[1]} does not match collection size {self.dimension}"
+                )
+
+            batch = _normalise_rows(batch)
+            self._reserve(len(self._ids) + len(ids))
+
+            for point_id, vector, payload in zip(ids, batch, payloads):
+                position = self._positions.get(point_id)
+                if position is None:
+                    position = len(self._ids)
+                    self._positions[point_id] = position
+                    self._ids.append(point_id)
+                    self._payloads.append(payload)
+                else:
+                    self._payloads[position] = payload
+                self._vectors[position] = vector
+
+            self._filter_masks.clear()
+
+    def delete_where(self, field: str, value: Any) -> int:
+        """Delete all points whose payload field equals value"""
+        with self._lock:
+            keep = [p.get(field) != value for p in self._payloads]
+            removed = keep.count(False)
+            if not removed:
+                return 0
+
+            keep_mask = np.fromiter(keep, dtype=bool, count=len(keep))
+            size = len(self._ids)
+            remaining = self._vectors[:size][keep_mask]
+            self._vectors[: len(remaining)] = remaining
+
+            self._ids = [i for i, k in zip(self._ids, keep) if k]
+            self._payloads = [p for p, k in zip(self._payloads, keep) if k]
+            self._positions = {point_id: n for n, point_id in enumerate(self._ids)}
+            self._filter_masks.clear()
+            return removed
+
+    def find(self, field: str, value: Any, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Points whose payload field equals value, in insertion order"""
+        with self._lock:
+            matches = []
+            for point_id, payload in zip(self._ids, self._payloads):
+                if payload.get(field) == value:
+                    matches.append({"id": point_id, "payload": dict(payload)})
+                    if len(matches) >= limit:
+                        break
+            return matches
+
+    def search(
+        self,
+        query_vector: Sequence[float],
+        limit: int = 5,
+        score_threshold: float = 0.0,
+        filter_conditions: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return the top points by cosine similarity, best first"""
+        with self._lock:
+            size = len(self._ids)
+            if not size or limit <= 0:
+                return []
+
+            query = np.asarray(query_vector, dtype=np.float32)
+            norm = np.linalg.norm(query)
+            if norm == 0 or query.shape[0] != self.dimension:
+                return []
+
+            scores = self._vectors[:size] @ (query / norm)
+
+            if filter_conditions:
+                scores = np.where(self._filter_mask(filter_conditions), scores, -np.inf)
+
+            if limit < size:
+                top = np.argpartition(-scores, limit - 1)[:limit]
+            else:
+                top = np.arange(size)
+            top = top[np.argsort(-scores[top])]
+
+            results = []
+            for position in top:
+                score = float(scores[position])
+                if score < score_threshold:
+                    break
+                results.append(
+                    {
+                        "id": self._ids[position],
+                        "score": score,
+                        "payload": dict(self._payloads[position]),
+                    }
+                )
+            return results
+
+    def _filter_mask(self, filter_conditions: Dict[str, Any]):
+        """Boolean mask of points matching all conditions, cached until the next write"""
+        key = tuple(sorted(filter_conditions.items()))
+        mask = self._filter_masks.get(key)
+        if mask is None:
+            mask = np.fromiter(
+                (
+                    all(p.get(f) == v for f, v in filter_conditions.items())
+                    for p in self._payloads
+                ),
+                dtype=bool,
+                count=len(self._payloads),
+            )
+            self._filter_masks[key] = mask
+        return mask
+
+    def _reserve(self, capacity: int) -> None:
+        if capacity <= self._vectors.shape[0]:
+            return
+        grown = np.empty(
+            (max(capacity, self._vectors.shape[0] * 2), self.dimension),
+            dtype=np.float32,
+        )
+        grown[: len(self._ids)] = self._vectors[: len(self._ids)]
+        self._vectors = grown
+
+
+class LocalVectorIndex:
+    """
+    Registry of in-process collection indexes
+
+    Collections listed in LOCAL_VECTOR_INDEX_COLLECTIONS are served from
+    memory. They are loaded from Qdrant with scroll, updated in place by
+    writes made through this process, and re-scrolled periodically to
+    pick up writes from other workers. Writes made while a scroll is
+    running are logged and replayed onto the fresh index before it is
+    swapped in, so a rebuild never loses them. In offline mode every
+    collection lives only here.
+    """
+
+    def __init__(
+        self, collections: Iterable[str], offline: bool = False, refresh_seconds: float = 300
+    ):
+        self.collections = {c.strip() for c in collections if c.strip()}
+        self.offline = offline
+        self.refresh_seconds = refresh_seconds
+        self._indexes: Dict[str, LocalCollectionIndex] = {}
+        self._refreshing: set = set()
+        # Writes made during a rebuild, replayed onto the rebuilt index
+        self._write_log: Dict[str, List[tuple]] = {}
+        self._lock = threading.Lock()
+
+        if (self.collections or offline) and not NUMPY_AVAILABLE:
+            logger.warning("numpy not available - local vector index disabled")
+            self.collections = set()
+            self.offline = False
+
+    def serves(self, collection_name: str) -> bool:
+        """Whether searches on this collection should be answered locally"""
+        return self.offline or "*" in self.collections or collection_name in self.collections
+
+    def get(self, collection_name: str) -> Optional[LocalCollectionIndex]:
+        return self._indexes.get(collection_name)
+
+    def create(self, collection_name: str) -> LocalCollectionIndex:
+        """Get or create an empty index"""
+        with self._lock:
+            index = self._indexes.get(collection_name)
+            if index is None:
+                index = LocalCollectionIndex(collection_name)
+                self._indexes[collection_name] = index
+            return index
+
+    def drop(self, collection_name: str) -> None:
+        with self._lock:
+            self._indexes.pop(collection_name, None)
+
+    def names(self) -> List[str]:
+        return list(self._indexes)
+
+    def is_stale(self, collection_name: str) -> bool:
+        index = self._indexes.get(collection_name)
+        if index is None or self.offline:
+            return False
+        return time.monotonic() - index.loaded_at > self.refresh_seconds
+
+    def load_from_qdrant(
+        self, client, collection_name: str, batch_size: int = 512
+    ) -> LocalCollectionIndex:
+        """Build a fresh index from a full scroll of the Qdrant collection"""
+        with self._lock:
+            if collection_name in self._refreshing:
+                return self._indexes.get(collection_name)
+            self._refreshing.add(collection_name)
+            self._write_log[collection_name] = []
+
+        try:
+            started = time.perf_counter()
+            index = LocalCollectionIndex(collection_name)
+            offset = None
+            while True:
+                records, offset = client.scroll(
+                    collection_name=collection_name,
+                    limit=batch_size,
+                    offset=offset,
+                    with_payload=True,
+                    with_vectors=True,
+                )
+                if records:
+                    index.upsert(
+                        [r.id for r in records],
+                        [r.vector for r in records],
+                        [r.payload or {} for r in records],
+                    )
+                if offset is None:
+                    break
+
+            with self._lock:
+                # Writers log under this lock, so nothing lands between the
+                # replay and the swap
+                for method, args in self._write_log.get(collection_name, []):
+                    getattr(index, method)(*args)
+                self._indexes[collection_name] = index
+            logger.info(
+                f"Loaded {len(index)} vectors from '{collection_name}' into local index "
+                f"in {time.perf_counter() - started:.2f}s"
+            )
+            return index
+        finally:
+            with self._lock:
+                self._refreshing.discard(collection_name)
+                self._write_log.pop(collection_name, None)
+
+    def on_upsert(
+        self,
+        collection_name: str,
+        ids: Sequence[Any],
+        vectors: Sequence[Sequence[float]],
+        payloads: Sequence[Dict[str, Any]],
+    ) -> None:
+        """Apply a write made through this process"""
+        if self.offline:
+            self.create(collection_name)
+        self._apply(collection_name, "upsert", (list(ids), list(vectors), list(payloads)))
+
+    def on_delete(self, collection_name: str, field: str, value: Any) -> None:
+        """Apply a payload-filtered delete made through this process"""
+        self._apply(collection_name, "delete_where", (field, value))
+
+    def _apply(self, collection_name: str, method: str, args: tuple) -> None:
+        with self._lock:
+            write_log = self._write_log.get(collection_name)
+            if write_log is not None:
+                write_log.append((method, args))
+            index = self._indexes.get(collection_name)
+        if index is not None:
+            getattr(index, method)(*args)
+
+
+def _normalise_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
@@ -0,0 +1,304 @@
+"""
+OpenAI Request Scheduler
+
+This service handles:
+- Tracking the provider's per-model request and token budgets from the
+  x-ratelimit-* response headers
+- Admitting calls by priority so interactive chat is served before bulk
+  ingestion, with a share of each budget reserved for interactive traffic
+- Retrying rate-limited, timed-out and 5xx calls with jittered exponential backoff
+  (but not calls rejected for exhausted quota)
+"""
+
+import enum
+import logging
+import random
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from openai import (
+    APIConnectionError,
+    APITimeoutError,
+    InternalServerError,
+    RateLimitError,
+)
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+class Priority(enum.IntEnum):
+    """Scheduling class of a request; lower values are served first"""
+
+    INTERACTIVE = 0
+    BULK = 1
+
+
+class SchedulerBusyError(RuntimeError):
+    """Raised when a request cannot be admitted within its wait limit"""
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """Parse reset headers such as "1s", "6m0s" or "120ms" into seconds"""
+    if not value:
+        return None
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def _is_full(remaining: float, limit: Optional[int]) -> bool:
+    return bool(limit) and remaining >= limit
+
+
+class RateLimitBudget:
+    """Last known request and token budget for one model"""
+
+    def __init__(self):
+        self.limit_requests: Optional[int] = None
+        self.limit_tokens: Optional[int] = None
+        self.remaining_requests: Optional[float] = None
+        self.remaining_tokens: Optional[float] = None
+        self.requests_reset_at = 0.0
+        self.tokens_reset_at = 0.0
+        self.blocked_until = 0.0
+
+    def update_from_headers(self, headers) -> None:
+        """Refresh the budget from a response's x-ratelimit-* headers"""
+        now = time.monotonic()
+
+        def header_int(name: str) -> Optional[int]:
+            value = headers.get(name)
+            try:
+                return int(value) if value is not None else None
+            except ValueError:
+                return None
+
+        limit_requests = header_int("x-ratelimit-limit-requests")
+        limit_tokens = header_int("x-ratelimit-limit-tokens")
+        remaining_requests = header_int("x-ratelimit-remaining-requests")
+        remaining_tokens = header_int("x-ratelimit-remaining-tokens")
+
+        if limit_requests is not None:
+            self.limit_requests = limit_requests
+        if limit_tokens is not None:
+            self.limit_tokens = limit_tokens
+        if remaining_requests is not None:
+            self.remaining_requests = remaining_requests
+            reset = parse_reset_duration(headers.get("x-ratelimit-reset-requests"))
+            self.requests_reset_at = now + (reset or 0.0)
+        if remaining_tokens is not None:
+            self.remaining_tokens = remaining_tokens
+            reset = parse_reset_duration(headers.get("x-ratelimit-reset-tokens"))
+            self.tokens_reset_at = now + (reset or 0.0)
+
+    def refresh(self, now: float) -> None:
+        """Assume the window has refilled once its reset time has passed"""
+        if self.remaining_requests is not None and now >= self.requests_reset_at:
+            self.remaining_requests = self.limit_requests
+        if self.remaining_tokens is not None and now >= self.tokens_reset_at:
+            self.remaining_tokens = self.limit_tokens
+
+    def admits(self, priority: Priority, tokens: int, reserve: float) -> bool:
+        """
+        Whether a request fits the current budget
+
+        Bulk requests must leave the reserved share of each budget untouched,
+        except in a full window: a request too large to fit above the reserve
+        (or larger than the whole window) would otherwise never be admitted.
+        """
+        requests_floor = 0.0
+        tokens_floor = 0.0
+        if priority is Priority.BULK:
+            requests_floor = (self.limit_requests or 0) * reserve
+            tokens_floor = (self.limit_tokens or 0) * reserve
+
+        if self.remaining_requests is not None and self.remaining_requests - 1 < requests_floor:
+            if not _is_full(self.remaining_requests, self.limit_requests):
+                return False
+        if self.remaining_tokens is not None and self.remaining_tokens - tokens < tokens_floor:
+            if not _is_full(self.remaining_tokens, self.limit_tokens):
+                return False
+        return True
+
+    def take(self, tokens: int) -> None:
+        """Provisionally spend budget until the response headers arrive"""
+        if self.remaining_requests is not None:
+            self.remaining_requests -= 1
+        if self.remaining_tokens is not None:
+            self.remaining_tokens -= tokens
+
+    def next_change(self, now: float) -> float:
+        """Seconds until the budget is expected to change on its own"""
+        candidates = [
+            t - now
+            for t in (self.blocked_until, self.requests_reset_at, self.tokens_reset_at)
+            if t > now
+        ]
+        return min(candidates) if candidates else 1.0
+
+
+class OpenAIScheduler:
+    """
+    Shared admission control and retry policy for OpenAI calls
+
+    Calls are made from worker threads (the OpenAI client is synchronous);
+    waiting for budget blocks the calling thread, never the event loop.
+    """
+
+    def __init__(self):
+        self.max_retries = settings.OPENAI_MAX_RETRIES
+        self.backoff_base = settings.OPENAI_BACKOFF_BASE_SECONDS
+        self.backoff_max = settings.OPENAI_BACKOFF_MAX_SECONDS
+        self.interactive_reserve = settings.OPENAI_INTERACTIVE_RESERVE
+        self.interactive_max_wait = settings.OPENAI_INTERACTIVE_MAX_WAIT_SECONDS
+
+        self._budgets: Dict[str, RateLimitBudget] = {}
+        self._waiting: Dict[str, Dict[Priority, int]] = {}
+        self._condition = threading.Condition()
+
+    def call(
+        self,
+        model: str,
+        request: Callable[[], Any],
+        priority: Priority = Priority.BULK,
+        estimated_tokens: int = 0,
+    ) -> Any:
+        """
+        Run an OpenAI request under the shared budget with retries
+
+        Args:
+            model: Model name; budgets are tracked per model
+            request: Callable issuing the request through with_raw_response
+            priority: Scheduling class of the request
+            estimated_tokens: Tokens the request is expected to consume
+
+        Returns:
+            The parsed API response
+        """
+        attempt = 0
+        while True:
+            self._acquire(model, priority, estimated_tokens)
+            try:
+                raw = request()
+                self._record_headers(model, raw.headers)
+                return raw.parse()
+            except RateLimitError as e:
+                if e.code == "insufficient_quota":
+                    # Billing, not throughput: retrying cannot succeed
+                    logger.error(f"OpenAI {model} request rejected: quota exhausted")
+                    raise
+                retry_after = self._retry_after(e)
+                self._record_headers(model, e.response.headers, blocked_for=retry_after)
+                error = e
+            except (APITimeoutError, APIConnectionError, InternalServerError) as e:
+                retry_after = None
+                error = e
+
+            attempt += 1
+            if attempt > self.max_retries:
+                logger.error(f"OpenAI {model} request failed after {attempt} attempts: {error}")
+                raise error
+
+            delay = self._backoff(attempt, retry_after)
+            logger.warning(
+                f"OpenAI {model} request failed ({type(error).__name__}), "
+                f"retry {attempt}/{self.max_retries} in {delay:.1f}s"
+            )
+            time.sleep(delay)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Current budgets per model, for diagnostics"""
+        with self._condition:
+            return {
+                model: {
+                    "remaining_requests": budget.remaining_requests,
+                    "remaining_tokens": budget.remaining_tokens,
+                    "limit_requests": budget.limit_requests,
+                    "limit_tokens": budget.limit_tokens,
+                }
+                for model, budget in self._budgets.items()
+            }
+
+    def _acquire(self, model: str, priority: Priority, tokens: int) -> None:
+        deadline = None
+        if priority is Priority.INTERACTIVE:
+            deadline = time.monotonic() + self.interactive_max_wait
+
+        with self._condition:
+            budget = self._budgets.setdefault(model, RateLimitBudget())
+            waiting = self._waiting.setdefault(model, {p: 0 for p in Priority})
+            waiting[priority] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    budget.refresh(now)
+
+                    # Higher-priority callers waiting on this model go first
+                    outranked = any(waiting[p] for p in Priority if p < priority)
+                    if (
+                        not outranked
+                        and now >= budget.blocked_until
+                        and budget.admits(priority, tokens, self.interactive_reserve)
+                    ):
+                        budget.take(tokens)
+                        return
+
+                    timeout = budget.next_change(now)
+                    if deadline is not None:
+                        if now >= deadline:
+                            raise SchedulerBusyError(
+                                f"OpenAI {model} budget exhausted, try again shortly"
+                            )
+                        timeout = min(timeout, deadline - now)
+                    self._condition.wait(timeout=max(0.01, timeout))
+            finally:
+                waiting[priority] -= 1
+                self._condition.notify_all()
+
+    def _record_headers(self, model: str, headers, blocked_for: Optional[float] = None) -> None:
+        with self._condition:
+            budget = self._budgets.setdefault(model, RateLimitBudget())
+            budget.update_from_headers(headers)
+            if blocked_for:
+                budget.blocked_until = max(budget.blocked_until, time.monotonic() + blocked_for)
+            self._condition.notify_all()
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        """Full-jitter exponential backoff, never shorter than Retry-After"""
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        delay = random.uniform(0, ceiling)
+        if retry_after:
+            delay = max(delay, retry_after)
+        return delay
+
+    @staticmethod
+    def _retry_after(error: RateLimitError) -> Optional[float]:
+        headers = error.response.headers
+        for name in ("retry-after-ms", "retry-after"):
+            value = headers.get(name)
+            if value is None:
+                continue
+            try:
+                seconds = float(value)
+            except ValueError:
+                continue
+            return seconds / 1000 if name == "retry-after-ms" else seconds
+        return parse_reset_duration(
+            headers.get("x-ratelimit-reset-requests")
+            or headers.get("x-ratelimit-reset-tokens")
+        )
+
+
+# Global instance
+openai_scheduler = OpenAIScheduler()
@@ -8,29 +8,95 @@ This service handles all vector database operations including:
 - Managing vector data lifecycle
 """
 
+import heapq
+import json
 import logging
+import re
+import statistics
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from typing import Any, Dict, List, Optional
 
 from qdrant_client import QdrantClient
 from qdrant_client.http.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    CreateAlias,
+    CreateAliasOperation,
+    DeleteAlias,
+    DeleteAliasOperation,
+    Disabled,
     Distance,
     FieldCondition,
     Filter,
+    HnswConfigDiff,
     MatchValue,
     PointStruct,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
     VectorParams,
+    VectorParamsDiff,
 )
 
 from ..core.config import settings
+from .local_vector_index import LocalVectorIndex
 
 logger = logging.getLogger(__name__)
 
+QUANTIZATION_MODES = ("none", "scalar", "binary")
+
+# Bytes per dimension held in RAM for each quantization mode
+_BYTES_PER_DIMENSION = {"none": 4.0, "scalar": 1.0, "binary": 1.0 / 8}
+
+# Namespace for deterministic chunk point ids
+_CHUNK_POINT_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "ks-ai/content-chunks")
+
+
+def chunk_point_id(content_id: str, chunk_id: int) -> str:
+    """Stable point id of a content chunk, so re-upserting replaces it"""
+    return str(uuid.uuid5(_CHUNK_POINT_NAMESPACE, f"{content_id}:{chunk_id}"))
+
 
 # in apps/api/app/services/qdrant_service.py
 
 class QdrantService:
     def __init__(self):
+        # Worker threads for fanning a query out across collections
+        self._search_executor = ThreadPoolExecutor(
+            max_workers=settings.QDRANT_SEARCH_CONCURRENCY,
+            thread_name_prefix="qdrant-search",
+        )
+        # Local index loads scroll whole collections; they get their own
+        # thread so they never hold up the search workers, one at a time
+        self._loader_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="local-index-loader"
+        )
+        self._loads_pending: set = set()
+        self._loads_lock = threading.Lock()
+
+        try:
+            self._search_param_overrides = json.loads(settings.QDRANT_SEARCH_PARAMS)
+        except ValueError:
+            logger.warning("QDRANT_SEARCH_PARAMS is not valid JSON - ignoring overrides")
+            self._search_param_overrides = {}
+
+        # In-process hot tier (or full offline stand-in) for small collections
+        self.local_index = LocalVectorIndex(
+            collections=settings.LOCAL_VECTOR_INDEX_COLLECTIONS.split(","),
+            offline=settings.LOCAL_VECTOR_INDEX_OFFLINE,
+            refresh_seconds=settings.LOCAL_VECTOR_INDEX_REFRESH_SECONDS,
+        )
+        if self.local_index.offline:
+            logger.info("Qdrant offline mode - using the in-process vector index only")
+            self.client = None
+            return
+
         try:
             # Determine if we should use HTTPS based on host
             is_cloud = settings.QDRANT_HOST != "localhost" and settings.QDRANT_HOST != "127.0.0.1"
@@ -67,6 +133,8 @@ class QdrantService:
     def is_healthy(self) -> bool:
         """Check if Qdrant service is healthy"""
         try:
+            if self.local_index.offline:
+                return True
             if self.client is None:
                 return False
             self.client.get_collections()
@@ -75,43 +143,437 @@ class QdrantService:
             logger.error(f"Qdrant health check failed: {e}")
             return False
 
-    def create_collection(self, collection_name: str, vector_size: int = 1536) -> bool:
-        """Create a new collection for storing vectors"""
+    def create_collection(
+        self,
+        collection_name: str,
+        vector_size: Optional[int] = None,
+        quantization: Optional[str] = None,
+        vectors_on_disk: Optional[bool] = None,
+        hnsw_m: Optional[int] = None,
+        hnsw_ef_construct: Optional[int] = None,
+    ) -> bool:
+        """
+        Create a new collection for storing vectors
+
+        Args:
+            collection_name: Name of the collection
+            vector_size: Embedding dimension; defaults to EMBEDDING_DIMENSIONS
+            quantization: "none", "scalar" (int8) or "binary"; defaults to QDRANT_QUANTIZATION
+            vectors_on_disk: Keep original vectors on disk; defaults to QDRANT_VECTORS_ON_DISK
+            hnsw_m: HNSW graph degree; defaults to QDRANT_HNSW_M
+            hnsw_ef_construct: HNSW build beam width; defaults to QDRANT_HNSW_EF_CONSTRUCT
+
+        Returns:
+            True if the collection exists or was created
+        """
         try:
+            if self.local_index.offline:
+                self.local_index.create(collection_name)
+                return True
+
             if self.client is None:
                 logger.error("Qdrant client not initialized")
                 return False
 
-            # Check if collection already exists
+            # Check if collection already exists (migrated ones are aliases)
             collections = self.client.get_collections()
             existing_names = [col.name for col in collections.collections]
+            existing_names += [a.alias_name for a in self.client.get_aliases().aliases]
 
             if collection_name in existing_names:
                 logger.info(f"Collection '{collection_name}' already exists")
                 return True
 
+            vector_size = vector_size or settings.EMBEDDING_DIMENSIONS
+            quantization = quantization or settings.QDRANT_QUANTIZATION
+            if vectors_on_disk is None:
+                vectors_on_disk = settings.QDRANT_VECTORS_ON_DISK
+
             # Create new collection
             self.client.create_collection(
                 collection_name=collection_name,
-                vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE),
+                vectors_config=VectorParams(
+                    size=vector_size,
+                    distance=Distance.COSINE,
+                    on_disk=vectors_on_disk or None,
+                ),
+                hnsw_config=self._hnsw_config(hnsw_m, hnsw_ef_construct),
+                quantization_config=self._quantization_config(quantization),
+            )
+            logger.info(
+                f"Created collection '{collection_name}' (size={vector_size}, "
+                f"quantization={quantization}, on_disk={vectors_on_disk})"
             )
-            logger.info(f"Created collection '{collection_name}'")
             return True
 
         except Exception as e:
             logger.error(f"Failed to create collection '{collection_name}': {e}")
             return False
 
+    def update_collection_tuning(
+        self,
+        collection_name: str,
+        quantization: Optional[str] = None,
+        vectors_on_disk: Optional[bool] = None,
+        hnsw_m: Optional[int] = None,
+        hnsw_ef_construct: Optional[int] = None,
+    ) -> bool:
+        """
+        Change quantization, on-disk storage or HNSW settings of an existing collection
+
+        Qdrant rebuilds the affected segments in the background, so this is the
+        migration path for collections created before these options existed.
+        """
+        try:
+            if self.client is None:
+                logger.error("Qdrant client not initialized")
+                return False
+
+            vectors_config = None
+            if vectors_on_disk is not None:
+                vectors_config = {"": VectorParamsDiff(on_disk=vectors_on_disk)}
+
+            quantization_config = None
+            if quantization is not None:
+                quantization_config = (
+                    self._quantization_config(quantization) or Disabled.DISABLED
+                )
+
+            self.client.update_collection(
+                collection_name=collection_name,
+                vectors_config=vectors_config,
+                hnsw_config=self._hnsw_config(hnsw_m, hnsw_ef_construct),
+                quantization_config=quantization_config,
+            )
+            logger.info(
+                f"Updated tuning for '{collection_name}' (quantization={quantization}, "
+                f"on_disk={vectors_on_disk}, m={hnsw_m}, ef_construct={hnsw_ef_construct})"
+            )
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to update tuning for '{collection_name}': {e}")
+            return False
+
+    def migrate_collection_dimensions(
+        self, collection_name: str, dimensions: int, batch_size: int = 256
+    ) -> Dict[str, Any]:
+        """
+        Move a collection to a smaller vector size from its stored vectors
+
+        Stored text-embedding-3 vectors are truncated and renormalised, so no
+        re-embedding is needed. Points are copied batch by batch into a new
+        collection <name>_v<n> (keeping ids and payloads), and <name> is then
+        pointed at it as an alias; the old collection is dropped last. Until
+        the switch, searches keep using the old collection, and a failed copy
+        only leaves the new one behind to be removed.
+
+        On the first migration <name> is a collection rather than an alias,
+        so it is deleted just before the alias is created. Writes made to the
+        collection while points are copied are not carried over, so run this
+        while nothing is being ingested into it.
+
+        Args:
+            collection_name: Collection (or alias) to migrate
+            dimensions: Target vector size
+            batch_size: Points per scroll/upsert request
+
+        Returns:
+            Summary with the old and new size, the number of points migrated
+            and the collection now behind the name
+        """
+        from .embedding_backends import truncate_embedding
+
+        if self.client is None:
+            raise RuntimeError("Qdrant client not initialized")
+
+        source = self._alias_target(collection_name) or collection_name
+        info = self.client.get_collection(source)
+        vectors_params = info.config.params.vectors
+        current_size = vectors_params.size
+        summary = {
+            "collection": collection_name,
+            "old_size": current_size,
+            "new_size": dimensions,
+            "migrated_points": 0,
+            "physical_collection": source,
+        }
+        if dimensions == current_size:
+            return summary
+        if dimensions > current_size:
+            raise ValueError(
+                f"Cannot grow '{collection_name}' from {current_size} to {dimensions} "
+                f"dimensions without re-embedding"
+            )
+
+        match = re.fullmatch(re.escape(collection_name) + r"_v(\d+)", source)
+        target = f"{collection_name}_v{int(match.group(1)) + 1 if match else 2}"
+        existing = {col.name for col in self.client.get_collections().collections}
+        if target in existing:
+            # Left over from an interrupted migration
+            self.client.delete_collection(target)
+
+        self.client.create_collection(
+            collection_name=target,
+            vectors_config=VectorParams(
+                size=dimensions,
+                distance=vectors_params.distance,
+                on_disk=vectors_params.on_disk,
+            ),
+            hnsw_config=HnswConfigDiff(**info.config.hnsw_config.model_dump()),
+            quantization_config=info.config.quantization_config,
+        )
+
+        migrated = 0
+        try:
+            offset = None
+            while True:
+                records, offset = self.client.scroll(
+                    collection_name=source,
+                    limit=batch_size,
+                    offset=offset,
+                    with_payload=True,
+                    with_vectors=True,
+                )
+                if records:
+                    self.client.upsert(
+                        collection_name=target,
+                        points=[
+                            PointStruct(
+                                id=record.id,
+                                vector=truncate_embedding(record.vector, dimensions),
+                                payload=record.payload,
+                            )
+                            for record in records
+                        ],
+                    )
+                    migrated += len(records)
+                if offset is None:
+                    break
+        except Exception:
+            logger.error(
+                f"Dimension migration of '{collection_name}' failed - "
+                f"dropping partial copy '{target}'",
+                exc_info=True,
+            )
+            self.client.delete_collection(target)
+            raise
+
+        if source == collection_name:
+            # A collection and an alias cannot share a name
+            self.client.delete_collection(source)
+            operations = []
+        else:
+            operations = [
+                DeleteAliasOperation(delete_alias=DeleteAlias(alias_name=collection_name))
+            ]
+        operations.append(
+            CreateAliasOperation(
+                create_alias=CreateAlias(collection_name=target, alias_name=collection_name)
+            )
+        )
+        self.client.update_collection_aliases(change_aliases_operations=operations)
+        if source != collection_name:
+            self.client.delete_collection(source)
+        self.local_index.drop(collection_name)
+
+        logger.info(
+            f"Migrated '{collection_name}' from {current_size} to {dimensions} dimensions "
+            f"({migrated} points, now served by '{target}')"
+        )
+        summary.update(migrated_points=migrated, physical_collection=target)
+        return summary
+
+    def _alias_target(self, name: str) -> Optional[str]:
+        """Collection an alias points to, or None if name is not an alias"""
+        for alias in self.client.get_aliases().aliases:
+            if alias.alias_name == name:
+                return alias.collection_name
+        return None
+
+    def _quantization_config(self, quantization: str):
+        """Qdrant quantization config for a mode name, or None for no quantization"""
+        if quantization not in QUANTIZATION_MODES:
+            raise ValueError(
+                f"Unknown quantization '{quantization}', expected one of {QUANTIZATION_MODES}"
+            )
+        if quantization == "scalar":
+            return ScalarQuantization(
+                scalar=ScalarQuantizationConfig(
+                    type=ScalarType.INT8, quantile=0.99, always_ram=True
+                )
+            )
+        if quantization == "binary":
+            return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+        return None
+
+    def _hnsw_config(
+        self, hnsw_m: Optional[int], hnsw_ef_construct: Optional[int]
+    ) -> Optional[HnswConfigDiff]:
+        """HNSW overrides, falling back to settings; None keeps server defaults"""
+        hnsw_m = hnsw_m or settings.QDRANT_HNSW_M or None
+        hnsw_ef_construct = hnsw_ef_construct or settings.QDRANT_HNSW_EF_CONSTRUCT or None
+        if hnsw_m is None and hnsw_ef_construct is None:
+            return None
+        return HnswConfigDiff(m=hnsw_m, ef_construct=hnsw_ef_construct)
+
+    def _search_params(
+        self,
+        collection_name: str,
+        hnsw_ef: Optional[int] = None,
+        oversampling: Optional[float] = None,
+        rescore: Optional[bool] = None,
+    ) -> SearchParams:
+        """Search-time HNSW and quantization parameters for a collection"""
+        overrides = self._search_param_overrides.get(collection_name, {})
+        hnsw_ef = hnsw_ef or overrides.get("hnsw_ef") or settings.QDRANT_SEARCH_HNSW_EF
+        if oversampling is None:
+            oversampling = overrides.get(
+                "oversampling", settings.QDRANT_QUANTIZATION_OVERSAMPLING
+            )
+        if rescore is None:
+            rescore = overrides.get("rescore", settings.QDRANT_QUANTIZATION_RESCORE)
+
+        # Ignored by Qdrant for collections without quantization
+        return SearchParams(
+            hnsw_ef=hnsw_ef or None,
+            quantization=QuantizationSearchParams(
+                rescore=rescore, oversampling=oversampling
+            ),
+        )
+
+    def build_search_report(
+        self,
+        collection_name: str,
+        sample_size: int = 50,
+        limit: int = 10,
+        hnsw_ef_values: Optional[List[int]] = None,
+        oversampling_values: Optional[List[float]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Measure recall and latency of approximate search against exact search
+
+        Stored vectors are used as sample queries. Each combination of hnsw_ef,
+        oversampling and rescoring is compared with an exact (full scan) search
+        of the same query.
+
+        Args:
+            collection_name: Collection to benchmark
+            sample_size: Number of stored vectors to use as queries
+            limit: Result count used for recall@limit
+            hnsw_ef_values: Search beam widths to try
+            oversampling_values: Quantization oversampling factors to try
+
+        Returns:
+            Collection configuration, estimated vector RAM per quantization mode
+            and one row per parameter combination
+        """
+        if self.client is None:
+            raise RuntimeError("Qdrant client not initialized")
+
+        hnsw_ef_values = hnsw_ef_values or [16, 32, 64, 128, 256]
+        oversampling_values = oversampling_values or [1.0, 2.0, 3.0]
+
+        info = self.client.get_collection(collection_name)
+        vector_size = info.config.params.vectors.size
+        points_count = info.points_count or 0
+
+        records, _ = self.client.scroll(
+            collection_name=collection_name,
+            limit=sample_size,
+            with_payload=False,
+            with_vectors=True,
+        )
+        queries = [record.vector for record in records]
+        if not queries:
+            raise ValueError(f"Collection '{collection_name}' has no vectors to sample")
+
+        exact_ids = [
+            {
+                hit.id
+                for hit in self.client.search(
+                    collection_name=collection_name,
+                    query_vector=query,
+                    limit=limit,
+                    search_params=SearchParams(exact=True),
+                )
+            }
+            for query in queries
+        ]
+
+        rows = []
+        for hnsw_ef in hnsw_ef_values:
+            for oversampling in oversampling_values:
+                for rescore in (True, False):
+                    params = self._search_params(
+                        collection_name, hnsw_ef, oversampling, rescore
+                    )
+                    latencies = []
+                    recalls = []
+                    for query, expected in zip(queries, exact_ids):
+                        started = time.perf_counter()
+                        hits = self.client.search(
+                            collection_name=collection_name,
+                            query_vector=query,
+                            limit=limit,
+                            search_params=params,
+                        )
+                        latencies.append((time.perf_counter() - started) * 1000)
+                        if expected:
+                            found = {hit.id for hit in hits}
+                            recalls.append(len(found & expected) / len(expected))
+
+                    latencies.sort()
+                    rows.append(
+                        {
+                            "hnsw_ef": hnsw_ef,
+                            "oversampling": oversampling,
+                            "rescore": rescore,
+                            "recall": round(statistics.fmean(recalls), 4) if recalls else None,
+                            "mean_latency_ms": round(statistics.fmean(latencies), 2),
+                            "p95_latency_ms": round(
+                                latencies[int(0.95 * (len(latencies) - 1))], 2
+                            ),
+                        }
+                    )
+
+        return {
+            "collection": collection_name,
+            "points_count": points_count,
+            "vector_size": vector_size,
+            "sample_size": len(queries),
+            "limit": limit,
+            "config": {
+                "hnsw": info.config.hnsw_config.model_dump(),
+                "quantization": (
+                    info.config.quantization_config.model_dump()
+                    if info.config.quantization_config
+                    else None
+                ),
+                "vectors_on_disk": info.config.params.vectors.on_disk,
+            },
+            "estimated_vector_ram_mb": {
+                mode: round(points_count * vector_size * size / 2**20, 2)
+                for mode, size in _BYTES_PER_DIMENSION.items()
+            },
+            "results": rows,
+        }
+
     def store_embeddings(
         self,
         collection_name: str,
         embeddings: List[List[float]],
         metadata: List[Dict[str, Any]],
         texts: List[str],
+        ids: Optional[List[str]] = None,
     ) -> bool:
-        """Store embeddings with metadata in a collection"""
+        """
+        Store embeddings with metadata in a collection
+
+        Points with the given ids are replaced; without ids random ones are used.
+        """
         try:
-            if self.client is None:
+            if self.client is None and not self.local_index.offline:
                 logger.error("Qdrant client not initialized")
                 return False
 
@@ -125,7 +587,7 @@ class QdrantService:
             for i, (embedding, meta, text) in enumerate(
                 zip(embeddings, metadata, texts)
             ):
-                point_id = str(uuid.uuid4())
+                point_id = ids[i] if ids else str(uuid.uuid4())
                 payload = {
                     **meta,
                     "text": text,
@@ -137,7 +599,16 @@ class QdrantService:
                 )
 
             # Upload points to collection
-            self.client.upsert(collection_name=collection_name, points=points)
+            if self.client is not None:
+                self.client.upsert(collection_name=collection_name, points=points)
+
+            # Keep the in-process index in step with our own writes
+            self.local_index.on_upsert(
+                collection_name,
+                [point.id for point in points],
+                [point.vector for point in points],
+                [point.payload for point in points],
+            )
 
             logger.info(f"Stored {len(points)} embeddings in '{collection_name}'")
             return True
@@ -156,20 +627,20 @@ class QdrantService:
     ) -> List[Dict[str, Any]]:
         """Search for similar vectors in a collection"""
         try:
+            local_collection = self._local_collection(collection_name)
+            if local_collection is not None:
+                return local_collection.search(
+                    query_vector,
+                    limit=limit,
+                    score_threshold=score_threshold,
+                    filter_conditions=filter_conditions,
+                )
+
             if self.client is None:
                 logger.error("Qdrant client not initialized")
                 return []
 
-            # Build filter conditions
-            query_filter = None
-            if filter_conditions:
-                conditions = []
-                for field, value in filter_conditions.items():
-                    conditions.append(
-                        FieldCondition(key=field, match=MatchValue(value=value))
-                    )
-                if conditions:
-                    query_filter = Filter(must=conditions)
+            query_filter = self._build_filter(filter_conditions)
 
             # Perform search
             results = self.client.search(
@@ -178,6 +649,7 @@ class QdrantService:
                 query_filter=query_filter,
                 limit=limit,
                 score_threshold=score_threshold,
+                search_params=self._search_params(collection_name),
             )
 
             # Format results
@@ -194,14 +666,135 @@ class QdrantService:
             logger.error(f"Search failed: {e}")
             return []
 
+    def search_multiple_collections(
+        self,
+        collection_names: List[str],
+        query_vector: Optional[List[float]] = None,
+        limit: int = 5,
+        score_threshold: float = 0.7,
+        filter_conditions: Optional[Dict[str, Any]] = None,
+        collection_limits: Optional[Dict[str, int]] = None,
+        query_vectors: Optional[Dict[str, List[float]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Search several collections concurrently and merge the hits by score
+
+        Args:
+            collection_names: Collections to search
+            query_vector: Query embedding
+            limit: Maximum number of merged results
+            score_threshold: Minimum similarity score
+            filter_conditions: Payload field/value pairs every hit must match
+            collection_limits: Optional per-collection result limits
+            query_vectors: Optional per-collection query embeddings, for
+                collections embedded by different backends
+
+        Returns:
+            Results ordered by descending score, each tagged with its collection
+        """
+        if not collection_names:
+            return []
+
+        collection_limits = collection_limits or {}
+        query_vectors = query_vectors or {}
+
+        def search_collection(collection_name: str) -> List[Dict[str, Any]]:
+            results = self.search_similar(
+                collection_name=collection_name,
+                query_vector=query_vectors.get(collection_name, query_vector),
+                limit=collection_limits.get(collection_name, limit),
+                score_threshold=score_threshold,
+                filter_conditions=filter_conditions,
+            )
+            for result in results:
+                result["collection"] = collection_name
+            return results
+
+        # Latency is bounded by the slowest collection rather than their sum
+        per_collection_results = list(
+            self._search_executor.map(search_collection, collection_names)
+        )
+
+        # Each list is already sorted by score, so a heap merge suffices
+        merged = heapq.merge(
+            *per_collection_results, key=lambda r: r["score"], reverse=True
+        )
+        return list(islice(merged, limit))
+
+    def _local_collection(self, collection_name: str):
+        """Return the in-process index for a collection if it is served locally"""
+        if not self.local_index.serves(collection_name):
+            return None
+
+        if self.local_index.offline:
+            return self.local_index.create(collection_name)
+
+        local_collection = self.local_index.get(collection_name)
+        if local_collection is None or self.local_index.is_stale(collection_name):
+            # Never scroll inside a search: Qdrant answers until the first
+            # load finishes, and a stale snapshot is served during a refresh
+            self._schedule_local_load(collection_name)
+
+        return local_collection
+
+    def warm_local_index(self) -> None:
+        """Load locally served collections in the background, e.g. at startup"""
+        if self.client is None or self.local_index.offline or not self.local_index.collections:
+            return
+
+        def warm() -> None:
+            names = self.local_index.collections
+            if "*" in names:
+                names = self.list_collections()
+            for collection_name in names:
+                self._schedule_local_load(collection_name)
+
+        self._loader_executor.submit(warm)
+
+    def _schedule_local_load(self, collection_name: str) -> None:
+        """Queue a load on the loader thread unless one is already queued or running"""
+        with self._loads_lock:
+            if collection_name in self._loads_pending:
+                return
+            self._loads_pending.add(collection_name)
+        self._loader_executor.submit(self._load_local_collection, collection_name)
+
+    def _load_local_collection(self, collection_name: str) -> None:
+        try:
+            self.local_index.load_from_qdrant(self.client, collection_name)
+        except Exception as e:
+            logger.warning(f"Local index load failed for '{collection_name}': {e}")
+        finally:
+            with self._loads_lock:
+                self._loads_pending.discard(collection_name)
+
+    def _build_filter(
+        self, filter_conditions: Optional[Dict[str, Any]]
+    ) -> Optional[Filter]:
+        """Build an exact-match payload filter from field/value pairs"""
+        if not filter_conditions:
+            return None
+
+        conditions = [
+            FieldCondition(key=field, match=MatchValue(value=value))
+            for field, value in filter_conditions.items()
+        ]
+        return Filter(must=conditions)
+
     def delete_collection(self, collection_name: str) -> bool:
         """Delete a collection and all its data"""
         try:
+            self.local_index.drop(collection_name)
+            if self.local_index.offline:
+                return True
+
             if self.client is None:
                 logger.error("Qdrant client not initialized")
                 return False
 
-            self.client.delete_collection(collection_name)
+            # Deleting a migrated collection deletes the one behind its alias
+            target = self._alias_target(collection_name) or collection_name
+            self.client.delete_collection(target)
             logger.info(f"Deleted collection '{collection_name}'")
             return True
 
@@ -212,6 +805,15 @@ class QdrantService:
     def get_collection_info(self, collection_name: str) -> Optional[Dict[str, Any]]:
         """Get information about a collection"""
         try:
+            if self.local_index.offline:
+                local_collection = self.local_index.create(collection_name)
+                return {
+                    "name": collection_name,
+                    "status": "green",
+                    "vector_count": len(local_collection),
+                    "config": {"distance": "Cosine", "size": local_collection.dimension},
+                }
+
             if self.client is None:
                 logger.error("Qdrant client not initialized")
                 return None
@@ -234,44 +836,40 @@ class QdrantService:
     def list_collections(self) -> List[str]:
         """List all collections"""
         try:
+            if self.local_index.offline:
+                return self.local_index.names()
+
             if self.client is None:
                 logger.error("Qdrant client not initialized")
                 return []
 
+            # Migrated collections are listed under their alias
+            aliases = {
+                alias.collection_name: alias.alias_name
+                for alias in self.client.get_aliases().aliases
+            }
             collections = self.client.get_collections()
-            return [col.name for col in collections.collections]
+            return [aliases.get(col.name, col.name) for col in collections.collections]
 
         except Exception as e:
             logger.error(f"Failed to list collections: {e}")
             return []
 
     def get_collection_stats_simple(self, collection_name: str) -> Optional[Dict[str, Any]]:
-        """Get collection stats using simple approach to avoid parsing issues"""
+        """Get the point count and status of a collection"""
         try:
-            if self.client is None:
+            if self.local_index.offline:
+                vector_count = len(self.local_index.create(collection_name))
+            elif self.client is None:
                 logger.error("Qdrant client not initialized")
                 return None
+            else:
+                # Counting needs no query embedding, so it works whatever
+                # backend or vector size the collection uses
+                vector_count = self.client.count(
+                    collection_name=collection_name, exact=True
+                ).count
 
-            # Generate a real embedding to get accurate search results
-            from ..services.embedding_service import embedding_service
-            
-            # Use a generic query to search for any content
-            test_embedding = embedding_service.generate_single_embedding("content data information")
-            
-            if not test_embedding:
-                logger.warning(f"Failed to generate embedding for collection stats: {collection_name}")
-                return None
-            
-            # Search with very low threshold to get all vectors
-            results = self.search_similar(
-                collection_name=collection_name,
-                query_vector=test_embedding,
-                limit=10000,  # Large limit to count all
-                score_threshold=0.0
-            )
-            
-            vector_count = len(results)
-            
             return {
                 "name": collection_name,
                 "vector_count": vector_count,
@@ -282,9 +880,39 @@ class QdrantService:
             logger.error(f"Failed to get collection stats for {collection_name}: {e}")
             return None
 
+    def get_points_by_content_id(
+        self, collection_name: str, content_id: str, limit: int = 1000
+    ) -> List[Dict[str, Any]]:
+        """Fetch stored chunks of one content item without a similarity search"""
+        try:
+            local_collection = self._local_collection(collection_name)
+            if local_collection is not None:
+                return local_collection.find("content_id", content_id, limit)
+
+            if self.client is None:
+                logger.error("Qdrant client not initialized")
+                return []
+
+            records, _ = self.client.scroll(
+                collection_name=collection_name,
+                scroll_filter=self._build_filter({"content_id": content_id}),
+                limit=limit,
+                with_payload=True,
+                with_vectors=False,
+            )
+            return [{"id": record.id, "payload": record.payload} for record in records]
+
+        except Exception as e:
+            logger.error(f"Failed to fetch points for content {content_id}: {e}")
+            return []
+
     def delete_vectors_by_source(self, collection_name: str, source_url: str) -> bool:
         """Delete all vectors associated with a specific source document"""
         try:
+            self.local_index.on_delete(collection_name, "source_url", source_url)
+            if self.local_index.offline:
+                return True
+
             if self.client is None:
                 logger.error("Qdrant client not initialized")
                 return False
@@ -317,6 +945,11 @@ class QdrantService:
     def delete_vectors_by_content_id(self, content_id: str) -> bool:
         """Delete vectors from all collections for a specific content ID"""
         try:
+            if self.local_index.offline:
+                for collection_name in self.local_index.names():
+                    self.local_index.on_delete(collection_name, "content_id", content_id)
+                return True
+
             if self.client is None:
                 logger.error("Qdrant client not initialized")
                 return False
@@ -344,6 +977,7 @@ class QdrantService:
                         points_selector=delete_filter
                     )
 
+                    self.local_index.on_delete(collection_name, "content_id", content_id)
                     deleted_from_collections.append(collection_name)
                     logger.info(f"Deleted vectors for content {content_id} from collection {collection_name}")
 
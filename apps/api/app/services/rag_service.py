@@ -1,5 +1,6 @@
 # apps/api/app/services/rag_service.py
 
+import asyncio
 import logging
 from typing import Any, Dict, List, Optional
 
@@ -8,6 +9,7 @@ from openai import OpenAI
 from ..core.config import settings
 from ..models.content import Language
 from .embedding_service import embedding_service
+from .openai_scheduler import Priority, openai_scheduler
 from .qdrant_service import qdrant_service
 
 logger = logging.getLogger(__name__)
@@ -17,7 +19,12 @@ class RAGService:
     def __init__(self):
         # Initialize OpenAI client for LLM generation
         if settings.OPENAI_API_KEY:
-            self.llm_client = OpenAI(api_key=settings.OPENAI_API_KEY)
+            # Retries are handled by the shared scheduler, not the client
+            self.llm_client = OpenAI(
+                api_key=settings.OPENAI_API_KEY,
+                max_retries=0,
+                timeout=settings.OPENAI_REQUEST_TIMEOUT_SECONDS,
+            )
             self.model = "gpt-3.5-turbo"  # Cost-effective model
             logger.info("RAG service initialized with OpenAI")
         else:
@@ -32,11 +39,12 @@ class RAGService:
             "Educational Trust": "ks_education",
         }
 
-    def is_available(self) -> bool:
+    def is_available(self, topic: Optional[str] = None) -> bool:
         """Check if RAG service is available"""
+        collection_name = self.collection_mapping.get(topic, "ks_general") if topic else None
         return (
             self.llm_client is not None
-            and embedding_service.is_available()
+            and embedding_service.is_available(collection_name)
             and qdrant_service.is_healthy()
         )
 
@@ -60,7 +68,7 @@ class RAGService:
             RAG response with answer, sources, and metadata
         """
         try:
-            if not self.is_available():
+            if not self.is_available(topic):
                 logger.error("RAG service is not available. Check OpenAI key, embedding service, and Qdrant health.")
                 return self._create_error_response("RAG service not available")
 
@@ -76,8 +84,12 @@ class RAGService:
             logger.info(f"\n[STEP 1] Query preprocessing complete")
             logger.info(f"Processed query: '{processed_query[:100]}...'")
             
-            query_embedding = embedding_service.generate_single_embedding(
-                processed_query
+            # Runs in a worker thread: the scheduler may wait for rate-limit budget
+            query_embedding = await asyncio.to_thread(
+                embedding_service.generate_single_embedding,
+                processed_query,
+                self.collection_mapping.get(topic, "ks_general"),
+                Priority.INTERACTIVE,
             )
 
             if not query_embedding:
@@ -203,6 +215,8 @@ class RAGService:
                         "language": result["payload"].get("language", "en"),
                         "source_url": result["payload"].get("source_url", ""),
                         "chunk_id": result["payload"].get("chunk_id", 0),
+                        "page_number": result["payload"].get("page_number"),
+                        "timestamp_seconds": result["payload"].get("timestamp_seconds"),
                     },
                 }
                 processed_chunks.append(chunk_data)
@@ -239,15 +253,24 @@ Please provide a comprehensive answer based ONLY on the provided context. If the
             logger.info("  Sending request to OpenAI...")
 
 
-            # Generate response
-            response = self.llm_client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-                temperature=0.1,  # Low temperature for factual accuracy
-                max_tokens=1000,
+            messages = [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ]
+            max_tokens = 1000
+
+            # Generate response (prompt estimate plus max_tokens counts against TPM)
+            response = await asyncio.to_thread(
+                openai_scheduler.call,
+                self.model,
+                lambda: self.llm_client.chat.completions.with_raw_response.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=0.1,  # Low temperature for factual accuracy
+                    max_tokens=max_tokens,
+                ),
+                Priority.INTERACTIVE,
+                (len(system_prompt) + len(user_prompt)) // 4 + max_tokens,
             )
 
             answer = response.choices[0].message.content.strip()
@@ -354,7 +377,10 @@ CRITICAL INSTRUCTIONS:
         try:
             success_count = 0
             for topic, collection_name in self.collection_mapping.items():
-                if qdrant_service.create_collection(collection_name):
+                backend = embedding_service.backend_for(collection_name)
+                # A local backend loads its model to report its size
+                vector_size = await asyncio.to_thread(lambda: backend.dimensions)
+                if qdrant_service.create_collection(collection_name, vector_size):
                     success_count += 1
                     logger.info(
                         f"Initialized collection for {topic}: {collection_name}"
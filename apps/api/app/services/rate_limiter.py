@@ -0,0 +1,277 @@
+"""
+Rate Limiting Service
+
+This service handles:
+- Token-bucket rate limiting per user and per client IP
+- An in-process backend for single-worker deployments
+- A Redis backend shared by all workers when RATE_LIMIT_BACKEND=redis
+- FastAPI dependencies that reject excess requests with Retry-After
+"""
+
+import asyncio
+import ipaddress
+import logging
+import math
+import time
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple, Union
+
+from fastapi import Depends, HTTPException, Request, status
+
+from ..core.cache import TTLCache
+from ..core.config import settings
+from .auth import get_current_admin, get_current_user
+
+try:
+    import redis.asyncio as redis_asyncio
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Atomically refill a set of buckets stored as Redis hashes and take from all of
+# them, or from none if any is short. ARGV holds cost, then capacity and refill
+# rate per key. Returns {allowed (0/1), seconds until enough tokens are available}.
+_TOKEN_BUCKET_SCRIPT = """
+local cost = tonumber(ARGV[1])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local levels = {}
+local allowed = 1
+local retry_after = 0
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[2 * i])
+    local refill_rate = tonumber(ARGV[2 * i + 1])
+    local state = redis.call('HMGET', key, 'tokens', 'updated_at')
+    local tokens = tonumber(state[1]) or capacity
+    local updated_at = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * refill_rate)
+    if tokens < cost then
+        allowed = 0
+        retry_after = math.max(retry_after, (cost - tokens) / refill_rate)
+    end
+    levels[i] = tokens
+end
+
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[2 * i])
+    local refill_rate = tonumber(ARGV[2 * i + 1])
+    local tokens = levels[i]
+    if allowed == 1 then
+        tokens = tokens - cost
+    end
+    redis.call('HSET', key, 'tokens', tokens, 'updated_at', now)
+    redis.call('EXPIRE', key, math.ceil(capacity / refill_rate) + 1)
+end
+return {allowed, tostring(retry_after)}
+"""
+
+# (key, capacity, refill rate per second)
+Bucket = Tuple[str, float, float]
+
+
+class InMemoryRateLimiter:
+    """Token buckets held in process memory (one set per worker)"""
+
+    def __init__(self, maxsize: int = 100000):
+        # Idle buckets are evicted once they would have refilled completely
+        self._buckets = TTLCache(maxsize=maxsize, ttl=3600)
+        self._lock = asyncio.Lock()
+
+    async def acquire(
+        self, key: str, capacity: float, refill_rate: float, cost: float = 1.0
+    ) -> Tuple[bool, float]:
+        return await self.acquire_all([(key, capacity, refill_rate)], cost)
+
+    async def acquire_all(
+        self, buckets: Sequence[Bucket], cost: float = 1.0
+    ) -> Tuple[bool, float]:
+        async with self._lock:
+            now = time.monotonic()
+            levels = []
+            for key, capacity, refill_rate in buckets:
+                tokens, updated_at = self._buckets.get(key, (capacity, now))
+                levels.append(min(capacity, tokens + (now - updated_at) * refill_rate))
+
+            allowed = all(tokens >= cost for tokens in levels)
+            retry_after = 0.0
+            for (key, capacity, refill_rate), tokens in zip(buckets, levels):
+                if allowed:
+                    tokens -= cost
+                else:
+                    retry_after = max(retry_after, (cost - tokens) / refill_rate)
+                self._buckets.set(key, (tokens, now), ttl=capacity / refill_rate + 1)
+            return allowed, retry_after
+
+
+class RedisRateLimiter:
+    """Token buckets stored in Redis so limits hold across workers"""
+
+    def __init__(self, redis_url: str):
+        self.client = redis_asyncio.from_url(redis_url)
+        self._script = self.client.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    async def acquire(
+        self, key: str, capacity: float, refill_rate: float, cost: float = 1.0
+    ) -> Tuple[bool, float]:
+        return await self.acquire_all([(key, capacity, refill_rate)], cost)
+
+    async def acquire_all(
+        self, buckets: Sequence[Bucket], cost: float = 1.0
+    ) -> Tuple[bool, float]:
+        args: List[float] = [cost]
+        for _, capacity, refill_rate in buckets:
+            args.extend((capacity, refill_rate))
+        allowed, retry_after = await self._script(
+            keys=[f"ratelimit:{key}" for key, _, _ in buckets], args=args
+        )
+        return bool(int(allowed)), float(retry_after)
+
+
+class RateLimiter:
+    """Rate limiter facade selecting the configured backend"""
+
+    def __init__(self):
+        self.memory_backend = InMemoryRateLimiter()
+        self.redis_backend: Optional[RedisRateLimiter] = None
+
+        if settings.RATE_LIMIT_BACKEND == "redis":
+            if REDIS_AVAILABLE:
+                self.redis_backend = RedisRateLimiter(settings.REDIS_URL)
+                logger.info("Rate limiter using Redis backend")
+            else:
+                logger.warning(
+                    "redis package not available - falling back to in-process rate limiting"
+                )
+
+    async def acquire(
+        self, key: str, capacity: float, refill_rate: float, cost: float = 1.0
+    ) -> Tuple[bool, float]:
+        """
+        Take tokens from a bucket
+
+        Args:
+            key: Bucket identifier, e.g. "chat:user:<id>"
+            capacity: Maximum burst size
+            refill_rate: Tokens added per second
+            cost: Tokens consumed by this request
+
+        Returns:
+            Tuple of (allowed, seconds to wait before retrying)
+        """
+        return await self.acquire_all([(key, capacity, refill_rate)], cost)
+
+    async def acquire_all(
+        self, buckets: Sequence[Bucket], cost: float = 1.0
+    ) -> Tuple[bool, float]:
+        """
+        Take tokens from every bucket, or from none if any is short
+
+        Returns:
+            Tuple of (allowed, seconds until all buckets could allow it)
+        """
+        if self.redis_backend is not None:
+            try:
+                return await self.redis_backend.acquire_all(buckets, cost)
+            except Exception as e:
+                # Degrade to per-worker limits rather than failing requests
+                logger.warning(f"Redis rate limiter unavailable, using in-process buckets: {e}")
+
+        return await self.memory_backend.acquire_all(buckets, cost)
+
+
+@lru_cache(maxsize=1)
+def _trusted_proxies(
+    spec: str,
+) -> Tuple[Union[ipaddress.IPv4Network, ipaddress.IPv6Network], ...]:
+    networks = []
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        try:
+            networks.append(ipaddress.ip_network(entry, strict=False))
+        except ValueError:
+            logger.warning(f"Ignoring invalid TRUSTED_PROXIES entry: {entry}")
+    return tuple(networks)
+
+
+def _is_trusted_proxy(host: str) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in _trusted_proxies(settings.TRUSTED_PROXIES))
+
+
+def get_client_ip(request: Request) -> str:
+    """
+    Client IP of a request
+
+    The X-Real-IP header set by our nginx proxy is used only when the
+    connection comes from a trusted proxy; anyone else could forge it.
+    """
+    peer = request.client.host if request.client else None
+    if peer is None:
+        return "unknown"
+
+    real_ip = request.headers.get("x-real-ip")
+    if real_ip and _is_trusted_proxy(peer):
+        return real_ip.strip()
+    return peer
+
+
+async def enforce_rate_limit(
+    scope: str, user_id: str, client_ip: str, per_minute: int, burst: int
+) -> None:
+    """Check the per-user and per-IP buckets for scope, raising 429 when empty"""
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+
+    refill_rate = per_minute / 60.0
+    ip_multiplier = settings.RATE_LIMIT_IP_MULTIPLIER
+    buckets = [
+        (f"{scope}:user:{user_id}", burst, refill_rate),
+        (f"{scope}:ip:{client_ip}", burst * ip_multiplier, refill_rate * ip_multiplier),
+    ]
+
+    # A request rejected by one bucket must not be charged to the other
+    allowed, retry_after = await rate_limiter.acquire_all(buckets)
+    if not allowed:
+        logger.warning(f"Rate limit exceeded for {scope} user {user_id} / ip {client_ip}")
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests, please slow down",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+
+async def chat_rate_limit(request: Request, current_user=Depends(get_current_user)):
+    """Dependency limiting chat requests per user and per IP"""
+    await enforce_rate_limit(
+        "chat",
+        str(current_user.id),
+        get_client_ip(request),
+        settings.CHAT_RATE_LIMIT_PER_MINUTE,
+        settings.CHAT_RATE_LIMIT_BURST,
+    )
+    return current_user
+
+
+async def search_rate_limit(request: Request, current_user=Depends(get_current_admin)):
+    """Dependency limiting admin knowledge base searches per user and per IP"""
+    await enforce_rate_limit(
+        "search",
+        str(current_user.id),
+        get_client_ip(request),
+        settings.SEARCH_RATE_LIMIT_PER_MINUTE,
+        settings.SEARCH_RATE_LIMIT_BURST,
+    )
+    return current_user
+
+
+# Global instance
+rate_limiter = RateLimiter()
@@ -0,0 +1,221 @@
+"""
+Text Normalizer
+
+This module handles:
+- Normalising extracted document text line by line, keeping line structure
+- Dropping boilerplate: repeated page headers/footers, and page numbers and
+  rules at page edges
+- Stripping the "--- Page N ---" and "[mm:ss]" markers added during extraction
+  while recording where each page and timestamp starts in the output
+- Mapping character offsets in the output back to pages and timestamps
+"""
+
+import bisect
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# "--- Page 12 ---" lines written by DocumentService.extract_pdf_text
+_PAGE_MARKER = re.compile(r"^\s*--- Page (\d+) ---\s*$")
+# "[mm:ss]" or "[hh:mm:ss]" prefixes written by the YouTube processor
+_TIMESTAMP = re.compile(r"^\s*\[(?:(\d+):)?(\d+):(\d{2})\]\s*")
+# Lines holding only a page number ("12", "- 12 -", "12/40") or punctuation;
+# dropped at page edges only, since table rows elsewhere may be all digits
+_PAGE_NUMBER_LINE = re.compile(r"^[\W_]*(?:\d{1,4}(?:\s*/\s*\d{1,4})?)?[\W_]*$")
+_HAS_LETTER = re.compile(r"[^\W\d_]")
+_DIGITS = re.compile(r"\d+")
+
+# Map invisible and exotic whitespace to plain spaces (or nothing)
+_WHITESPACE_TABLE = str.maketrans(
+    {
+        "\u00a0": " ",  # no-break space
+        "\u2000": " ",
+        "\u2002": " ",
+        "\u2003": " ",
+        "\u2009": " ",
+        "\u3000": " ",
+        "\u200b": None,  # zero-width space
+        "\ufeff": None,  # byte order mark
+        "\u00ad": None,  # soft hyphen
+        "\r": None,
+    }
+)
+
+# Lines at the top and bottom of a page that are checked for repetition
+_EDGE_LINES = 2
+
+
+@dataclass
+class NormalizedText:
+    """
+    Normalised document text with offset maps back to the source
+
+    pages and timestamps are (character offset, value) pairs sorted by
+    offset: the page number or timestamp in seconds in effect from that
+    offset on.
+    """
+
+    text: str
+    pages: List[Tuple[int, int]] = field(default_factory=list)
+    timestamps: List[Tuple[int, int]] = field(default_factory=list)
+
+
+def normalize_document(raw: str) -> NormalizedText:
+    """
+    Normalise extracted text in a single pass over its lines
+
+    Args:
+        raw: Text from PDF or YouTube extraction
+
+    Returns:
+        NormalizedText with the cleaned text and page/timestamp offsets
+    """
+    if not raw:
+        return NormalizedText(text="")
+
+    text = raw.translate(_WHITESPACE_TABLE)
+
+    # Split into pages (one page when there are no page markers)
+    pages: List[Tuple[int, List[str]]] = []
+    current: List[str] = []
+    page_number = 0
+    for line in text.split("\n"):
+        # Collapse runs of (Unicode) whitespace and trim the line
+        line = " ".join(line.split())
+        marker = line.startswith("---") and _PAGE_MARKER.match(line)
+        if marker:
+            if current or page_number:
+                pages.append((page_number, current))
+            page_number, current = int(marker.group(1)), []
+        else:
+            current.append(line)
+    pages.append((page_number, current))
+
+    boilerplate = _repeated_edge_lines([lines for _, lines in pages])
+
+    parts: List[str] = []
+    offset = 0
+    result = NormalizedText(text="")
+
+    for page_number, lines in pages:
+        if page_number:
+            if parts:
+                parts.append("\n\n")
+                offset += 2
+            result.pages.append((offset, page_number))
+
+        blank_pending = False
+        line_count = 0
+        edges = _edge_indices(lines)
+        for index, line in enumerate(lines):
+            if not line:
+                blank_pending = line_count > 0
+                continue
+
+            stamp = line[0] == "[" and _TIMESTAMP.match(line)
+            if stamp:
+                hours, minutes, seconds = stamp.groups()
+                line = line[stamp.end():]
+                if not _HAS_LETTER.search(line):
+                    continue
+
+            if index in edges and (
+                _PAGE_NUMBER_LINE.match(line) or _DIGITS.sub("#", line) in boilerplate
+            ):
+                continue
+
+            if line_count:
+                separator = "\n\n" if blank_pending else "\n"
+                parts.append(separator)
+                offset += len(separator)
+            blank_pending = False
+
+            if stamp:
+                result.timestamps.append(
+                    (offset, int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds))
+                )
+            parts.append(line)
+            offset += len(line)
+            line_count += 1
+
+        if page_number and not line_count:
+            # Page had no usable text; let the next page claim the offset
+            result.pages.pop()
+            if parts:
+                parts.pop()
+                offset -= 2
+
+    result.text = "".join(parts)
+    return result
+
+
+def _repeated_edge_lines(pages: List[List[str]]) -> set:
+    """
+    Header and footer lines repeated across most pages
+
+    Lines are compared with digits masked so "Page 3 of 40" matches on every
+    page. Only documents with at least three pages are considered.
+    """
+    counts: Counter = Counter()
+    page_count = 0
+    for lines in pages:
+        edges = _edge_indices(lines)
+        if not edges:
+            continue
+        page_count += 1
+        counts.update({_DIGITS.sub("#", lines[i]) for i in edges})
+
+    if page_count < 3:
+        return set()
+
+    threshold = page_count // 2 + 1
+    return {line for line, count in counts.items() if count >= threshold}
+
+
+def _edge_indices(lines: List[str]) -> set:
+    """Indices of the first and last few non-empty lines of a page"""
+    non_empty = [i for i, line in enumerate(lines) if line]
+    return set(non_empty[:_EDGE_LINES] + non_empty[-_EDGE_LINES:])
+
+
+class OffsetIndex:
+    """
+    Maps character offsets in normalised text back to pages and timestamps
+
+    Built once per document; each lookup is a binary search.
+    """
+
+    def __init__(self, normalized: NormalizedText):
+        self._page_offsets = [offset for offset, _ in normalized.pages]
+        self._page_numbers = [page for _, page in normalized.pages]
+        self._time_offsets = [offset for offset, _ in normalized.timestamps]
+        self._time_seconds = [seconds for _, seconds in normalized.timestamps]
+
+    def page_at(self, offset: int) -> Optional[int]:
+        """Page containing the character at offset"""
+        i = bisect.bisect_right(self._page_offsets, offset) - 1
+        return self._page_numbers[i] if i >= 0 else None
+
+    def timestamp_at(self, offset: int) -> Optional[int]:
+        """Start time in seconds of the transcript segment containing offset"""
+        i = bisect.bisect_right(self._time_offsets, offset) - 1
+        return self._time_seconds[i] if i >= 0 else None
+
+    def locate(self, start_char: int, end_char: int) -> Dict[str, int]:
+        """
+        Source position of the text between start_char and end_char
+
+        Returns:
+            page_number/page_end for paged documents and timestamp_seconds
+            for transcripts; keys without a value are omitted
+        """
+        location = {}
+        page = self.page_at(start_char)
+        if page is not None:
+            location["page_number"] = page
+            location["page_end"] = self.page_at(max(start_char, end_char - 1))
+        timestamp = self.timestamp_at(start_char)
+        if timestamp is not None:
+            location["timestamp_seconds"] = timestamp
+        return location
@@ -0,0 +1,151 @@
+"""
+Transcript Cache
+
+This module handles:
+- Persisting raw transcript segments on disk, keyed by video ID and language list
+- Expiring entries after a time-to-live and invalidating them on demand
+- A transcript provider wrapper that serves from the cache before fetching
+"""
+
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from .youtube_processor import TranscriptProvider
+
+logger = logging.getLogger(__name__)
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_-]")
+
+
+class TranscriptCache:
+    """
+    Disk-backed transcript store
+
+    Each entry is one JSON file, <dir>/<first two id chars>/<video_id>__<langs>.json,
+    written atomically (temp file + rename) so concurrent workers never read a
+    partial file.
+    """
+
+    def __init__(self, directory: str, ttl_seconds: float):
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+
+    def get(
+        self, video_id: str, languages: Sequence[str], allow_expired: bool = False
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Cached segments for a video, or None on a miss
+
+        Args:
+            video_id: YouTube video ID
+            languages: Language preference list the transcript was fetched with
+            allow_expired: Return entries past their TTL as well
+        """
+        path = self._path(video_id, languages)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable transcript cache entry {path}: {e}")
+            return None
+
+        expired = time.time() - entry.get("fetched_at", 0) > self.ttl_seconds
+        if expired and not allow_expired:
+            return None
+        return entry.get("segments")
+
+    def put(
+        self, video_id: str, languages: Sequence[str], segments: List[Dict[str, Any]]
+    ) -> None:
+        """Store segments for a video"""
+        path = self._path(video_id, languages)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "video_id": video_id,
+            "languages": list(languages),
+            "fetched_at": time.time(),
+            "segments": segments,
+        }
+
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+    def invalidate(self, video_id: str) -> int:
+        """Remove every cached transcript of a video; returns the number removed"""
+        removed = 0
+        shard = self.directory / self._safe(video_id)[:2]
+        for path in shard.glob(f"{self._safe(video_id)}__*.json"):
+            try:
+                path.unlink()
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def _path(self, video_id: str, languages: Sequence[str]) -> Path:
+        safe_id = self._safe(video_id)
+        language_key = "+".join(self._safe(language) for language in languages) or "default"
+        return self.directory / safe_id[:2] / f"{safe_id}__{language_key}.json"
+
+    @staticmethod
+    def _safe(value: str) -> str:
+        return _UNSAFE.sub("_", value)
+
+
+class CachingTranscriptProvider(TranscriptProvider):
+    """
+    Serves transcripts from a TranscriptCache, fetching only on a miss
+
+    When the underlying fetch fails, an expired entry is returned if one
+    exists. In offline mode a miss is an error instead of a fetch.
+    """
+
+    def __init__(self, inner: TranscriptProvider, cache: TranscriptCache, offline: bool = False):
+        self.inner = inner
+        self.cache = cache
+        self.offline = offline
+        self.name = inner.name
+
+    def is_available(self) -> bool:
+        return self.offline or self.inner.is_available()
+
+    def fetch(self, video_id: str, languages: Sequence[str]) -> List[Dict[str, Any]]:
+        segments = self.cache.get(video_id, languages)
+        if segments is not None:
+            logger.info(f"Transcript cache hit for {video_id}")
+            return segments
+
+        if self.offline:
+            raise ValueError(f"Transcript for {video_id} is not cached (offline mode)")
+
+        try:
+            segments = self.inner.fetch(video_id, languages)
+        except Exception:
+            stale = self.cache.get(video_id, languages, allow_expired=True)
+            if stale is not None:
+                logger.warning(f"Transcript fetch failed for {video_id}; serving expired cache entry")
+                return stale
+            raise
+
+        try:
+            self.cache.put(video_id, languages, segments)
+        except OSError as e:
+            logger.warning(f"Failed to cache transcript for {video_id}: {e}")
+        return segments
@@ -1,11 +1,20 @@
 # In apps/api/app/services/youtube_processor.py
 
+import bisect
+import importlib.util
 import logging
 import re
-from typing import Dict, Any, Tuple, Optional
+import threading
+import time
+from abc import ABC, abstractmethod
+from array import array
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_LANGUAGES = ("en", "en-US")
+
+
 def extract_video_id(url: str) -> Optional[str]:
     """Extracts the 11-character video ID from a YouTube URL."""
     patterns = [
@@ -18,52 +27,336 @@ def extract_video_id(url: str) -> Optional[str]:
             return match.group(1)
     return None
 
-def get_youtube_transcript(video_url: str) -> Tuple[str, Dict[str, Any]]:
+
+class TranscriptUnavailableError(ValueError):
+    """The video exists but has no usable transcript (captions disabled or missing)"""
+
+
+class TranscriptSegments:
+    """
+    Transcript text with per-segment timing in compact arrays
+
+    The segment texts are joined once, one segment per line. starts and
+    durations are in seconds; offsets[i] is the character offset in text
+    where segment i begins. Memory is a few machine words per segment on
+    top of the text itself.
+    """
+
+    __slots__ = ("text", "starts", "durations", "offsets")
+
+    def __init__(self, text: str, starts: array, durations: array, offsets: array):
+        self.text = text
+        self.starts = starts
+        self.durations = durations
+        self.offsets = offsets
+
+    @classmethod
+    def from_raw(cls, segments: Iterable[Dict[str, Any]]) -> "TranscriptSegments":
+        """Build from provider segments, dropping ones with no text"""
+        texts: List[str] = []
+        starts = array("d")
+        durations = array("d")
+        offsets = array("q")
+        offset = 0
+        for entry in segments:
+            # Collapse newlines and runs of whitespace inside the caption
+            text = " ".join(str(entry.get("text", "")).split())
+            if not text:
+                continue
+            texts.append(text)
+            starts.append(float(entry.get("start", 0) or 0))
+            durations.append(float(entry.get("duration", 0) or 0))
+            offsets.append(offset)
+            offset += len(text) + 1
+        return cls("\n".join(texts), starts, durations, offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    @property
+    def duration(self) -> float:
+        """Seconds from the start of the video to the end of the last segment"""
+        if not self.starts:
+            return 0.0
+        return self.starts[-1] + self.durations[-1]
+
+    def segment_at(self, offset: int) -> int:
+        """Index of the segment containing a character offset"""
+        return max(0, bisect.bisect_right(self.offsets, offset) - 1)
+
+    def boundaries(self) -> List[int]:
+        """Character offsets of the line breaks between segments"""
+        return [offset - 1 for offset in self.offsets[1:]]
+
+    def timestamps(self) -> List[Tuple[int, int]]:
+        """(character offset, whole seconds) pairs, one per segment"""
+        return [(offset, int(start)) for offset, start in zip(self.offsets, self.starts)]
+
+    def to_text(self) -> str:
+        """The transcript as "[mm:ss] text" lines"""
+        lines = self.text.split("\n") if self.text else []
+        return "\n".join(
+            f"[{int(start) // 60:02d}:{int(start) % 60:02d}] {line}"
+            for start, line in zip(self.starts, lines)
+        )
+
+
+class TranscriptProvider(ABC):
+    """Source of raw transcript segments for a video"""
+
+    name = "base"
+
+    @abstractmethod
+    def is_available(self) -> bool:
+        """Whether the provider's dependencies are installed"""
+
+    @abstractmethod
+    def fetch(self, video_id: str, languages: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch a transcript
+
+        Args:
+            video_id: 11-character YouTube video ID
+            languages: Preferred transcript languages, best first
+
+        Returns:
+            Segments as {"text", "start", "duration"} dicts in time order
+        """
+
+
+class YouTubeTranscriptApiProvider(TranscriptProvider):
+    """
+    Transcripts from the youtube_transcript_api package
+
+    The package is imported and its client created on first use, then
+    reused for every video. Both the 1.x instance API (fetch) and the 0.6
+    static API (get_transcript) are supported.
+    """
+
+    name = "youtube_transcript_api"
+
+    def __init__(self):
+        self._module = None
+        self._client = None
+        self._lock = threading.Lock()
+
+    def is_available(self) -> bool:
+        return importlib.util.find_spec("youtube_transcript_api") is not None
+
+    def fetch(self, video_id: str, languages: Sequence[str]) -> List[Dict[str, Any]]:
+        module, client = self._get_client()
+        try:
+            if hasattr(client, "fetch"):
+                return client.fetch(video_id, languages=list(languages)).to_raw_data()
+            return module.YouTubeTranscriptApi.get_transcript(
+                video_id, languages=list(languages)
+            )
+        except (module.TranscriptsDisabled, module.NoTranscriptFound) as e:
+            raise TranscriptUnavailableError(str(e)) from e
+
+    def _get_client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    if not self.is_available():
+                        raise ImportError("youtube_transcript_api not available")
+                    import youtube_transcript_api
+
+                    self._module = youtube_transcript_api
+                    self._client = youtube_transcript_api.YouTubeTranscriptApi()
+                    logger.info("YouTube transcript provider initialized")
+        return self._module, self._client
+
+
+class RequestThrottle:
     """
-    Extracts a YouTube transcript using the single most reliable method.
-    THIS IS THE FINAL, SIMPLIFIED, AND CORRECTED VERSION.
+    Blocking token bucket for requests to YouTube
+
+    Shared by every thread of the process that talks to YouTube, so the
+    limit is per API worker. A non-positive rate disables throttling.
     """
-    
+
+    def __init__(self, requests_per_second: float, burst: int):
+        self.rate = requests_per_second
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> float:
+        """Block until a request may be made; returns the seconds waited"""
+        if self.rate <= 0:
+            return 0.0
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated_at) * self.rate
+                )
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class ThrottledTranscriptProvider(TranscriptProvider):
+    """
+    Rate limits the fetches of another provider
+
+    Sits below the transcript cache, so cache hits cost no request budget,
+    and runs in the fetching thread, so nothing waits for a token before
+    it actually needs to call YouTube.
+    """
+
+    def __init__(self, inner: TranscriptProvider, throttle: RequestThrottle):
+        self.inner = inner
+        self.throttle = throttle
+        self.name = inner.name
+
+    def is_available(self) -> bool:
+        return self.inner.is_available()
+
+    def fetch(self, video_id: str, languages: Sequence[str]) -> List[Dict[str, Any]]:
+        waited = self.throttle.wait()
+        if waited:
+            logger.info(f"Waited {waited:.1f}s for the YouTube request budget")
+        return self.inner.fetch(video_id, languages)
+
+
+_provider: Optional[TranscriptProvider] = None
+_provider_lock = threading.Lock()
+_throttle: Optional[RequestThrottle] = None
+
+
+def get_youtube_throttle() -> RequestThrottle:
+    """Process-wide throttle for requests to YouTube, created on first use"""
+    global _throttle
+    if _throttle is None:
+        with _provider_lock:
+            if _throttle is None:
+                from ..core.config import settings
+
+                _throttle = RequestThrottle(
+                    settings.YOUTUBE_REQUESTS_PER_SECOND, settings.YOUTUBE_REQUEST_BURST
+                )
+    return _throttle
+
+
+def get_transcript_provider() -> TranscriptProvider:
+    """Process-wide transcript provider, created on first use"""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = _create_default_provider()
+    return _provider
+
+
+def get_transcript_cache():
+    """The disk transcript cache behind the default provider, if enabled"""
+    provider = get_transcript_provider()
+    return getattr(provider, "cache", None)
+
+
+def _create_default_provider() -> TranscriptProvider:
+    # Imported here: chunking pool workers import this module for
+    # TranscriptSegments and must not load settings
+    from ..core.config import settings
+    from .transcript_cache import CachingTranscriptProvider, TranscriptCache
+
+    provider = ThrottledTranscriptProvider(
+        YouTubeTranscriptApiProvider(), get_youtube_throttle()
+    )
+    if not settings.TRANSCRIPT_CACHE_ENABLED:
+        return provider
+
+    return CachingTranscriptProvider(
+        provider,
+        TranscriptCache(
+            settings.TRANSCRIPT_CACHE_DIR, settings.TRANSCRIPT_CACHE_TTL_SECONDS
+        ),
+        offline=settings.TRANSCRIPT_CACHE_OFFLINE,
+    )
+
+
+def set_transcript_provider(provider: Optional[TranscriptProvider]) -> None:
+    """Replace the process-wide provider (None restores the default)"""
+    global _provider
+    with _provider_lock:
+        _provider = provider
+
+
+def fetch_youtube_transcript(
+    video_url: str,
+    languages: Sequence[str] = DEFAULT_LANGUAGES,
+    provider: Optional[TranscriptProvider] = None,
+) -> Tuple[TranscriptSegments, Dict[str, Any]]:
+    """
+    Fetches a YouTube transcript through the configured transcript provider.
+
+    Args:
+        video_url: YouTube video URL
+        languages: Preferred transcript languages, best first
+        provider: Transcript provider (defaults to the process-wide one)
+
+    Returns:
+        Tuple of (TranscriptSegments, metadata)
+    """
+
     sanitized_url = video_url.replace(" ", "")
     logger.info(f"Sanitized YouTube URL: '{sanitized_url}'")
-    
+
     video_id = extract_video_id(sanitized_url)
     if not video_id:
         raise ValueError(f"Could not extract video ID from URL: {sanitized_url}")
     logger.info(f"Extracted video ID: {video_id}")
 
+    provider = provider or get_transcript_provider()
+
     try:
-        from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled
-        logger.info("Attempting transcript extraction with 'youtube_transcript_api'...")
-        
-        # CORRECTED USAGE FOR API v1.2.2: Create instance then call fetch
-        api = YouTubeTranscriptApi()
-        transcript_list = api.fetch(video_id, languages=['en', 'en-US'])
-        
-        formatted_transcript = ""
-        for entry in transcript_list:
-            start = int(float(entry.get('start', 0)))
-            timestamp = f"{start // 60:02d}:{start % 60:02d}"
-            text = entry.get('text', '').strip().replace('\n', ' ')
-            if text:
-                formatted_transcript += f"[{timestamp}] {text}\n"
-        
-        if not formatted_transcript.strip():
+        logger.info(f"Attempting transcript extraction with '{provider.name}'...")
+        segments = TranscriptSegments.from_raw(provider.fetch(video_id, languages))
+
+        if not segments:
             raise ValueError("Transcript was found but was empty after formatting.")
 
-        logger.info("SUCCESS: Extracted transcript using 'youtube_transcript_api'.")
+        logger.info(f"SUCCESS: Extracted transcript using '{provider.name}'.")
         metadata = {
-            "video_id": video_id, 
-            "title": f"YouTube Video: {video_id}", 
-            "source_type": "youtube", 
-            "video_url": sanitized_url, 
-            "method_used": "youtube_transcript_api"
+            "video_id": video_id,
+            "title": f"YouTube Video: {video_id}",
+            "source_type": "youtube",
+            "video_url": sanitized_url,
+            "method_used": provider.name,
+            "segment_count": len(segments),
+            "duration_seconds": int(segments.duration),
         }
-        return formatted_transcript.strip(), metadata
+        return segments, metadata
 
-    except TranscriptsDisabled:
+    except TranscriptUnavailableError:
         logger.error(f"Transcripts are disabled for video {video_id}.")
         raise ValueError(f"This video does not have captions enabled. Please try a different video.")
+    except ValueError:
+        raise
     except Exception as e:
         logger.error(f"Transcript extraction failed for {video_id}: {e}", exc_info=True)
-        raise Exception(f"Failed to retrieve transcript. This is likely an IP block from YouTube or the video is unavailable. Please wait 10-15 minutes and try again with a different video.") from e
\ No newline at end of file
+        raise Exception(f"Failed to retrieve transcript. This is likely an IP block from YouTube or the video is unavailable. Please wait 10-15 minutes and try again with a different video.") from e
+
+
+def get_youtube_transcript(
+    video_url: str,
+    languages: Sequence[str] = DEFAULT_LANGUAGES,
+    provider: Optional[TranscriptProvider] = None,
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Extracts a YouTube transcript as text.
+
+    Returns:
+        Tuple of ("[mm:ss] text" lines, metadata)
+    """
+    segments, metadata = fetch_youtube_transcript(video_url, languages, provider)
+    return segments.to_text(), metadata
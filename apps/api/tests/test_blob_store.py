@@ -0,0 +1,105 @@
+"""Unit tests for the content-addressed blob store"""
+
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from app.services.blob_store import BlobStore
+
+
+def session_referencing(*paths):
+    """Fake session whose content rows reference the given paths"""
+    db = MagicMock()
+    db.query.return_value.distinct.return_value = [(path,) for path in paths]
+    return db
+
+
+def age(path, seconds):
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+class TestBlobStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.store = BlobStore(self.directory.name, gc_grace_seconds=60)
+
+    def test_put_is_content_addressed_and_deduplicated(self):
+        first = self.store.put(b"same bytes", ".PDF")
+        second = self.store.put(b"same bytes", ".pdf")
+        other = self.store.put(b"other bytes", ".pdf")
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        self.assertTrue(first.endswith(".pdf"))
+        self.assertTrue(self.store.contains(first))
+        self.assertEqual(Path(first).read_bytes(), b"same bytes")
+        self.assertEqual(len(list(Path(self.directory.name).glob("*/*/*"))), 2)
+
+    def test_put_of_existing_blob_restarts_grace_period(self):
+        path = self.store.put(b"data")
+        age(path, 3600)
+        self.store.put(b"data")
+        self.assertGreater(os.path.getmtime(path), time.time() - 60)
+
+    def test_contains(self):
+        self.assertFalse(self.store.contains(os.path.join(tempfile.gettempdir(), "x.pdf")))
+
+    def test_release_keeps_referenced_blob(self):
+        path = self.store.put(b"data")
+        with patch.object(self.store, "reference_count", return_value=1):
+            self.assertFalse(self.store.release(path, MagicMock()))
+        self.assertTrue(os.path.exists(path))
+
+    def test_release_deletes_unreferenced_blob(self):
+        path = self.store.put(b"data")
+        age(path, 3600)
+        with patch.object(self.store, "reference_count", return_value=0):
+            self.assertTrue(self.store.release(path, MagicMock()))
+            self.assertFalse(self.store.release(path, MagicMock()))
+        self.assertFalse(os.path.exists(path))
+
+    def test_release_leaves_recent_blob_to_gc(self):
+        path = self.store.put(b"data")
+        with patch.object(self.store, "reference_count", return_value=0):
+            self.assertFalse(self.store.release(path, MagicMock()))
+        self.assertTrue(os.path.exists(path))
+
+    def test_release_deletes_file_outside_store(self):
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            path = f.name
+        with patch.object(self.store, "reference_count", return_value=0):
+            self.assertTrue(self.store.release(path, MagicMock()))
+        self.assertFalse(os.path.exists(path))
+
+    def test_collect_garbage(self):
+        referenced = self.store.put(b"referenced")
+        orphan = self.store.put(b"orphan")
+        recent = self.store.put(b"recent orphan")
+        for path in (referenced, orphan):
+            age(path, 3600)
+
+        stats = self.store.collect_garbage(session_referencing(referenced))
+
+        self.assertEqual(stats["scanned"], 3)
+        self.assertEqual(stats["referenced"], 1)
+        self.assertEqual(stats["deleted"], 1)
+        self.assertEqual(stats["freed_bytes"], len(b"orphan"))
+        self.assertTrue(os.path.exists(referenced))
+        self.assertTrue(os.path.exists(recent))
+        self.assertFalse(os.path.exists(orphan))
+
+    def test_collect_garbage_dry_run(self):
+        orphan = self.store.put(b"orphan")
+        age(orphan, 3600)
+        stats = self.store.collect_garbage(session_referencing(), dry_run=True)
+        self.assertEqual(stats["deleted"], 1)
+        self.assertTrue(os.path.exists(orphan))
+
+
+if __name__ == "__main__":
+    unittest.main()
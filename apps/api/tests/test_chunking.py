@@ -0,0 +1,112 @@
+"""
+Unit tests for token chunking
+
+Uses a whitespace tokenizer with tiktoken's interface so no encoding files
+need to be downloaded.
+"""
+
+import re
+import unittest
+
+from app.services.chunking import iter_text_chunks
+
+_PIECE = re.compile(r"\s*\S+|\s+")
+
+
+class WordEncoding:
+    """One token per word, with its leading whitespace, like tiktoken"""
+
+    def __init__(self):
+        self._ids = {}
+        self._pieces = []
+
+    def encode(self, text, disallowed_special=()):
+        tokens = []
+        for piece in _PIECE.findall(text):
+            if piece not in self._ids:
+                self._ids[piece] = len(self._pieces)
+                self._pieces.append(piece)
+            tokens.append(self._ids[piece])
+        return tokens
+
+    def decode_tokens_bytes(self, tokens):
+        return [self._pieces[token].encode("utf-8") for token in tokens]
+
+    def decode_with_offsets(self, tokens):
+        offsets, position = [], 0
+        for token in tokens:
+            offsets.append(position)
+            position += len(self._pieces[token])
+        return "".join(self._pieces[t] for t in tokens), offsets
+
+
+def make_text(words=2000):
+    sentences = []
+    for n in range(words // 10):
+        sentences.append(" ".join(f"word{n}_{i}" for i in range(9)) + " end.")
+        if n % 7 == 6:
+            sentences.append("\n\n")
+    return " ".join(sentences)
+
+
+class TestIterTextChunks(unittest.TestCase):
+    def setUp(self):
+        self.encoding = WordEncoding()
+        self.text = make_text()
+        self.total = len(self.encoding.encode(self.text))
+
+    def chunk(self, max_tokens, overlap):
+        return list(iter_text_chunks(self.text, self.encoding, max_tokens, overlap))
+
+    def test_chunks_respect_token_limit(self):
+        for chunk in self.chunk(max_tokens=50, overlap=10):
+            self.assertLessEqual(chunk["token_count"], 50)
+            self.assertLessEqual(len(self.encoding.encode(chunk["text"])), 50)
+
+    def test_chunks_are_slices_of_the_text(self):
+        for chunk in self.chunk(max_tokens=50, overlap=10):
+            self.assertEqual(chunk["text"], self.text[chunk["start_char"] : chunk["end_char"]])
+            self.assertEqual(chunk["text"], chunk["text"].strip())
+
+    def test_chunks_cover_text_without_gaps(self):
+        chunks = self.chunk(max_tokens=50, overlap=10)
+        self.assertEqual(chunks[0]["start_token"], 0)
+        self.assertEqual(chunks[-1]["end_token"], self.total)
+        for previous, chunk in zip(chunks, chunks[1:]):
+            self.assertLessEqual(chunk["start_token"], previous["end_token"])
+            self.assertGreater(chunk["start_token"], previous["start_token"])
+        self.assertEqual([c["chunk_id"] for c in chunks], list(range(len(chunks))))
+
+    def test_consecutive_chunks_overlap(self):
+        chunks = self.chunk(max_tokens=50, overlap=10)
+        for previous, chunk in zip(chunks, chunks[1:]):
+            shared = previous["end_token"] - chunk["start_token"]
+            self.assertGreater(shared, 0)
+            self.assertLessEqual(shared, 10)
+
+    def test_no_overlap(self):
+        chunks = self.chunk(max_tokens=50, overlap=0)
+        for previous, chunk in zip(chunks, chunks[1:]):
+            self.assertEqual(chunk["start_token"], previous["end_token"])
+
+    def test_overlap_not_below_max_tokens_stays_linear(self):
+        chunks = self.chunk(max_tokens=40, overlap=80)
+        self.assertEqual(chunks[-1]["end_token"], self.total)
+        # Each step advances by at least a quarter window, not one token
+        self.assertLessEqual(len(chunks), self.total // 10 + 2)
+        for previous, chunk in zip(chunks, chunks[1:]):
+            self.assertGreaterEqual(
+                chunk["start_token"] - previous["start_token"],
+                (previous["end_token"] - previous["start_token"]) // 2,
+            )
+
+    def test_prefers_paragraph_and_sentence_boundaries(self):
+        for chunk in self.chunk(max_tokens=50, overlap=0)[:-1]:
+            self.assertTrue(chunk["text"].endswith("."), chunk["text"][-20:])
+
+    def test_blank_text(self):
+        self.assertEqual(list(iter_text_chunks("  \n ", self.encoding)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
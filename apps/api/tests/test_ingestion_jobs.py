@@ -0,0 +1,29 @@
+"""Unit tests for ingestion job listing cursors"""
+
+import unittest
+import uuid
+from datetime import datetime
+
+from app.services.ingestion_jobs import decode_cursor, encode_cursor
+
+
+class TestJobCursor(unittest.TestCase):
+    def test_round_trip(self):
+        updated_at = datetime(2024, 5, 1, 12, 30, 15, 123456)
+        job_id = uuid.uuid4()
+        self.assertEqual(decode_cursor(encode_cursor(updated_at, job_id)), (updated_at, job_id))
+
+    def test_timestamp_only_cursor_starts_before_every_id(self):
+        self.assertEqual(
+            decode_cursor("2024-05-01T12:30:15"),
+            (datetime(2024, 5, 1, 12, 30, 15), uuid.UUID(int=0)),
+        )
+
+    def test_malformed_cursor(self):
+        for cursor in ("yesterday", "2024-05-01T12:30:15|not-a-uuid"):
+            with self.assertRaises(ValueError):
+                decode_cursor(cursor)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+"""Unit tests for ingestion admission control"""
+
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from app.services.ingestion_scheduler import (
+    IngestionPriority,
+    IngestionScheduler,
+    _current_priority,
+    settings,
+)
+
+UPLOAD = IngestionPriority.UPLOAD
+REINDEX = IngestionPriority.REINDEX
+MAINTENANCE = IngestionPriority.MAINTENANCE
+
+
+class TestCanStart(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = IngestionScheduler()
+        self.scheduler.max_concurrency = 3
+        self.scheduler.caps = {UPLOAD: 3, REINDEX: 2, MAINTENANCE: 1}
+        self.scheduler.guaranteed = {UPLOAD: 1, REINDEX: 1, MAINTENANCE: 0}
+        patcher = patch.object(self.scheduler, "chat_busy", return_value=False)
+        self.chat_busy = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def state(self, running=None, waiting=None):
+        self.scheduler._running = {p: (running or {}).get(p, 0) for p in IngestionPriority}
+        self.scheduler._waiting = {p: (waiting or {}).get(p, 0) for p in IngestionPriority}
+
+    def test_idle_scheduler_admits_every_class(self):
+        self.state()
+        for priority in IngestionPriority:
+            self.assertTrue(self.scheduler._can_start(priority))
+
+    def test_global_limit(self):
+        self.state(running={UPLOAD: 3})
+        self.assertFalse(self.scheduler._can_start(UPLOAD))
+
+    def test_class_cap(self):
+        self.state(running={REINDEX: 2})
+        self.assertFalse(self.scheduler._can_start(REINDEX))
+        self.assertTrue(self.scheduler._can_start(UPLOAD))
+
+    def test_busy_chat_holds_back_bulk_classes_only(self):
+        self.chat_busy.return_value = True
+        self.state(waiting={REINDEX: 1})
+        self.assertTrue(self.scheduler._can_start(UPLOAD))
+        self.assertFalse(self.scheduler._can_start(REINDEX))
+        self.assertFalse(self.scheduler._can_start(MAINTENANCE))
+
+    def test_higher_class_goes_first_on_equal_terms(self):
+        self.state(waiting={UPLOAD: 1, REINDEX: 1})
+        self.assertTrue(self.scheduler._can_start(UPLOAD))
+        self.assertFalse(self.scheduler._can_start(REINDEX))
+
+    def test_class_below_its_share_goes_first(self):
+        self.state(running={UPLOAD: 1}, waiting={UPLOAD: 1, REINDEX: 1})
+        self.assertTrue(self.scheduler._can_start(REINDEX))
+        self.assertFalse(self.scheduler._can_start(UPLOAD))
+
+    def test_capped_class_does_not_block_others(self):
+        self.state(running={REINDEX: 2}, waiting={REINDEX: 1, MAINTENANCE: 1})
+        self.assertTrue(self.scheduler._can_start(MAINTENANCE))
+
+
+class TestGuaranteedShares(unittest.TestCase):
+    def test_nonzero_share_guarantees_a_slot(self):
+        with patch.object(settings, "INGESTION_MAX_CONCURRENCY", 2), patch.object(
+            settings, "INGESTION_MAINTENANCE_SHARE", 0.1
+        ):
+            scheduler = IngestionScheduler()
+        self.assertEqual(scheduler.guaranteed[MAINTENANCE], 1)
+
+    def test_zero_share_guarantees_nothing(self):
+        with patch.object(settings, "INGESTION_MAINTENANCE_SHARE", 0):
+            scheduler = IngestionScheduler()
+        self.assertEqual(scheduler.guaranteed[MAINTENANCE], 0)
+
+
+class TestYieldToInteractive(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.scheduler = IngestionScheduler()
+        self.scheduler.max_concurrency = 1
+        self.scheduler.caps = {UPLOAD: 1, REINDEX: 1, MAINTENANCE: 1}
+        self.scheduler.max_yield_seconds = 30
+        patcher = patch.object(self.scheduler, "chat_busy", return_value=False)
+        self.chat_busy = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(self.scheduler.chat_latency, "p95", return_value=9.0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def start_yielding(self, priority, chat_busy):
+        await self.scheduler._acquire(priority)
+        self.chat_busy.return_value = chat_busy
+        token = _current_priority.set(priority)
+        try:
+            task = asyncio.create_task(self.scheduler.yield_to_interactive())
+        finally:
+            _current_priority.reset(token)
+        await asyncio.sleep(0.01)
+        return task
+
+    async def test_paused_bulk_work_releases_its_slot(self):
+        task = await self.start_yielding(REINDEX, chat_busy=True)
+        self.assertEqual(self.scheduler._running[REINDEX], 0)
+
+        await asyncio.wait_for(self.scheduler._acquire(UPLOAD), timeout=1)
+        self.chat_busy.return_value = False
+        await self.scheduler._release(UPLOAD)
+
+        await asyncio.wait_for(task, timeout=5)
+        self.assertEqual(self.scheduler._running[REINDEX], 1)
+
+    async def test_resumes_after_maximum_pause(self):
+        self.scheduler.max_yield_seconds = 1
+        task = await self.start_yielding(REINDEX, chat_busy=True)
+        await asyncio.wait_for(task, timeout=5)
+        self.assertEqual(self.scheduler._running[REINDEX], 1)
+
+    async def test_cancelled_pause_leaves_a_slot_to_release(self):
+        task = await self.start_yielding(REINDEX, chat_busy=True)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertEqual(self.scheduler._running[REINDEX], 1)
+
+    async def test_no_pause_while_chat_is_fast(self):
+        task = await self.start_yielding(REINDEX, chat_busy=False)
+        await asyncio.wait_for(task, timeout=1)
+        self.assertEqual(self.scheduler._running[REINDEX], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+"""Unit tests for OpenAI budget admission"""
+
+import unittest
+
+from app.services.openai_scheduler import Priority, RateLimitBudget
+
+
+def budget(remaining_tokens, limit_tokens=1000, remaining_requests=100, limit_requests=100):
+    result = RateLimitBudget()
+    result.limit_tokens = limit_tokens
+    result.remaining_tokens = remaining_tokens
+    result.limit_requests = limit_requests
+    result.remaining_requests = remaining_requests
+    return result
+
+
+class TestRateLimitBudgetAdmits(unittest.TestCase):
+    def test_unknown_budget_admits(self):
+        self.assertTrue(RateLimitBudget().admits(Priority.BULK, 10**6, 0.2))
+
+    def test_bulk_keeps_interactive_reserve(self):
+        self.assertTrue(budget(500).admits(Priority.BULK, 300, 0.2))
+        self.assertFalse(budget(500).admits(Priority.BULK, 301, 0.2))
+
+    def test_interactive_may_use_reserve(self):
+        self.assertTrue(budget(500).admits(Priority.INTERACTIVE, 500, 0.2))
+        self.assertFalse(budget(500).admits(Priority.INTERACTIVE, 501, 0.2))
+
+    def test_bulk_larger_than_unreserved_share_runs_in_full_window(self):
+        self.assertTrue(budget(1000).admits(Priority.BULK, 900, 0.2))
+        self.assertFalse(budget(990).admits(Priority.BULK, 900, 0.2))
+
+    def test_request_larger_than_window_runs_in_full_window(self):
+        self.assertTrue(budget(1000).admits(Priority.INTERACTIVE, 5000, 0.2))
+        self.assertFalse(budget(999).admits(Priority.INTERACTIVE, 5000, 0.2))
+
+    def test_request_budget_reserve(self):
+        self.assertFalse(budget(1000, remaining_requests=20).admits(Priority.BULK, 1, 0.2))
+        self.assertTrue(budget(1000, remaining_requests=20).admits(Priority.INTERACTIVE, 1, 0.2))
+        self.assertFalse(budget(1000, remaining_requests=0).admits(Priority.INTERACTIVE, 1, 0.2))
+
+    def test_refresh_restores_full_window(self):
+        spent = budget(0)
+        spent.refresh(now=spent.tokens_reset_at + 1)
+        self.assertTrue(spent.admits(Priority.BULK, 900, 0.2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+"""Unit tests for text normalisation and offset mapping"""
+
+import unittest
+
+from app.services.text_normalizer import NormalizedText, OffsetIndex, normalize_document
+
+
+WORDS = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot"]
+
+
+def page_text(n):
+    """A few lines of body text unique to page n"""
+    return "\n".join(f"{WORDS[n]} {word} line." for word in WORDS)
+
+
+class TestOffsetIndex(unittest.TestCase):
+    def test_locate_pages(self):
+        index = OffsetIndex(NormalizedText(text="x" * 300, pages=[(0, 1), (100, 2), (200, 5)]))
+        self.assertEqual(index.locate(0, 50), {"page_number": 1, "page_end": 1})
+        self.assertEqual(index.locate(50, 150), {"page_number": 1, "page_end": 2})
+        # end_char is exclusive
+        self.assertEqual(index.locate(150, 200), {"page_number": 2, "page_end": 2})
+        self.assertEqual(index.locate(250, 300), {"page_number": 5, "page_end": 5})
+
+    def test_locate_timestamps(self):
+        index = OffsetIndex(NormalizedText(text="x" * 100, timestamps=[(0, 0), (40, 65)]))
+        self.assertEqual(index.locate(10, 60), {"timestamp_seconds": 0})
+        self.assertEqual(index.locate(45, 60), {"timestamp_seconds": 65})
+
+    def test_locate_without_source_positions(self):
+        self.assertEqual(OffsetIndex(NormalizedText(text="plain")).locate(0, 5), {})
+
+    def test_locate_empty_range(self):
+        index = OffsetIndex(NormalizedText(text="x" * 10, pages=[(0, 3)]))
+        self.assertEqual(index.locate(5, 5), {"page_number": 3, "page_end": 3})
+
+
+class TestNormalizeDocument(unittest.TestCase):
+    def test_page_markers_become_offsets(self):
+        raw = "--- Page 1 ---\nFirst page text.\n--- Page 2 ---\nSecond page text."
+        normalized = normalize_document(raw)
+        self.assertNotIn("--- Page", normalized.text)
+        index = OffsetIndex(normalized)
+        second = normalized.text.index("Second")
+        self.assertEqual(index.page_at(second), 2)
+        self.assertEqual(index.page_at(0), 1)
+
+    def test_timestamps_become_offsets(self):
+        normalized = normalize_document("[00:05] hello there\n[01:02:03] later on")
+        self.assertNotIn("[", normalized.text)
+        index = OffsetIndex(normalized)
+        self.assertEqual(index.timestamp_at(normalized.text.index("later")), 3723)
+
+    def test_page_numbers_at_page_edges_are_dropped(self):
+        raw = "\n".join(
+            f"--- Page {n} ---\n- {n} -\n{page_text(n)}\n{n}/3" for n in (1, 2, 3)
+        )
+        text = normalize_document(raw).text
+        self.assertNotIn("- 1 -", text)
+        self.assertNotIn("/3", text)
+        self.assertIn(page_text(2), text)
+
+    def test_numeric_table_rows_are_kept(self):
+        raw = "Revenue by year\n2019 2020 2021\n1,200 1,450 1,700\n---\n3.5% 4.1% 4.4%\nSource: annual report"
+        text = normalize_document(raw).text
+        self.assertIn("2019 2020 2021", text)
+        self.assertIn("1,200 1,450 1,700", text)
+        self.assertIn("3.5% 4.1% 4.4%", text)
+
+    def test_repeated_headers_are_dropped(self):
+        raw = "\n".join(
+            f"--- Page {n} ---\nKS Annual Report {n}\n{page_text(n)}" for n in range(1, 5)
+        )
+        text = normalize_document(raw).text
+        self.assertNotIn("Annual Report", text)
+        self.assertIn(page_text(3), text)
+
+
+if __name__ == "__main__":
+    unittest.main()
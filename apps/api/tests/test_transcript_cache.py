@@ -0,0 +1,79 @@
+"""Unit tests for the disk transcript cache"""
+
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from app.services.transcript_cache import CachingTranscriptProvider, TranscriptCache
+
+SEGMENTS = [{"text": "नमस्ते", "start": 0.0, "duration": 1.5}]
+
+
+class TestTranscriptCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.cache = TranscriptCache(self.directory.name, ttl_seconds=60)
+
+    def test_round_trip(self):
+        self.assertIsNone(self.cache.get("abc123", ["hi", "en"]))
+        self.cache.put("abc123", ["hi", "en"], SEGMENTS)
+        self.assertEqual(self.cache.get("abc123", ["hi", "en"]), SEGMENTS)
+
+    def test_entries_are_keyed_by_languages(self):
+        self.cache.put("abc123", ["hi"], SEGMENTS)
+        self.assertIsNone(self.cache.get("abc123", ["en"]))
+
+    def test_expired_entries(self):
+        with patch("app.services.transcript_cache.time.time", return_value=1000.0):
+            self.cache.put("abc123", ["en"], SEGMENTS)
+        with patch("app.services.transcript_cache.time.time", return_value=1061.0):
+            self.assertIsNone(self.cache.get("abc123", ["en"]))
+            self.assertEqual(self.cache.get("abc123", ["en"], allow_expired=True), SEGMENTS)
+
+    def test_invalidate_removes_every_language(self):
+        self.cache.put("abc123", ["en"], SEGMENTS)
+        self.cache.put("abc123", ["hi"], SEGMENTS)
+        self.cache.put("xyz789", ["en"], SEGMENTS)
+        self.assertEqual(self.cache.invalidate("abc123"), 2)
+        self.assertIsNone(self.cache.get("abc123", ["en"]))
+        self.assertEqual(self.cache.get("xyz789", ["en"]), SEGMENTS)
+
+    def test_unsafe_ids_stay_inside_directory(self):
+        self.cache.put("../../etc", ["en"], SEGMENTS)
+        self.assertEqual(self.cache.get("../../etc", ["en"]), SEGMENTS)
+        path = self.cache._path("../../etc", ["en"])
+        self.assertTrue(str(path.resolve()).startswith(str(self.cache.directory.resolve())))
+
+
+class TestCachingTranscriptProvider(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.cache = TranscriptCache(self.directory.name, ttl_seconds=60)
+        self.inner = MagicMock()
+        self.inner.name = "inner"
+        self.inner.fetch.return_value = SEGMENTS
+
+    def test_fetches_once(self):
+        provider = CachingTranscriptProvider(self.inner, self.cache)
+        self.assertEqual(provider.fetch("abc123", ["en"]), SEGMENTS)
+        self.assertEqual(provider.fetch("abc123", ["en"]), SEGMENTS)
+        self.inner.fetch.assert_called_once()
+
+    def test_serves_expired_entry_when_fetch_fails(self):
+        with patch("app.services.transcript_cache.time.time", return_value=1000.0):
+            self.cache.put("abc123", ["en"], SEGMENTS)
+        self.inner.fetch.side_effect = RuntimeError("blocked")
+        provider = CachingTranscriptProvider(self.inner, self.cache)
+        self.assertEqual(provider.fetch("abc123", ["en"]), SEGMENTS)
+
+    def test_offline_miss_is_an_error(self):
+        provider = CachingTranscriptProvider(self.inner, self.cache, offline=True)
+        with self.assertRaises(ValueError):
+            provider.fetch("abc123", ["en"])
+        self.inner.fetch.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
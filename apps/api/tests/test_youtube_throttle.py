@@ -0,0 +1,46 @@
+"""Unit tests for the YouTube request throttle"""
+
+import unittest
+from unittest.mock import patch
+
+from app.services.youtube_processor import RequestThrottle
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestRequestThrottle(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = patch("app.services.youtube_processor.time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_burst_passes_without_waiting(self):
+        throttle = RequestThrottle(requests_per_second=0.5, burst=2)
+        self.assertEqual(throttle.wait(), 0.0)
+        self.assertEqual(throttle.wait(), 0.0)
+
+    def test_waits_for_refill_after_burst(self):
+        throttle = RequestThrottle(requests_per_second=0.5, burst=2)
+        throttle.wait()
+        throttle.wait()
+        self.assertAlmostEqual(throttle.wait(), 2.0)
+        self.assertAlmostEqual(self.clock.now, 2.0)
+
+    def test_non_positive_rate_disables_throttling(self):
+        throttle = RequestThrottle(requests_per_second=0, burst=1)
+        for _ in range(5):
+            self.assertEqual(throttle.wait(), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
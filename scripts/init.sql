@@ -26,6 +26,7 @@ CREATE TABLE content (
     title TEXT NOT NULL,
     source_url TEXT NOT NULL,
     source_type content_type NOT NULL,
+    video_id VARCHAR(32),
     language language_code NOT NULL,
     category VARCHAR(255) NOT NULL,
     needs_translation BOOLEAN NOT NULL DEFAULT FALSE,
@@ -55,11 +56,72 @@ CREATE TABLE messages (
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
+-- Progress of interrupted ingestions so retries resume from the last batch
+CREATE TABLE ingestion_checkpoints (
+    content_id UUID PRIMARY KEY REFERENCES content(id) ON DELETE CASCADE,
+    fingerprint VARCHAR(64) NOT NULL,
+    pages_extracted INTEGER NOT NULL DEFAULT 0,
+    total_chunks INTEGER NOT NULL DEFAULT 0,
+    chunks_committed INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- One row per ingestion attempt with stage, progress counters and timings
+CREATE TABLE ingestion_jobs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    content_id UUID NOT NULL REFERENCES content(id) ON DELETE CASCADE,
+    stage VARCHAR(32) NOT NULL DEFAULT 'queued',
+    attempt INTEGER NOT NULL DEFAULT 1,
+    pages_total INTEGER NOT NULL DEFAULT 0,
+    pages_extracted INTEGER NOT NULL DEFAULT 0,
+    chunks_total INTEGER NOT NULL DEFAULT 0,
+    chunks_embedded INTEGER NOT NULL DEFAULT 0,
+    stage_timings JSONB NOT NULL DEFAULT '{}'::jsonb,
+    error TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMPTZ,
+    finished_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Bulk ingestion requests (e.g. YouTube playlists) and their items, so any
+-- API worker can report their progress
+CREATE TABLE bulk_ingestion_jobs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    status VARCHAR(32) NOT NULL DEFAULT 'queued',
+    error TEXT,
+    category VARCHAR(255) NOT NULL,
+    language VARCHAR(8) NOT NULL,
+    needs_translation BOOLEAN NOT NULL DEFAULT false,
+    urls JSONB NOT NULL DEFAULT '[]'::jsonb,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    finished_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE bulk_ingestion_items (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    job_id UUID NOT NULL REFERENCES bulk_ingestion_jobs(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    video_id VARCHAR(32),
+    status VARCHAR(32) NOT NULL,
+    content_id UUID REFERENCES content(id) ON DELETE SET NULL,
+    error TEXT,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
 -- Indexes for performance
 CREATE INDEX idx_conversations_user_id ON conversations(user_id);
 CREATE INDEX idx_messages_conversation_id ON messages(conversation_id);
 CREATE INDEX idx_content_category ON content(category);
 CREATE INDEX idx_content_language ON content(language);
+CREATE INDEX idx_content_status_updated_at ON content(status, updated_at);
+CREATE INDEX idx_content_video_id ON content(video_id);
+CREATE INDEX ix_ingestion_jobs_content_id ON ingestion_jobs(content_id);
+CREATE INDEX ix_ingestion_jobs_updated_at ON ingestion_jobs(updated_at);
+CREATE INDEX ix_bulk_ingestion_items_job_id ON bulk_ingestion_items(job_id);
 
 -- Function to automatically update 'updated_at' timestamp
 CREATE OR REPLACE FUNCTION trigger_set_timestamp()
@@ -74,6 +136,10 @@ $$ LANGUAGE plpgsql;
 CREATE TRIGGER set_timestamp_users BEFORE UPDATE ON users FOR EACH ROW EXECUTE PROCEDURE trigger_set_timestamp();
 CREATE TRIGGER set_timestamp_content BEFORE UPDATE ON content FOR EACH ROW EXECUTE PROCEDURE trigger_set_timestamp();
 CREATE TRIGGER set_timestamp_conversations BEFORE UPDATE ON conversations FOR EACH ROW EXECUTE PROCEDURE trigger_set_timestamp();
+CREATE TRIGGER set_timestamp_ingestion_checkpoints BEFORE UPDATE ON ingestion_checkpoints FOR EACH ROW EXECUTE PROCEDURE trigger_set_timestamp();
+CREATE TRIGGER set_timestamp_ingestion_jobs BEFORE UPDATE ON ingestion_jobs FOR EACH ROW EXECUTE PROCEDURE trigger_set_timestamp();
+CREATE TRIGGER set_timestamp_bulk_ingestion_jobs BEFORE UPDATE ON bulk_ingestion_jobs FOR EACH ROW EXECUTE PROCEDURE trigger_set_timestamp();
+CREATE TRIGGER set_timestamp_bulk_ingestion_items BEFORE UPDATE ON bulk_ingestion_items FOR EACH ROW EXECUTE PROCEDURE trigger_set_timestamp();
 
 -- Insert default admin user (password: admin123)
 -- Password hash for 'admin123' using bcrypt